@@ -1,3 +1,4 @@
+from django import forms
 from django.contrib import admin
 from django.contrib.auth.models import Group
 from airport.models import (
@@ -7,8 +8,12 @@ from airport.models import (
     Airplane,
     Crew,
     Flight,
+    FlightCrew,
+    FlightSchedule,
     Order,
     Ticket,
+    SeatHold,
+    Job,
 )
 
 admin.site.unregister(Group)
@@ -18,6 +23,72 @@ admin.site.register(Route)
 admin.site.register(AirplaneType)
 admin.site.register(Airplane)
 admin.site.register(Crew)
-admin.site.register(Flight)
 admin.site.register(Order)
-admin.site.register(Ticket)
+admin.site.register(SeatHold)
+admin.site.register(Job)
+
+
+@admin.register(Ticket)
+class TicketAdmin(admin.ModelAdmin):
+    list_select_related = ["flight", "order"]
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        # Ticket.clean() reuses the chosen flight and its airplane.
+        if db_field.name == "flight":
+            kwargs["queryset"] = Flight.objects.select_related("airplane")
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+    def save_model(self, request, obj, form, change):
+        # The form has already run full_clean().
+        obj.save(validate=False)
+
+
+class FlightCrewInline(admin.TabularInline):
+    model = FlightCrew
+    fields = ["crew"]
+    extra = 1
+
+
+@admin.register(Flight)
+class FlightAdmin(admin.ModelAdmin):
+    inlines = [FlightCrewInline]
+
+
+class FlightScheduleForm(forms.ModelForm):
+    class Meta:
+        model = FlightSchedule
+        fields = "__all__"
+
+    def clean(self):
+        # Report crew conflicts on the form; generate() checks them again
+        # with the crew locked once the schedule is saved.
+        cleaned_data = super().clean()
+        rule = [
+            "weekdays",
+            "departure",
+            "duration",
+            "starts_on",
+            "ends_on",
+            "excluded_dates",
+        ]
+        if all(field in cleaned_data for field in rule):
+            schedule = FlightSchedule(
+                pk=self.instance.pk,
+                **{field: cleaned_data[field] for field in rule},
+            )
+            errors = schedule.crew_conflicts(
+                cleaned_data.get("crew", []), schedule.occurrences()
+            )
+            if errors:
+                self.add_error("crew", errors)
+        return cleaned_data
+
+
+@admin.register(FlightSchedule)
+class FlightScheduleAdmin(admin.ModelAdmin):
+    form = FlightScheduleForm
+
+    def save_related(self, request, form, formsets, change):
+        # Crew is saved here, after the schedule itself.
+        super().save_related(request, form, formsets, change)
+        form.instance.generate()
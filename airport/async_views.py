@@ -0,0 +1,183 @@
+from asgiref.sync import sync_to_async
+from django.urls import path
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from airport.db_router import replica_reads
+from airport.instrumentation import serializer_timer
+from airport.models import Flight, Order
+from airport.projections import FlightListProjection, OrderListProjection
+from airport.serializers import FlightDetailSerializer
+from airport.views import (
+    FlightPagination,
+    FlightViewSet,
+    OrderPagination,
+    ReplicaReadMixin,
+)
+
+
+class AsyncReadView(ReplicaReadMixin, APIView):
+    """
+    Read-only API view whose handlers are coroutines using the async ORM.
+
+    DRF has no async dispatch, so authentication, permissions and
+    throttles still run through ``APIView.initial`` in a worker thread;
+    only the handler and rendering stay on the event loop. ``basename``
+    and ``action`` name the viewset action being replaced, so metrics and
+    query budgets see the same endpoint as the sync view. Reads go to a
+    replica on the same terms as ``ReplicaReadMixin``.
+    """
+
+    basename = None
+    action = None
+
+    async def dispatch(self, request, *args, **kwargs):
+        with replica_reads() as reads:
+            self.replica_reads = reads
+            return await self.dispatch_read(request, *args, **kwargs)
+
+    async def dispatch_read(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            handler = getattr(
+                self, request.method.lower(), self.http_method_not_allowed
+            )
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(
+            request, response, *args, **kwargs
+        )
+        # Django would render in a thread; JSON needs no database access,
+        # so render it here. The browsable API still goes through Django.
+        if (
+            isinstance(self.response, Response)
+            and self.response.accepted_renderer.format == "json"
+        ):
+            self.response.render()
+        return self.response
+
+
+class FlightListView(AsyncReadView):
+    basename = "flight"
+    action = "list"
+    permission_classes = [IsAdminUser]
+    pagination_class = FlightPagination
+
+    async def get(self, request):
+        projection = FlightListProjection()
+        flights = projection.project(
+            FlightViewSet.filter_flights(
+                Flight.objects.all(), request.query_params
+            )
+        )
+        paginator = self.pagination_class()
+        page = await paginator.apaginate_queryset(flights, request, self)
+        return Response(
+            paginator.get_paginated_data(projection.represent(page))
+        )
+
+
+class FlightDetailView(AsyncReadView):
+    basename = "flight"
+    action = "retrieve"
+    permission_classes = [IsAdminUser]
+
+    async def get(self, request, pk):
+        flight = await Flight.objects.prefetch_related("crew").filter(
+            pk=pk
+        ).afirst()
+        if flight is None:
+            raise NotFound()
+        # Route, airplane and crew come from the reference cache, which
+        # is a blocking client.
+        data = await sync_to_async(self.represent)(flight)
+        return Response(data)
+
+    def represent(self, flight):
+        with serializer_timer():
+            return FlightDetailSerializer(
+                flight, context=self.get_renderer_context()
+            ).data
+
+
+class FlightAvailableSeatsView(AsyncReadView):
+    basename = "flight"
+    action = "available_seats"
+    permission_classes = [IsAuthenticated]
+
+    async def get(self, request, pk):
+        flight = await Flight.objects.filter(pk=pk).values(
+            "capacity", "tickets_sold"
+        ).afirst()
+        if flight is None:
+            raise NotFound()
+        return Response(
+            {"available_seats": flight["capacity"] - flight["tickets_sold"]}
+        )
+
+
+class OrderListView(AsyncReadView):
+    basename = "order"
+    action = "list"
+    permission_classes = [IsAuthenticated]
+    pagination_class = OrderPagination
+
+    async def get(self, request):
+        projection = OrderListProjection()
+        orders = projection.project(Order.objects.filter(user=request.user))
+        paginator = self.pagination_class()
+        page = await paginator.apaginate_queryset(orders, request, self)
+        return Response(
+            paginator.get_paginated_data(projection.represent(page))
+        )
+
+
+def read_view(async_view, sync_view):
+    """
+    Serve GET and HEAD with ``async_view`` and every other method with
+    the router's ``sync_view``, which runs in a worker thread.
+    """
+    sync_view = sync_to_async(sync_view)
+
+    async def view(request, *args, **kwargs):
+        if request.method in ("GET", "HEAD"):
+            return await async_view(request, *args, **kwargs)
+        return await sync_view(request, *args, **kwargs)
+
+    return csrf_exempt(view)
+
+
+def async_urlpatterns(router):
+    """
+    URL patterns that route the hot read endpoints to async views.
+
+    They reuse the router's URL names and must come before
+    ``router.urls``.
+    """
+    sync_views = {
+        pattern.name: pattern.callback for pattern in reversed(router.urls)
+    }
+    return [
+        path(route, read_view(view.as_view(), sync_views[name]), name=name)
+        for route, view, name in (
+            ("flights/", FlightListView, "flight-list"),
+            ("flights/<int:pk>/", FlightDetailView, "flight-detail"),
+            (
+                "flights/<int:pk>/available_seats/",
+                FlightAvailableSeatsView,
+                "flight-available-seats",
+            ),
+            ("orders/", OrderListView, "order-list"),
+        )
+    ]
@@ -0,0 +1,270 @@
+import random
+import statistics
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.views import APIView
+
+from airport.data_generator import DataGenerator
+from airport.models import Airplane, Flight, Order, Route, Ticket
+from airport.projections import (
+    FlightListProjection,
+    OrderListProjection,
+    RouteProjection,
+    TicketListProjection,
+)
+
+DATASET_SIZES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+
+
+class Dataset:
+    def __init__(self, admin, customer, flight, open_flight):
+        self.admin = admin
+        self.customer = customer
+        self.flight = flight
+        self.open_flight = open_flight
+
+
+def build_dataset(tickets, seed=0):
+    """
+    Generate roughly ``tickets`` booked seats plus benchmark users.
+
+    A database kept from an earlier run with the same ``tickets`` and
+    ``seed`` is reused, minus the orders booked by that run and with the
+    open flight moved back into the future; one holding any other data
+    is flushed first.
+    """
+    marker = f"Benchmark XL {tickets}/{seed}"
+    User = get_user_model()
+    start = timezone.now() + timedelta(days=1)
+    open_flight = Flight.objects.filter(airplane__name=marker).first()
+    if open_flight is not None:
+        Order.objects.filter(tickets__flight=open_flight).delete()
+        open_flight.departure_time = start
+        open_flight.arrival_time = start + timedelta(hours=2)
+        open_flight.save()
+        return Dataset(
+            User.objects.get(email="bench-admin@example.com"),
+            User.objects.get(email="bench-user@example.com"),
+            median_flight(exclude=open_flight),
+            open_flight,
+        )
+    if User.objects.exists():
+        call_command("flush", interactive=False, verbosity=0)
+    rng = random.Random(seed)
+    admin = User.objects.create_superuser(
+        email="bench-admin@example.com", password="benchpass"
+    )
+    customer = User.objects.create_user(
+        email="bench-user@example.com", password="benchpass"
+    )
+    DataGenerator(
+        seed=seed,
+        airports=20,
+        airplanes=20,
+        crew=200,
+        users=max(1, tickets // 50),
+        tickets=tickets,
+        start_date=timezone.localdate() + timedelta(days=1),
+        days=30,
+    ).generate()
+    order_ids = list(
+        Order.objects.exclude(user=customer).values_list("pk", flat=True)
+    )
+    Order.objects.filter(
+        pk__in=rng.sample(order_ids, max(1, len(order_ids) // 100))
+    ).update(user=customer)
+    flight = median_flight()
+    open_flight = Flight.objects.create(
+        route=flight.route,
+        airplane=Airplane.objects.create(
+            name=marker,
+            rows=2_000,
+            seats_in_row=10,
+            airplane_type=flight.airplane.airplane_type,
+        ),
+        departure_time=start,
+        arrival_time=start + timedelta(hours=2),
+    )
+    return Dataset(admin, customer, flight, open_flight)
+
+
+def median_flight(exclude=None):
+    """The median booked flight, skipping the benchmark's open flight."""
+    flight_ids = list(
+        Flight.objects.filter(tickets_sold__gt=0)
+        .exclude(pk=getattr(exclude, "pk", None))
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    return Flight.objects.get(pk=flight_ids[len(flight_ids) // 2])
+
+
+def scenarios(dataset):
+    """Yield ``(name, user, method, path, payload)`` for each endpoint."""
+    flight = dataset.flight
+    yield "flight-list", dataset.admin, "get", "/api/airport/flights/", None
+    yield (
+        "flight-detail",
+        dataset.admin,
+        "get",
+        f"/api/airport/flights/{flight.id}/",
+        None,
+    )
+    yield (
+        "flight-available-seats",
+        dataset.customer,
+        "get",
+        f"/api/airport/flights/{flight.id}/available_seats/",
+        None,
+    )
+    yield (
+        "ticket-list",
+        dataset.admin,
+        "get",
+        f"/api/airport/tickets/?flight={flight.id}",
+        None,
+    )
+    yield (
+        "order-create",
+        dataset.customer,
+        "post",
+        "/api/airport/orders/",
+        {"tickets": [{"flight": dataset.open_flight.id}] * 2},
+    )
+    yield (
+        "order-my-tickets",
+        dataset.customer,
+        "get",
+        "/api/airport/orders/my_tickets/",
+        None,
+    )
+
+
+def percentile(quantiles, value):
+    return round(quantiles[value - 1], 3)
+
+
+def measure(client, method, path, payload, repeat):
+    request = getattr(client, method)
+    kwargs = {"content_type": "application/json"} if payload else {}
+    request(path, payload, **kwargs)
+    latencies = []
+    queries = []
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = request(path, payload, **kwargs)
+            latencies.append((time.perf_counter() - started) * 1000)
+        if response.status_code >= 400:
+            raise RuntimeError(
+                f"{method.upper()} {path} returned {response.status_code}"
+            )
+        queries.append(len(captured))
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        request(path, payload, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "requests": repeat,
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "p50_ms": percentile(quantiles, 50),
+        "p95_ms": percentile(quantiles, 95),
+        "p99_ms": percentile(quantiles, 99),
+        "queries": max(queries),
+        "peak_alloc_kib": round(peak / 1024, 1),
+    }
+
+
+@contextmanager
+def throttling_disabled():
+    # Throttle classes are bound when DRF views are imported, so overriding
+    # REST_FRAMEWORK settings at run time would not reach them.
+    throttle_classes = APIView.throttle_classes
+    APIView.throttle_classes = []
+    try:
+        yield
+    finally:
+        APIView.throttle_classes = throttle_classes
+
+
+def run(dataset, repeat):
+    results = {}
+    with throttling_disabled():
+        for name, user, method, path, payload in scenarios(dataset):
+            client = Client()
+            client.force_login(user)
+            results[name] = measure(client, method, path, payload, repeat)
+    return results
+
+
+def serialization(repeat, rows=10_000):
+    """Compare list serializers with their values() projections."""
+    results = {}
+    for name, projection_class, queryset in (
+        ("flight-list", FlightListProjection, Flight.objects.all()),
+        ("ticket-list", TicketListProjection, Ticket.objects.all()),
+        ("order-list", OrderListProjection, Order.objects.all()),
+        (
+            "route-list",
+            RouteProjection,
+            Route.objects.select_related("source", "destination"),
+        ),
+    ):
+        queryset = queryset.order_by("pk")[:rows]
+        projection = projection_class()
+        serializer_ms = median_ms(
+            lambda: projection_class.serializer_class(
+                queryset.all(), many=True
+            ).data,
+            repeat,
+        )
+        projection_ms = median_ms(
+            lambda: projection.represent(
+                projection.project(queryset.all())
+            ),
+            repeat,
+        )
+        results[name] = {
+            "rows": queryset.count(),
+            "serializer_ms": round(serializer_ms, 3),
+            "projection_ms": round(projection_ms, 3),
+            "speedup": round(serializer_ms / projection_ms, 2),
+        }
+    return results
+
+
+def median_ms(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def compare(results, baseline, threshold):
+    """Return ``(name, metric, old, new)`` for metrics that got worse."""
+    regressions = []
+    for name, metrics in results.items():
+        old = baseline.get(name)
+        if not old:
+            continue
+        for metric in ("p50_ms", "p95_ms", "queries", "peak_alloc_kib"):
+            if metrics[metric] > old[metric] * (1 + threshold):
+                regressions.append(
+                    (name, metric, old[metric], metrics[metric])
+                )
+    return regressions
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+from airport.reference_cache import ReferenceCache
+
+
+@register(Tags.caches, Tags.database)
+def check_replica_pins_are_shared(app_configs, **kwargs):
+    """
+    Read-your-writes pins live in the default cache. A process-local
+    cache would only pin the worker that handled the write.
+    """
+    if settings.DATABASE_REPLICAS and not ReferenceCache.shared():
+        return [
+            Error(
+                "DATABASE_REPLICAS needs a cache shared by all processes.",
+                hint="Set REDIS_URL so writes pin later reads to the "
+                "primary in every worker.",
+                id="airport.E001",
+            )
+        ]
+    return []
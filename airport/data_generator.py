@@ -0,0 +1,447 @@
+import bisect
+import io
+import itertools
+import json
+import random
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from airport.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    Crew,
+    Flight,
+    FlightCrew,
+    Order,
+    Route,
+    Ticket,
+)
+from airport.reference_cache import DEPENDENCIES, reference_cache
+
+CITIES = [
+    "Kyiv", "Lviv", "Odesa", "Kharkiv", "Warsaw", "Krakow", "Berlin",
+    "Munich", "Paris", "Lyon", "London", "Manchester", "Madrid",
+    "Barcelona", "Rome", "Milan", "Vienna", "Prague", "Budapest",
+    "Amsterdam", "Brussels", "Zurich", "Lisbon", "Athens", "Istanbul",
+    "Dubai", "New York", "Los Angeles", "Chicago", "Toronto", "Tokyo",
+    "Seoul", "Singapore", "Bangkok", "Delhi", "Sydney",
+]
+FIRST_NAMES = [
+    "Olena", "Andrii", "Iryna", "Dmytro", "Kateryna", "Taras", "Sofia",
+    "Maksym", "Anna", "Oleh", "Maria", "Yurii", "Natalia", "Bohdan",
+]
+LAST_NAMES = [
+    "Shevchenko", "Kovalenko", "Bondarenko", "Tkachenko", "Kravchenko",
+    "Melnyk", "Boyko", "Oliinyk", "Lysenko", "Marchenko", "Rudenko",
+]
+AIRPLANE_TYPES = [
+    "Airbus A320", "Airbus A321", "Airbus A330", "Airbus A350",
+    "Boeing 737", "Boeing 747", "Boeing 777", "Boeing 787",
+    "Embraer E195", "ATR 72",
+]
+CHUNK_FLIGHTS = 1_000
+
+
+class CopyWriter:
+    """Stream rows into PostgreSQL with ``COPY ... FROM STDIN``."""
+
+    def write(self, model, fields, rows):
+        columns = ", ".join(
+            connection.ops.quote_name(model._meta.get_field(name).column)
+            for name in fields
+        )
+        with connection.cursor() as cursor:
+            cursor.cursor.copy_expert(
+                f"COPY {connection.ops.quote_name(model._meta.db_table)} "
+                f"({columns}) FROM STDIN",
+                RowStream(rows),
+            )
+
+
+class BulkWriter:
+    """Fallback for databases without COPY."""
+
+    batch_size = 2_000
+
+    def write(self, model, fields, rows):
+        # A raw insert, like loaddata uses, keeps generated values for
+        # auto_now_add fields such as Order.created_at.
+        concrete = [model._meta.get_field(name) for name in fields]
+        size = connection.ops.bulk_batch_size(
+            concrete, range(self.batch_size)
+        ) or self.batch_size
+        rows = iter(rows)
+        while batch := list(itertools.islice(rows, size)):
+            model._base_manager._insert(
+                [model(**dict(zip(fields, row))) for row in batch],
+                fields=concrete,
+                raw=True,
+            )
+
+
+class RowStream(io.TextIOBase):
+    """File-like view of an iterable of rows in COPY text format."""
+
+    def __init__(self, rows):
+        self._lines = (self._format(row) for row in rows)
+        self._buffer = ""
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            try:
+                self._buffer += next(self._lines)
+            except StopIteration:
+                break
+        if size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    @staticmethod
+    def _format(row):
+        return "\t".join(RowStream._value(value) for value in row) + "\n"
+
+    @staticmethod
+    def _value(value):
+        if value is None:
+            return r"\N"
+        if value is True:
+            return "t"
+        if value is False:
+            return "f"
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if isinstance(value, (dict, list)):
+            value = json.dumps(value)
+        return (
+            str(value)
+            .replace("\\", "\\\\")
+            .replace("\t", "\\t")
+            .replace("\n", "\\n")
+        )
+
+
+class DataGenerator:
+    """
+    Deterministic synthetic data for load tests and benchmarks.
+
+    All primary keys are assigned here, after the current maximum of each
+    table, so related rows can be streamed without reading ids back. The
+    same seed and start date always produce the same rows.
+    """
+
+    def __init__(
+        self,
+        seed=0,
+        airports=100,
+        routes_per_airport=8,
+        airplanes=200,
+        crew=2_000,
+        users=None,
+        tickets=100_000,
+        flights=None,
+        load_factor=0.8,
+        start_date=None,
+        days=180,
+        stdout=None,
+    ):
+        self.rng = random.Random(seed)
+        self.airports = airports
+        self.routes_per_airport = min(routes_per_airport, airports - 1)
+        self.airplanes = airplanes
+        self.crew = crew
+        self.users = users or max(1, tickets // 20)
+        self.tickets = tickets
+        self.flights = flights
+        self.load_factor = load_factor
+        self.start = timezone.make_aware(
+            datetime.combine(
+                start_date or timezone.localdate() + timedelta(days=1),
+                time.min,
+            )
+        )
+        self.days = days
+        self.stdout = stdout
+        self.writer = (
+            CopyWriter() if connection.vendor == "postgresql"
+            else BulkWriter()
+        )
+        self.counts = {}
+
+    def log(self, message):
+        if self.stdout:
+            self.stdout.write(message)
+
+    def next_ids(self, model, count):
+        start = (model.objects.aggregate(top=Max("pk"))["top"] or 0) + 1
+        return range(start, start + count)
+
+    def write(self, model, fields, rows):
+        counter = _Counter(rows)
+        self.writer.write(model, fields, counter)
+        label = model._meta.db_table
+        self.counts[label] = self.counts.get(label, 0) + counter.count
+
+    def generate(self):
+        with transaction.atomic():
+            self._reference_data()
+            self._users()
+            self._schedule()
+        self._reset_sequences()
+        # Rows written here bypass model signals, so retire cached
+        # reference data explicitly.
+        for model in DEPENDENCIES:
+            reference_cache.bump(model)
+        return self.counts
+
+    def _reference_data(self):
+        rng = self.rng
+        self.airport_ids = list(self.next_ids(Airport, self.airports))
+        self.write(
+            Airport,
+            ["id", "name", "closest_big_city"],
+            (
+                (pk, f"{city[:3].upper()}{pk}", city)
+                for pk, city in zip(
+                    self.airport_ids,
+                    (rng.choice(CITIES) for _ in self.airport_ids),
+                )
+            ),
+        )
+        self.log(f"Airports: {len(self.airport_ids)}")
+
+        routes = []
+        route_ids = iter(
+            self.next_ids(Route, self.airports * self.routes_per_airport)
+        )
+        for source in self.airport_ids:
+            destinations = rng.sample(
+                [pk for pk in self.airport_ids if pk != source],
+                self.routes_per_airport,
+            )
+            for destination in destinations:
+                routes.append(
+                    (
+                        next(route_ids),
+                        source,
+                        destination,
+                        rng.randint(300, 12_000),
+                    )
+                )
+        self.write(
+            Route, ["id", "source_id", "destination_id", "distance"], routes
+        )
+        self.routes = [(pk, distance) for pk, _, _, distance in routes]
+        self.log(f"Routes: {len(routes)}")
+
+        type_ids = list(self.next_ids(AirplaneType, len(AIRPLANE_TYPES)))
+        self.write(
+            AirplaneType, ["id", "name"], zip(type_ids, AIRPLANE_TYPES)
+        )
+        self.airplane_capacity = {}
+        airplanes = []
+        for pk in self.next_ids(Airplane, self.airplanes):
+            rows, seats_in_row = rng.randint(20, 60), rng.choice([4, 6, 9])
+            self.airplane_capacity[pk] = (rows, seats_in_row)
+            airplanes.append(
+                (pk, f"Airplane {pk}", rows, seats_in_row,
+                 rng.choice(type_ids), None, {})
+            )
+        self.write(
+            Airplane,
+            ["id", "name", "rows", "seats_in_row", "airplane_type_id",
+             "image", "image_variants"],
+            airplanes,
+        )
+        self.log(f"Airplanes: {len(airplanes)}")
+
+        self.crew_ids = list(self.next_ids(Crew, self.crew))
+        self.write(
+            Crew,
+            ["id", "first_name", "last_name"],
+            (
+                (pk, rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES))
+                for pk in self.crew_ids
+            ),
+        )
+        self.log(f"Crew: {len(self.crew_ids)}")
+
+    def _users(self):
+        User = get_user_model()
+        password = make_password("password")
+        joined = self.start - timedelta(days=365)
+        self.user_ids = list(self.next_ids(User, self.users))
+        self.write(
+            User,
+            ["id", "password", "is_superuser", "first_name", "last_name",
+             "is_staff", "is_active", "date_joined", "email"],
+            (
+                (pk, password, False, "", "", False, True, joined,
+                 f"user{pk}@example.com")
+                for pk in self.user_ids
+            ),
+        )
+        self.log(f"Users: {len(self.user_ids)}")
+
+    def _schedule(self):
+        rng = self.rng
+        flight_ids = iter(self.next_ids(Flight, 10 ** 12))
+        crew_ids = iter(self.next_ids(FlightCrew, 10 ** 12))
+        order_ids = iter(self.next_ids(Order, 10 ** 12))
+        ticket_ids = iter(self.next_ids(Ticket, 10 ** 12))
+        airplane_ids = list(self.airplane_capacity)
+        span = self.days * 24 * 60
+        remaining_tickets = self.tickets
+        remaining_flights = self.flights
+        # Sorted (departures, arrivals) of every crew member's flights.
+        timelines = defaultdict(lambda: ([], []))
+        while remaining_tickets > 0 or (remaining_flights or 0) > 0:
+            flights, flight_crew, orders, tickets = [], [], [], []
+            for _ in range(CHUNK_FLIGHTS):
+                if remaining_flights is not None and remaining_flights <= 0:
+                    break
+                if remaining_flights is None and remaining_tickets <= 0:
+                    break
+                flight_id = next(flight_ids)
+                route_id, distance = rng.choice(self.routes)
+                airplane_id = rng.choice(airplane_ids)
+                rows, seats_in_row = self.airplane_capacity[airplane_id]
+                capacity = rows * seats_in_row
+                departure = self.start + timedelta(
+                    minutes=rng.randrange(span) // 5 * 5
+                )
+                arrival = departure + timedelta(
+                    minutes=45 + distance // 12
+                )
+                # At least one ticket per flight, or a small load factor
+                # would never use up the requested tickets.
+                booked = min(
+                    remaining_tickets,
+                    max(
+                        1,
+                        round(
+                            capacity * self.load_factor * rng.uniform(0.5, 1)
+                        ),
+                    ),
+                )
+                for crew_id in self._pick_crew(
+                    rng, timelines, departure, arrival
+                ):
+                    flight_crew.append(
+                        (next(crew_ids), flight_id, crew_id, departure,
+                         arrival)
+                    )
+                seats = rng.sample(range(capacity), booked)
+                position = 0
+                while position < len(seats):
+                    order_id = next(order_ids)
+                    orders.append(
+                        (
+                            order_id,
+                            departure - timedelta(
+                                minutes=rng.randrange(60, 90 * 24 * 60)
+                            ),
+                            rng.choice(self.user_ids),
+                        )
+                    )
+                    size = rng.choice((1, 1, 2, 2, 3, 4))
+                    for index in seats[position:position + size]:
+                        tickets.append(
+                            (
+                                next(ticket_ids),
+                                index // seats_in_row + 1,
+                                index % seats_in_row + 1,
+                                flight_id,
+                                order_id,
+                            )
+                        )
+                    position += size
+                flights.append(
+                    (flight_id, route_id, airplane_id, departure, arrival,
+                     capacity, booked)
+                )
+                remaining_tickets -= booked
+                if remaining_flights is not None:
+                    remaining_flights -= 1
+            if not flights:
+                break
+            self.write(
+                Flight,
+                ["id", "route_id", "airplane_id", "departure_time",
+                 "arrival_time", "capacity", "tickets_sold"],
+                flights,
+            )
+            self.write(
+                FlightCrew,
+                ["id", "flight_id", "crew_id", "departure_time",
+                 "arrival_time"],
+                flight_crew,
+            )
+            self.write(Order, ["id", "created_at", "user_id"], orders)
+            self.write(
+                Ticket, ["id", "row", "seat", "flight_id", "order_id"],
+                tickets,
+            )
+            self.log(
+                f"Flights: {self.counts['flight']}, "
+                f"tickets: {self.counts['ticket']}"
+            )
+
+    def _pick_crew(self, rng, timelines, departure, arrival):
+        """
+        Draw three to six crew members who are free from ``departure`` to
+        ``arrival`` and book them in ``timelines``. Gives up on a slot
+        after a bounded number of draws, so a busy crew pool yields
+        smaller crews instead of overlapping assignments.
+        """
+        wanted = rng.randint(3, 6)
+        picked = []
+        for _ in range(wanted * 10):
+            if len(picked) == wanted:
+                break
+            crew_id = rng.choice(self.crew_ids)
+            if crew_id in picked:
+                continue
+            departures, arrivals = timelines[crew_id]
+            # A member's flights never overlap, so only the flight that
+            # departs last before ``arrival`` can overlap the new one.
+            index = bisect.bisect_left(departures, arrival)
+            if index and arrivals[index - 1] > departure:
+                continue
+            departures.insert(index, departure)
+            arrivals.insert(index, arrival)
+            picked.append(crew_id)
+        return picked
+
+    def _reset_sequences(self):
+        models = [
+            Airport, Route, AirplaneType, Airplane, Crew, get_user_model(),
+            Flight, FlightCrew, Order, Ticket,
+        ]
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        if statements:
+            with connection.cursor() as cursor:
+                for statement in statements:
+                    cursor.execute(statement)
+
+
+class _Counter:
+    def __init__(self, rows):
+        self._rows = rows
+        self.count = 0
+
+    def __iter__(self):
+        for row in self._rows:
+            self.count += 1
+            yield row
@@ -0,0 +1,90 @@
+import contextvars
+import random
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+
+_reads = contextvars.ContextVar("airport_replica_reads", default=None)
+
+
+class ReplicaReads:
+    """Whether the current request may read from ``database``."""
+
+    def __init__(self):
+        self.database = None
+
+    def enable(self):
+        if settings.DATABASE_REPLICAS:
+            self.database = random.choice(settings.DATABASE_REPLICAS)
+
+
+@contextmanager
+def replica_reads():
+    """
+    Scope a request for the router. Reads stay on the primary until the
+    view calls ``enable()`` on the yielded ``ReplicaReads``.
+    """
+    reads = ReplicaReads()
+    token = _reads.set(reads)
+    try:
+        yield reads
+    finally:
+        _reads.reset(token)
+
+
+@contextmanager
+def primary_reads():
+    """
+    Read from the primary inside the block, even in a request that was
+    sent to a replica. Used to fill caches shared by all users, which
+    must not capture rows from before a write the replica has not yet
+    applied.
+    """
+    token = _reads.set(None)
+    try:
+        yield
+    finally:
+        _reads.reset(token)
+
+
+def _pin_key(user):
+    return f"airport:primary-pin:{user.pk}"
+
+
+def pin_to_primary(user):
+    """Send ``user``'s reads to the primary for REPLICA_STICKY_SECONDS."""
+    if settings.DATABASE_REPLICAS and user.is_authenticated:
+        cache.set(_pin_key(user), True, settings.REPLICA_STICKY_SECONDS)
+
+
+def pinned_to_primary(user):
+    return (
+        bool(settings.DATABASE_REPLICAS)
+        and user.is_authenticated
+        and cache.get(_pin_key(user)) is not None
+    )
+
+
+class ReplicaRouter:
+    """
+    Route reads to a replica inside an enabled ``replica_reads()`` scope
+    and everything else, including all writes, to ``default``.
+    """
+
+    def db_for_read(self, model, **hints):
+        reads = _reads.get()
+        if reads is None:
+            return None
+        return reads.database
+
+    def db_for_write(self, model, **hints):
+        # Instances read from a replica must still be saved on the
+        # primary.
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
@@ -0,0 +1,94 @@
+import hashlib
+import io
+
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+from airport.models import Airplane
+
+# Longest side in pixels, largest first: each variant is resized from the
+# one before it.
+VARIANTS = {"full": 1600, "card": 640, "thumb": 160}
+
+FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpg": ("JPEG", {"quality": 85, "optimize": True, "progressive": True}),
+}
+
+# Uploads larger than this are rejected before anything is decoded.
+MAX_PIXELS = 40_000_000
+
+
+def check_image(upload):
+    """Reject non-images and oversized images by reading only the header."""
+    try:
+        with Image.open(upload) as image:
+            width, height = image.size
+    except (OSError, Image.DecompressionBombError):
+        raise ValidationError("Upload a valid image.")
+    finally:
+        upload.seek(0)
+    if width * height > MAX_PIXELS:
+        raise ValidationError(
+            f"Image is too large: {width}x{height} exceeds "
+            f"{MAX_PIXELS} pixels."
+        )
+
+
+def _save_variant(image, stem, extension):
+    image_format, options = FORMATS[extension]
+    buffer = io.BytesIO()
+    image.save(buffer, image_format, **options)
+    content = buffer.getvalue()
+    digest = hashlib.sha256(content).hexdigest()[:16]
+    name = f"{stem}.{digest}.{extension}"
+    if not default_storage.exists(name):
+        name = default_storage.save(name, ContentFile(content))
+    return name
+
+
+def make_variants(source, prefix):
+    """
+    Write every variant of ``source`` in every format under ``prefix``.
+
+    JPEGs are decoded straight at the largest variant's scale, and every
+    later variant shrinks the same image in place, so memory stays close
+    to one full-size variant. Names embed a hash of their content.
+    """
+    largest = max(VARIANTS.values())
+    with Image.open(source) as original:
+        original.draft("RGB", (largest, largest))
+        image = original.convert("RGB")
+    ImageOps.exif_transpose(image, in_place=True)
+    variants = {}
+    for name, size in VARIANTS.items():
+        image.thumbnail((size, size), reducing_gap=2.0)
+        variants[name] = {
+            extension: _save_variant(image, f"{prefix}{name}", extension)
+            for extension in FORMATS
+        }
+    return variants
+
+
+def process_airplane_image(airplane_id, source):
+    """Build the variants for an airplane's image unless it was replaced."""
+    airplane = Airplane.objects.filter(pk=airplane_id).first()
+    if airplane is None or airplane.image.name != source:
+        return
+    previous = airplane.image_variants.get("variants", {})
+    with airplane.image.open("rb") as image:
+        variants = make_variants(
+            image, f"variants/airplanes/{airplane.pk}/"
+        )
+    airplane.image_variants = {"source": source, "variants": variants}
+    airplane.save(update_fields=["image_variants"])
+
+    current = {
+        name for formats in variants.values() for name in formats.values()
+    }
+    for formats in previous.values():
+        for name in formats.values():
+            if name not in current:
+                default_storage.delete(name)
@@ -0,0 +1,215 @@
+import contextvars
+import logging
+import time
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+
+from airport import metrics as prometheus
+
+logger = logging.getLogger("airport.instrumentation")
+
+_current = contextvars.ContextVar("airport_request_metrics", default=None)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class RequestMetrics:
+    """Query count and timings collected while serving one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.endpoint = None
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.total_time = 0.0
+        self._serializer_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+
+    def as_dict(self):
+        return {
+            "endpoint": self.endpoint,
+            "queries": self.queries,
+            "db_ms": round(self.db_time * 1000, 3),
+            "serializer_ms": round(self.serializer_time * 1000, 3),
+            "total_ms": round(self.total_time * 1000, 3),
+        }
+
+
+def current_metrics():
+    return _current.get()
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Execute wrapper installed on every database connection.
+
+    Queries are attributed through the context variable rather than by
+    wrapping connections per request: async views run their queries on
+    worker threads, each with its own connection, and asgiref carries the
+    context over to them.
+    """
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def endpoint_name(request, response):
+    """Name a request after its viewset action, e.g. ``order-create``."""
+    view = getattr(response, "renderer_context", {}).get("view")
+    basename = getattr(view, "basename", None)
+    action = getattr(view, "action", None)
+    if basename and action:
+        return f"{basename}-{action.replace('_', '-')}"
+    match = request.resolver_match
+    if match is None:
+        return None
+    # Responses that are not DRF Responses, e.g. streamed exports, carry
+    # no view; the router's view function still knows its action.
+    actions = getattr(match.func, "actions", None) or {}
+    basename = getattr(match.func, "initkwargs", {}).get("basename")
+    action = actions.get(request.method.lower())
+    if basename and action:
+        return f"{basename}-{action.replace('_', '-')}"
+    if match.url_name:
+        return f"{match.url_name}-{request.method.lower()}"
+    return None
+
+
+@contextmanager
+def serializer_timer():
+    """Add the enclosed time to the current request's serializer time."""
+    # Only the outermost block is timed, so nested serializers and
+    # ListSerializer children are not counted twice.
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    metrics._serializer_depth += 1
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics._serializer_depth -= 1
+        if not metrics._serializer_depth:
+            metrics.serializer_time += time.perf_counter() - started
+
+
+class SerializerTimingMixin:
+    """
+    Add the time the view's serializers spend in ``to_representation``,
+    i.e. evaluating ``serializer.data``, to the request's serializer time.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        serializer.to_representation = serializer_timer()(
+            serializer.to_representation
+        )
+        return serializer
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """
+    ``JSONRenderer`` that adds the time spent rendering the response
+    body to the request's serializer time. ``SerializerTimingMixin``
+    times ``serializer.data`` in the view, and projections time their
+    own row mapping with ``serializer_timer``.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with serializer_timer():
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+class InstrumentationMiddleware:
+    """
+    Record query count, DB time, serializer time and total time per
+    endpoint, optionally expose them as headers and enforce QUERY_BUDGETS.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        with self.recording(metrics):
+            response = self.get_response(request)
+        return self.finish(metrics, request, response)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        with self.recording(metrics):
+            response = await self.get_response(request)
+        return self.finish(metrics, request, response)
+
+    @staticmethod
+    @contextmanager
+    def recording(metrics):
+        token = _current.set(metrics)
+        try:
+            yield
+        finally:
+            _current.reset(token)
+
+    def finish(self, metrics, request, response):
+        metrics.total_time = time.perf_counter() - metrics.started
+        metrics.endpoint = endpoint_name(request, response)
+        self.report(metrics, response)
+        if metrics.endpoint is not None:
+            prometheus.observe_request(
+                metrics, request.method, response.status_code
+            )
+        return response
+
+    def report(self, metrics, response):
+        if metrics.endpoint is None:
+            return
+        if settings.INSTRUMENTATION_HEADERS:
+            response["Server-Timing"] = ", ".join(
+                f"{name};dur={duration * 1000:.3f}"
+                for name, duration in (
+                    ("db", metrics.db_time),
+                    ("serializer", metrics.serializer_time),
+                    ("total", metrics.total_time),
+                )
+            )
+            response["X-Query-Count"] = str(metrics.queries)
+        logger.info(
+            "%s: %d queries, db %.1f ms, serializer %.1f ms, total %.1f ms",
+            metrics.endpoint,
+            metrics.queries,
+            metrics.db_time * 1000,
+            metrics.serializer_time * 1000,
+            metrics.total_time * 1000,
+            extra={"metrics": metrics.as_dict()},
+        )
+        budget = settings.QUERY_BUDGETS.get(metrics.endpoint)
+        if budget is not None and metrics.queries > budget:
+            message = (
+                f"{metrics.endpoint} ran {metrics.queries} queries, "
+                f"budget is {budget}."
+            )
+            if settings.QUERY_BUDGET_STRICT:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
@@ -0,0 +1,165 @@
+import bisect
+import heapq
+import threading
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db.models import Count, F, Max, Sum
+from django.utils import timezone
+
+from airport.db_router import primary_reads
+from airport.models import Flight, Route
+from airport.reference_cache import reference_cache
+
+
+class RouteIndex:
+    """
+    In-memory adjacency list of the route graph.
+
+    Every process keeps its own copy and rebuilds it when the shared
+    Route version in the reference cache changes, so route edits reach
+    all workers without a database round trip per search. Without a
+    shared cache other processes never see that version change, so the
+    index compares a fingerprint of the route table instead.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = object()
+        self._adjacency = {}
+
+    @staticmethod
+    def version():
+        if reference_cache.shared():
+            return reference_cache.version(Route)
+        # Weighting by id makes moving a value between routes change
+        # the sums too.
+        with primary_reads():
+            return tuple(
+                Route.objects.aggregate(
+                    count=Count("id"),
+                    last=Max("id"),
+                    sources=Sum(F("source_id") * F("id")),
+                    destinations=Sum(F("destination_id") * F("id")),
+                    distances=Sum(F("distance") * F("id")),
+                ).values()
+            )
+
+    def adjacency(self):
+        version = self.version()
+        if version != self._version:
+            with self._lock:
+                if version != self._version:
+                    adjacency = defaultdict(list)
+                    # A replica may not have the change behind the new
+                    # version yet; the index would keep its old rows.
+                    with primary_reads():
+                        routes = list(
+                            Route.objects.order_by().values_list(
+                                "id", "source_id", "destination_id",
+                                "distance",
+                            )
+                        )
+                    for route_id, source_id, target_id, distance in routes:
+                        adjacency[source_id].append(
+                            (target_id, route_id, distance)
+                        )
+                    self._adjacency = dict(adjacency)
+                    self._version = version
+        return self._adjacency
+
+    def paths(self, source_id, destination_id, max_legs):
+        """Yield loop-free route paths as lists of ``(route_id, distance)``."""
+        adjacency = self.adjacency()
+        stack = [(source_id, [], {source_id})]
+        while stack:
+            airport_id, path, visited = stack.pop()
+            for next_id, route_id, distance in adjacency.get(airport_id, ()):
+                if next_id == destination_id:
+                    yield path + [(route_id, distance)]
+                elif len(path) + 1 < max_legs and next_id not in visited:
+                    stack.append(
+                        (
+                            next_id,
+                            path + [(route_id, distance)],
+                            visited | {next_id},
+                        )
+                    )
+
+
+route_index = RouteIndex()
+
+
+def search_itineraries(
+    source_id,
+    destination_id,
+    date,
+    max_legs=2,
+    min_connection=timedelta(minutes=45),
+    max_connection=timedelta(hours=24),
+    sort="time",
+    limit=20,
+):
+    paths = list(route_index.paths(source_id, destination_id, max_legs))
+    if not paths:
+        return []
+    start = timezone.make_aware(datetime.combine(date, time.min))
+    first_day_end = start + timedelta(days=1)
+    window_end = first_day_end + (max_legs - 1) * (
+        max_connection + timedelta(days=1)
+    )
+    flights_by_route = defaultdict(list)
+    for flight in Flight.objects.filter(
+        route_id__in={route_id for path in paths for route_id, _ in path},
+        departure_time__gte=start,
+        departure_time__lt=window_end,
+    ).order_by("departure_time").values(
+        "id",
+        "route_id",
+        "route__source_id",
+        "route__destination_id",
+        "departure_time",
+        "arrival_time",
+    ):
+        flights_by_route[flight["route_id"]].append(flight)
+    departures_by_route = {
+        route_id: [flight["departure_time"] for flight in flights]
+        for route_id, flights in flights_by_route.items()
+    }
+
+    def connections(path, legs):
+        if len(legs) == len(path):
+            yield legs
+            return
+        route_id = path[len(legs)][0]
+        flights = flights_by_route.get(route_id, [])
+        if legs:
+            arrival = legs[-1]["arrival_time"]
+            low, high = arrival + min_connection, arrival + max_connection
+        else:
+            low, high = start, first_day_end
+        departures = departures_by_route.get(route_id, [])
+        first = bisect.bisect_left(departures, low)
+        last = bisect.bisect_right(departures, high)
+        for flight in flights[first:last]:
+            yield from connections(path, legs + [flight])
+
+    def itineraries():
+        for path in paths:
+            distance = sum(leg_distance for _, leg_distance in path)
+            for legs in connections(path, []):
+                yield {
+                    "legs": legs,
+                    "departure_time": legs[0]["departure_time"],
+                    "arrival_time": legs[-1]["arrival_time"],
+                    "duration": (
+                        legs[-1]["arrival_time"] - legs[0]["departure_time"]
+                    ),
+                    "distance": distance,
+                }
+
+    if sort == "distance":
+        key = (lambda item: (item["distance"], item["duration"]))
+    else:
+        key = (lambda item: (item["duration"], item["distance"]))
+    return heapq.nsmallest(limit, itineraries(), key=key)
@@ -0,0 +1,153 @@
+import asyncio
+import statistics
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+
+class HTTPConnection:
+    """Minimal keep-alive HTTP/1.1 client, enough to drive GET requests."""
+
+    def __init__(self, host, port, headers):
+        self.host = host
+        self.port = port
+        self.headers = headers
+        self.reader = self.writer = None
+
+    async def get(self, target):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(
+                self.host, self.port
+            )
+        lines = [f"GET {target} HTTP/1.1", f"Host: {self.host}:{self.port}"]
+        lines += [f"{name}: {value}" for name, value in self.headers.items()]
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode())
+        await self.writer.drain()
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Server closed the connection.")
+        status = int(status_line.split()[1])
+        headers = {}
+        while line := (await self.reader.readline()).strip():
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.lower()] = value.strip()
+        if headers.get("transfer-encoding") == "chunked":
+            while size := int(await self.reader.readline(), 16):
+                await self.reader.readexactly(size + 2)
+            await self.reader.readline()
+        else:
+            await self.reader.readexactly(
+                int(headers.get("content-length", 0))
+            )
+        if headers.get("connection") == "close":
+            await self.close()
+        return status
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.reader = self.writer = None
+
+
+async def worker(urls, offset, headers, deadline, results):
+    connections = {}
+    index = offset
+    while time.perf_counter() < deadline:
+        url = urls[index % len(urls)]
+        index += 1
+        address = (url.hostname, url.port or 80)
+        if address not in connections:
+            connections[address] = HTTPConnection(*address, headers)
+        target = url.path + (f"?{url.query}" if url.query else "")
+        started = time.perf_counter()
+        try:
+            status = await connections[address].get(target)
+        except (OSError, ValueError, asyncio.IncompleteReadError):
+            status = None
+            await connections.pop(address).close()
+        results.append((status, time.perf_counter() - started))
+    for connection in connections.values():
+        await connection.close()
+
+
+def tree_rss(pid):
+    """
+    Resident memory in bytes of process ``pid`` and all its descendants,
+    read from /proc, so a server's master and workers count together.
+    """
+    children = {}
+    for stat in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            fields = stat.read_text().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        children.setdefault(int(fields[1]), []).append(int(stat.parent.name))
+    total = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        pending += children.get(current, [])
+        try:
+            status = Path(f"/proc/{current}/status").read_text()
+        except OSError:
+            continue
+        for line in status.splitlines():
+            if line.startswith("VmRSS:"):
+                total += int(line.split()[1]) * 1024
+    return total
+
+
+async def sample_rss(pid, deadline, samples, interval=0.5):
+    while time.perf_counter() < deadline:
+        samples.append(tree_rss(pid))
+        await asyncio.sleep(interval)
+
+
+async def run(
+    urls, concurrency=50, duration=10.0, headers=None, server_pid=None
+):
+    """
+    Request ``urls`` round-robin from ``concurrency`` keep-alive
+    connections for ``duration`` seconds and summarise the latencies.
+
+    With ``server_pid`` the resident memory of that process tree is
+    sampled during the run and its peak reported as ``server_rss_mb``.
+    """
+    urls = [urlsplit(url) for url in urls]
+    results = []
+    samples = []
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    tasks = [
+        worker(urls, offset, headers or {}, deadline, results)
+        for offset in range(concurrency)
+    ]
+    if server_pid is not None:
+        tasks.append(sample_rss(server_pid, deadline, samples))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+    latencies = sorted(latency for status, latency in results)
+    errors = sum(
+        1 for status, latency in results
+        if status is None or status >= 400
+    )
+    summary = {
+        "concurrency": concurrency,
+        "requests": len(results),
+        "errors": errors,
+        "requests_per_second": round(len(results) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "mean_ms": round(statistics.fmean(latencies or [0]) * 1000, 2),
+    }
+    if samples:
+        summary["server_rss_mb"] = round(max(samples) / 2**20, 1)
+    return summary
+
+
+def percentile(values, percent):
+    if not values:
+        return 0.0
+    index = round(percent / 100 * (len(values) - 1))
+    return values[index]
@@ -0,0 +1,143 @@
+import json
+import platform
+import subprocess
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.utils import timezone
+
+from airport import benchmark
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+            cwd=settings.BASE_DIR,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the main API endpoints against a synthetic dataset in a "
+        "throwaway test database and save the results as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--size",
+            choices=benchmark.DATASET_SIZES,
+            default="1k",
+            help="Number of booked tickets in the dataset.",
+        )
+        parser.add_argument("--repeat", type=int, default=50)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--output",
+            help="Result file (default: benchmarks/results/<commit>-<size>"
+            ".json).",
+        )
+        parser.add_argument(
+            "--compare", help="Earlier result file to compare against."
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.1,
+            help="Relative slowdown reported as a regression.",
+        )
+        parser.add_argument(
+            "--keepdb",
+            action="store_true",
+            help="Keep the test database and reuse its dataset in later "
+            "runs with the same --size and --seed.",
+        )
+
+    def handle(self, *args, **options):
+        if options["repeat"] < 2:
+            raise CommandError("--repeat must be at least 2.")
+        commit = current_commit()
+        setup_test_environment(debug=False)
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, keepdb=options["keepdb"]
+        )
+        try:
+            self.stdout.write(f"Building {options['size']} dataset...")
+            dataset = benchmark.build_dataset(
+                benchmark.DATASET_SIZES[options["size"]],
+                seed=options["seed"],
+            )
+            self.stdout.write("Running scenarios...")
+            results = benchmark.run(dataset, options["repeat"])
+            serialization = benchmark.serialization(
+                min(options["repeat"], 10)
+            )
+        finally:
+            connection.creation.destroy_test_db(
+                old_name, verbosity=0, keepdb=options["keepdb"]
+            )
+            teardown_test_environment()
+
+        report = {
+            "commit": commit,
+            "size": options["size"],
+            "repeat": options["repeat"],
+            "created_at": timezone.now().isoformat(),
+            "python": platform.python_version(),
+            "database": connection.vendor,
+            "scenarios": results,
+            "serialization": serialization,
+        }
+        output = Path(
+            options["output"]
+            or settings.BASE_DIR
+            / "benchmarks"
+            / "results"
+            / f"{commit}-{options['size']}.json"
+        )
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2) + "\n")
+
+        for name, metrics in results.items():
+            self.stdout.write(
+                f"{name:<24} p50 {metrics['p50_ms']:>8.2f} ms  "
+                f"p95 {metrics['p95_ms']:>8.2f} ms  "
+                f"p99 {metrics['p99_ms']:>8.2f} ms  "
+                f"{metrics['queries']:>3} queries  "
+                f"{metrics['peak_alloc_kib']:>8.1f} KiB"
+            )
+        for name, metrics in serialization.items():
+            self.stdout.write(
+                f"{name:<24} {metrics['rows']:>6} rows  serializer "
+                f"{metrics['serializer_ms']:>8.2f} ms  projection "
+                f"{metrics['projection_ms']:>8.2f} ms  "
+                f"x{metrics['speedup']:.1f}"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Saved {output}"))
+
+        if options["compare"]:
+            baseline = json.loads(Path(options["compare"]).read_text())
+            regressions = benchmark.compare(
+                results, baseline["scenarios"], options["threshold"]
+            )
+            for name, metric, old, new in regressions:
+                self.stdout.write(
+                    self.style.WARNING(f"{name} {metric}: {old} -> {new}")
+                )
+            if regressions:
+                raise CommandError(
+                    f"{len(regressions)} regression(s) against "
+                    f"{baseline['commit']}."
+                )
@@ -0,0 +1,100 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from airport.data_generator import DataGenerator
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the database with deterministic synthetic airports, routes, "
+        "airplanes, crew, flights, users, orders and tickets."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tickets",
+            type=int,
+            default=100_000,
+            help="Number of booked tickets to create.",
+        )
+        parser.add_argument(
+            "--flights",
+            type=int,
+            help="Number of flights (default: as many as the tickets need).",
+        )
+        parser.add_argument("--airports", type=int, default=100)
+        parser.add_argument("--routes-per-airport", type=int, default=8)
+        parser.add_argument("--airplanes", type=int, default=200)
+        parser.add_argument("--crew", type=int, default=2_000)
+        parser.add_argument(
+            "--users",
+            type=int,
+            help="Number of customers (default: one per 20 tickets).",
+        )
+        parser.add_argument(
+            "--load-factor",
+            type=float,
+            default=0.8,
+            help="Upper bound of the share of seats sold per flight.",
+        )
+        parser.add_argument(
+            "--start-date",
+            type=date.fromisoformat,
+            help="First day of the schedule, YYYY-MM-DD (default: "
+            "tomorrow). Pass it explicitly for reproducible data.",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=180,
+            help="Number of days the schedule spans.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        for name, minimum in (
+            ("tickets", 0),
+            ("flights", 1),
+            ("airports", 2),
+            ("routes_per_airport", 1),
+            ("airplanes", 1),
+            ("crew", 1),
+            ("users", 1),
+            ("days", 1),
+        ):
+            if options[name] is not None and options[name] < minimum:
+                raise CommandError(
+                    f"--{name.replace('_', '-')} must be at least {minimum}."
+                )
+        if not 0 < options["load_factor"] <= 1:
+            raise CommandError("--load-factor must be in (0, 1].")
+        generator = DataGenerator(
+            seed=options["seed"],
+            airports=options["airports"],
+            routes_per_airport=options["routes_per_airport"],
+            airplanes=options["airplanes"],
+            crew=options["crew"],
+            users=options["users"],
+            tickets=options["tickets"],
+            flights=options["flights"],
+            load_factor=options["load_factor"],
+            start_date=options["start_date"],
+            days=options["days"],
+            stdout=self.stdout if options["verbosity"] > 1 else None,
+        )
+        self.stdout.write(
+            f"Generating data from {generator.start.date()} "
+            f"with seed {options['seed']}..."
+        )
+        started = time.perf_counter()
+        counts = generator.generate()
+        elapsed = time.perf_counter() - started
+        for table, count in counts.items():
+            self.stdout.write(f"{table:<16} {count:>12,}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {sum(counts.values()):,} rows in {elapsed:.1f}s."
+            )
+        )
@@ -0,0 +1,75 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+
+from airport.schedule_import import (
+    FORMATS,
+    ScheduleFileError,
+    detect_format,
+    read_schedule,
+)
+from airport.serializers import FlightImportSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Import a flight timetable from a CSV or JSON file. Nothing is "
+        "written unless every row is valid."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="File format (default: from the file extension).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only validate the file.",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            with open(options["path"], "rb") as file:
+                flights = read_schedule(
+                    file, options["format"] or detect_format(file.name)
+                )
+        except (OSError, ScheduleFileError) as error:
+            raise CommandError(str(error))
+        serializer = FlightImportSerializer(data={"flights": flights})
+        if not serializer.is_valid():
+            self.report(serializer.errors)
+            raise CommandError("The schedule was not imported.")
+        if options["dry_run"]:
+            self.stdout.write(
+                f"{len(serializer.validated_data['flights'])} flight(s) "
+                "are valid."
+            )
+            return
+        try:
+            created = serializer.save()
+        except ValidationError as error:
+            self.report(error.detail)
+            raise CommandError("The schedule was not imported.")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {len(created)} flight(s) in "
+                f"{time.perf_counter() - started:.1f}s."
+            )
+        )
+
+    def report(self, errors):
+        rows = errors.get("flights")
+        if not isinstance(rows, list) or not any(
+            isinstance(row, dict) for row in rows
+        ):
+            self.stderr.write(json.dumps(errors))
+            return
+        for number, row_errors in enumerate(rows, start=1):
+            if row_errors:
+                self.stderr.write(f"Row {number}: {json.dumps(row_errors)}")
@@ -0,0 +1,91 @@
+import asyncio
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from airport import loadtest
+
+
+class Command(BaseCommand):
+    help = (
+        "Send concurrent GET requests to a running server and report "
+        "throughput and latency percentiles."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "urls",
+            nargs="+",
+            help="URLs requested round-robin, e.g. "
+            "http://localhost:8000/api/airport/flights/.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            nargs="+",
+            default=[50],
+            help="Concurrent connections; several values run in turn.",
+        )
+        parser.add_argument(
+            "--duration", type=float, default=10.0, help="Seconds per run."
+        )
+        parser.add_argument(
+            "--token", help="JWT access token sent as a Bearer header."
+        )
+        parser.add_argument(
+            "--server-pid",
+            type=int,
+            help="PID of the server's master process; the peak resident "
+            "memory of it and its workers is reported for each run "
+            "(Linux only).",
+        )
+        parser.add_argument("--output", help="Save the results as JSON.")
+
+    def handle(self, *args, **options):
+        if any(url.startswith("https://") for url in options["urls"]):
+            raise CommandError("Only plain HTTP servers are supported.")
+        if options["server_pid"] and not Path(
+            f"/proc/{options['server_pid']}"
+        ).exists():
+            raise CommandError(
+                f"No process {options['server_pid']} found in /proc."
+            )
+        headers = {"Accept": "application/json"}
+        if options["token"]:
+            headers["Authorization"] = f"Bearer {options['token']}"
+        results = []
+        for concurrency in options["concurrency"]:
+            result = asyncio.run(
+                loadtest.run(
+                    options["urls"],
+                    concurrency=concurrency,
+                    duration=options["duration"],
+                    headers=headers,
+                    server_pid=options["server_pid"],
+                )
+            )
+            results.append(result)
+            self.stdout.write(
+                f"{concurrency:>5} connections  "
+                f"{result['requests_per_second']:>8.1f} req/s  "
+                f"p50 {result['p50_ms']:>8.2f} ms  "
+                f"p95 {result['p95_ms']:>8.2f} ms  "
+                f"p99 {result['p99_ms']:>8.2f} ms  "
+                f"{result['errors']} errors"
+                + (
+                    f"  {result['server_rss_mb']:.1f} MB"
+                    if "server_rss_mb" in result
+                    else ""
+                )
+            )
+        if options["output"]:
+            output = Path(options["output"])
+            output.parent.mkdir(parents=True, exist_ok=True)
+            output.write_text(
+                json.dumps(
+                    {"urls": options["urls"], "runs": results}, indent=2
+                )
+                + "\n"
+            )
+            self.stdout.write(self.style.SUCCESS(f"Saved {output}"))
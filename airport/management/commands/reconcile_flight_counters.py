@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from airport.models import Airplane, Flight, Ticket
+
+
+class Command(BaseCommand):
+    help = "Recalculate Flight.capacity and Flight.tickets_sold."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many flights have drifted.",
+        )
+
+    def handle(self, *args, **options):
+        sold = Coalesce(
+            Subquery(
+                Ticket.objects.filter(flight=OuterRef("pk"))
+                .order_by()
+                .values("flight")
+                .annotate(count=Count("pk"))
+                .values("count")
+            ),
+            0,
+        )
+        capacity = Subquery(
+            Airplane.objects.filter(pk=OuterRef("airplane_id")).values(
+                capacity=F("rows") * F("seats_in_row")
+            )
+        )
+        drifted = Flight.objects.annotate(
+            actual_sold=sold, actual_capacity=capacity
+        ).exclude(
+            tickets_sold=F("actual_sold"), capacity=F("actual_capacity")
+        )
+        if options["dry_run"]:
+            self.stdout.write(f"{drifted.count()} flight(s) have drifted.")
+            return
+        with transaction.atomic():
+            updated = Flight.objects.filter(
+                pk__in=drifted.values("pk")
+            ).update(tickets_sold=sold, capacity=capacity)
+        self.stdout.write(
+            self.style.SUCCESS(f"Reconciled {updated} flight(s).")
+        )
@@ -0,0 +1,96 @@
+import multiprocessing
+import os
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+from prometheus_client import multiprocess
+
+from airport import tasks
+
+
+def worker(stop, poll_interval):
+    # The parent turns SIGINT/SIGTERM into ``stop`` so a job in progress
+    # is allowed to finish.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    tasks.work(stop, poll_interval)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run background jobs from the job table in a pool of worker "
+        "processes until interrupted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=settings.JOB_WORKERS,
+            help="Worker processes (default: JOB_WORKERS).",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds an idle worker waits before checking again.",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Run every due job in this process, then exit.",
+        )
+
+    def handle(self, *args, **options):
+        if options["burst"]:
+            count = tasks.run_pending()
+            self.stdout.write(self.style.SUCCESS(f"Ran {count} job(s)."))
+            return
+
+        # Forked workers must open their own database connections.
+        connections.close_all()
+        context = multiprocessing.get_context("fork")
+        stop = context.Event()
+        # Only set a flag here: setting ``stop`` from a signal handler can
+        # deadlock with a wait on it in the interrupted main thread.
+        self.stopping = False
+
+        def shutdown(signum, frame):
+            self.stopping = True
+
+        signal.signal(signal.SIGINT, shutdown)
+        signal.signal(signal.SIGTERM, shutdown)
+
+        def start():
+            process = context.Process(
+                target=worker, args=(stop, options["poll_interval"])
+            )
+            process.start()
+            return process
+
+        processes = [start() for _ in range(options["processes"])]
+        self.stdout.write(f"Started {len(processes)} worker(s).")
+        while not self.stopping:
+            time.sleep(1)
+            for index, process in enumerate(processes):
+                if process.is_alive() or self.stopping:
+                    continue
+                self.stderr.write(
+                    f"Worker {process.pid} exited with code "
+                    f"{process.exitcode}; restarting."
+                )
+                self.forget(process)
+                processes[index] = start()
+        stop.set()
+        for process in processes:
+            process.join()
+            self.forget(process)
+        self.stdout.write("Workers stopped.")
+
+    @staticmethod
+    def forget(process):
+        if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+            multiprocess.mark_process_dead(process.pid)
@@ -0,0 +1,98 @@
+import os
+
+from django.http import HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# With PROMETHEUS_MULTIPROC_DIR set, every worker writes its samples to
+# memory-mapped files in that directory and the /metrics view aggregates
+# them, so any worker of a pre-fork server can answer a scrape.
+
+REQUEST_LATENCY = Histogram(
+    "airport_request_duration_seconds",
+    "Time spent serving an API request.",
+    ["endpoint", "method"],
+    buckets=(
+        0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+    ),
+)
+REQUEST_DB_QUERIES = Histogram(
+    "airport_request_db_queries",
+    "Database queries run by an API request.",
+    ["endpoint"],
+    buckets=(1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+REQUEST_DB_TIME = Histogram(
+    "airport_request_db_duration_seconds",
+    "Time an API request spent in the database.",
+    ["endpoint"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1),
+)
+THROTTLED_REQUESTS = Counter(
+    "airport_throttled_requests_total",
+    "Requests rejected by a throttle.",
+    ["endpoint"],
+)
+ORDERS_CREATED = Counter(
+    "airport_orders_created_total", "Orders created."
+)
+TICKETS_BOOKED = Counter(
+    "airport_tickets_booked_total", "Tickets booked through orders."
+)
+TICKET_CONFLICTS = Counter(
+    "airport_ticket_conflicts_total",
+    "Requested seats that were already sold or held.",
+    ["reason"],
+)
+TICKET_VALIDATION_FAILURES = Counter(
+    "airport_ticket_validation_failures_total",
+    "Requested tickets rejected by validation.",
+    ["reason"],
+)
+JOB_DURATION = Histogram(
+    "airport_job_duration_seconds",
+    "Time spent running a background job.",
+    ["task", "status"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 300),
+)
+JOB_QUEUE_DELAY = Histogram(
+    "airport_job_queue_delay_seconds",
+    "Time a due job waited before a worker picked it up.",
+    ["task"],
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900),
+)
+
+
+def observe_request(request_metrics, method, status_code):
+    endpoint = request_metrics.endpoint
+    REQUEST_LATENCY.labels(endpoint, method).observe(
+        request_metrics.total_time
+    )
+    REQUEST_DB_QUERIES.labels(endpoint).observe(request_metrics.queries)
+    REQUEST_DB_TIME.labels(endpoint).observe(request_metrics.db_time)
+    if status_code == 429:
+        THROTTLED_REQUESTS.labels(endpoint).inc()
+
+
+def metrics_view(request):
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(
+        generate_latest(registry), content_type=CONTENT_TYPE_LATEST
+    )
+
+
+def child_exit(server, worker):
+    """Gunicorn hook that drops the gauges of a worker that exited."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.1 on 2026-10-18 05:05
+
+from django.db import migrations, models
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_counters(apps, schema_editor):
+    Airplane = apps.get_model("airport", "Airplane")
+    Flight = apps.get_model("airport", "Flight")
+    Ticket = apps.get_model("airport", "Ticket")
+    Flight.objects.update(
+        tickets_sold=Coalesce(
+            Subquery(
+                Ticket.objects.filter(flight=OuterRef("pk"))
+                .order_by()
+                .values("flight")
+                .annotate(count=Count("pk"))
+                .values("count")
+            ),
+            0,
+        ),
+        capacity=Subquery(
+            Airplane.objects.filter(pk=OuterRef("airplane_id")).values(
+                capacity=F("rows") * F("seats_in_row")
+            )
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0004_seathold"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="flight",
+            name="capacity",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="flight",
+            name="tickets_sold",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-18 05:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0006_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="airport",
+            index=models.Index(
+                fields=["closest_big_city"], name="airport_closest_5e5232_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="flight",
+            index=models.Index(
+                fields=["route", "departure_time"], name="flight_route_i_ab7460_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.1 on 2026-10-18 06:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0009_job"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FlightSchedule",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("weekdays", models.JSONField(default=list)),
+                ("departure", models.TimeField()),
+                ("duration", models.DurationField()),
+                ("starts_on", models.DateField()),
+                ("ends_on", models.DateField()),
+                ("excluded_dates", models.JSONField(blank=True, default=list)),
+                (
+                    "airplane",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="airport.airplane",
+                    ),
+                ),
+                ("crew", models.ManyToManyField(blank=True, to="airport.crew")),
+                (
+                    "route",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="airport.route"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Flight Schedule",
+                "verbose_name_plural": "Flight Schedules",
+                "db_table": "flight_schedule",
+                "ordering": ["starts_on", "departure"],
+            },
+        ),
+        migrations.AddField(
+            model_name="flight",
+            name="schedule",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="flights",
+                to="airport.flightschedule",
+            ),
+        ),
+    ]
@@ -0,0 +1,89 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def copy_flight_times(apps, schema_editor):
+    Flight = apps.get_model("airport", "Flight")
+    FlightCrew = apps.get_model("airport", "FlightCrew")
+    flights = Flight.objects.filter(pk=models.OuterRef("flight_id"))
+    FlightCrew.objects.update(
+        departure_time=models.Subquery(flights.values("departure_time")[:1]),
+        arrival_time=models.Subquery(flights.values("arrival_time")[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+    """
+    Turn the implicit ``flight_crew`` table into the FlightCrew model and
+    copy each flight's times into its crew rows.
+    """
+
+    dependencies = [
+        ("airport", "0010_flight_schedule"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name="FlightCrew",
+                    fields=[
+                        (
+                            "id",
+                            models.BigAutoField(
+                                auto_created=True,
+                                primary_key=True,
+                                serialize=False,
+                                verbose_name="ID",
+                            ),
+                        ),
+                        (
+                            "crew",
+                            models.ForeignKey(
+                                on_delete=django.db.models.deletion.CASCADE,
+                                related_name="assignments",
+                                to="airport.crew",
+                            ),
+                        ),
+                        (
+                            "flight",
+                            models.ForeignKey(
+                                on_delete=django.db.models.deletion.CASCADE,
+                                related_name="crew_assignments",
+                                to="airport.flight",
+                            ),
+                        ),
+                    ],
+                    options={
+                        "db_table": "flight_crew",
+                        "unique_together": {("flight", "crew")},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name="flight",
+                    name="crew",
+                    field=models.ManyToManyField(
+                        through="airport.FlightCrew", to="airport.crew"
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="flightcrew",
+            name="departure_time",
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddField(
+            model_name="flightcrew",
+            name="arrival_time",
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.RunPython(copy_flight_times, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="flightcrew",
+            index=models.Index(
+                fields=["crew", "departure_time"],
+                name="flight_crew_crew_id_f4bd71_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.1 on 2026-10-18 06:56
+
+from django.db import migrations, models
+
+
+def copy_started_at(apps, schema_editor):
+    Job = apps.get_model("airport", "Job")
+    Job.objects.filter(status="running").update(
+        heartbeat_at=models.F("started_at")
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0011_flight_crew"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="heartbeat_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(copy_started_at, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,11 @@
+import bisect
+import datetime
 import os.path
+import random
 import uuid
 from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
 from django.utils.text import slugify
 from django.utils import timezone
 
@@ -26,6 +29,7 @@ class Airport(models.Model):
         verbose_name_plural = "Airports"
         ordering = ["name"]
         db_table = "airport"
+        indexes = [models.Index(fields=["closest_big_city"])]
 
     def __str__(self):
         return f"{self.name} ({self.closest_big_city})"
@@ -80,6 +84,9 @@ class Airplane(models.Model):
         blank=True,
         upload_to=create_custom_path
     )
+    # {"source": <image name>, "variants": {<variant>: {<extension>: name}}}
+    # written by airport.images once the current image is processed.
+    image_variants = models.JSONField(default=dict, editable=False)
 
     class Meta:
         verbose_name = "Airplane"
@@ -90,6 +97,22 @@ class Airplane(models.Model):
     def __str__(self):
         return self.name
 
+    @property
+    def capacity(self):
+        return self.rows * self.seats_in_row
+
+    @property
+    def image_processed(self):
+        return bool(self.image) and (
+            self.image_variants.get("source") == self.image.name
+        )
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.flight_set.exclude(capacity=self.capacity).update(
+            capacity=self.capacity
+        )
+
 
 class Crew(models.Model):
     first_name = models.CharField(max_length=255)
@@ -116,17 +139,420 @@ class Flight(models.Model):
     )
     departure_time = models.DateTimeField()
     arrival_time = models.DateTimeField()
-    crew = models.ManyToManyField(Crew)
+    crew = models.ManyToManyField(Crew, through="FlightCrew")
+    capacity = models.PositiveIntegerField(default=0, editable=False)
+    tickets_sold = models.PositiveIntegerField(default=0, editable=False)
+    schedule = models.ForeignKey(
+        "FlightSchedule",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="flights",
+    )
 
     class Meta:
         verbose_name = "Flight"
         verbose_name_plural = "Flights"
         ordering = ["departure_time"]
         db_table = "flight"
+        indexes = [
+            models.Index(fields=["departure_time", "id"]),
+            models.Index(fields=["route", "departure_time"]),
+        ]
 
     def __str__(self):
         return f"Flight {self.id} on {self.route} at {self.departure_time}"
 
+    @property
+    def tickets_available(self):
+        return self.capacity - self.tickets_sold
+
+    def save(self, *args, **kwargs):
+        self.capacity = self.airplane.capacity
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if not adding:
+            self.crew_assignments.update(
+                departure_time=self.departure_time,
+                arrival_time=self.arrival_time,
+            )
+
+    @classmethod
+    def add_tickets_sold(cls, counts):
+        """Apply ``{flight_id: delta}`` to the sold-ticket counters."""
+        for flight_id in sorted(counts):
+            if counts[flight_id]:
+                cls.objects.filter(pk=flight_id).update(
+                    tickets_sold=models.F("tickets_sold") + counts[flight_id]
+                )
+
+    def seat_map(self):
+        """Return booked or held seats as a row-major bitset, MSB first."""
+        seats_in_row = self.airplane.seats_in_row
+        bitmap = bytearray((self.airplane.rows * seats_in_row + 7) // 8)
+        seats = self.tickets.order_by().values_list("row", "seat").union(
+            self.holds.active().order_by().values_list("row", "seat")
+        )
+        for row, seat in seats:
+            index = (row - 1) * seats_in_row + seat - 1
+            bitmap[index >> 3] |= 0x80 >> (index & 7)
+        return bytes(bitmap)
+
+
+def lock_crew(crew):
+    """
+    Lock the ``crew`` rows and return their primary keys, sorted.
+
+    Rows are locked in primary key order, so concurrent requests that
+    assign the same people check for overlaps and write one at a time.
+    Call inside the transaction that creates the assignments.
+    """
+    crew = sorted({getattr(member, "pk", member) for member in crew})
+    list(
+        Crew.objects.select_for_update()
+        .filter(pk__in=crew)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    return crew
+
+
+class FlightCrewQuerySet(models.QuerySet):
+    def overlapping(self, departure, arrival):
+        """
+        Assignments whose flight overlaps ``[departure, arrival)``.
+
+        No flight lasts longer than MAX_FLIGHT_DURATION, so only
+        assignments departing within that much of ``departure`` can
+        overlap, and the (crew, departure_time) index serves the lookup as
+        a short range scan per crew member.
+        """
+        return self.filter(
+            departure_time__gt=departure - settings.MAX_FLIGHT_DURATION,
+            departure_time__lt=arrival,
+            arrival_time__gt=departure,
+        )
+
+    def conflicts(self, crew, intervals):
+        """
+        Return ``(departure, arrival, assignment)`` for every assignment of
+        ``crew`` that overlaps one of the ``(departure, arrival)``
+        ``intervals``.
+
+        The assignments around all intervals are read with one query and
+        matched to each interval by bisecting their departure times.
+        """
+        intervals = sorted(intervals)
+        if not crew or not intervals:
+            return []
+        assignments = sorted(
+            self.filter(crew__in=crew)
+            .overlapping(
+                intervals[0][0], max(arrival for _, arrival in intervals)
+            )
+            .select_related("crew"),
+            key=lambda assignment: assignment.departure_time,
+        )
+        departures = [assignment.departure_time for assignment in assignments]
+        conflicts = []
+        for departure, arrival in intervals:
+            start = bisect.bisect_right(
+                departures, departure - settings.MAX_FLIGHT_DURATION
+            )
+            end = bisect.bisect_left(departures, arrival)
+            conflicts.extend(
+                (departure, arrival, assignment)
+                for assignment in assignments[start:end]
+                if assignment.arrival_time > departure
+            )
+        return conflicts
+
+
+class FlightCrew(models.Model):
+    """
+    A crew member's seat on a flight, with the flight's times copied in so
+    that one index covers each crew member's timeline.
+    """
+
+    flight = models.ForeignKey(
+        Flight, on_delete=models.CASCADE, related_name="crew_assignments"
+    )
+    crew = models.ForeignKey(
+        Crew, on_delete=models.CASCADE, related_name="assignments"
+    )
+    departure_time = models.DateTimeField(null=True)
+    arrival_time = models.DateTimeField(null=True)
+
+    objects = FlightCrewQuerySet.as_manager()
+
+    class Meta:
+        db_table = "flight_crew"
+        unique_together = ("flight", "crew")
+        indexes = [models.Index(fields=["crew", "departure_time"])]
+
+    def __str__(self):
+        return f"{self.crew} on flight {self.flight_id}"
+
+    def clean(self):
+        if self.crew_id is None:
+            return
+        flight = self.flight
+        conflicts = FlightCrew.objects.exclude(flight_id=flight.pk).conflicts(
+            [self.crew_id], [(flight.departure_time, flight.arrival_time)]
+        )
+        if conflicts:
+            raise ValidationError(
+                {
+                    "crew": [
+                        assignment.conflict_error()
+                        for _, _, assignment in conflicts
+                    ]
+                }
+            )
+
+    def save(self, *args, **kwargs):
+        if self.departure_time is None:
+            self.departure_time = self.flight.departure_time
+            self.arrival_time = self.flight.arrival_time
+        super().save(*args, **kwargs)
+
+    def conflict_error(self):
+        departure = timezone.localtime(self.departure_time)
+        arrival = timezone.localtime(self.arrival_time)
+        return (
+            f"{self.crew} is already on flight {self.flight_id} "
+            f"from {departure:%Y-%m-%d %H:%M} to {arrival:%Y-%m-%d %H:%M}."
+        )
+
+    @classmethod
+    def for_flight(cls, flight, crew_id):
+        return cls(
+            flight_id=flight.pk,
+            crew_id=crew_id,
+            departure_time=flight.departure_time,
+            arrival_time=flight.arrival_time,
+        )
+
+    @classmethod
+    def copy_flight_times(cls, assignments, overwrite=False):
+        """
+        Copy flight times onto ``assignments``; by default only onto those
+        made through ``add()`` or ``set()``, which leave them empty.
+        """
+        if not overwrite:
+            assignments = assignments.filter(departure_time__isnull=True)
+        flights = Flight.objects.filter(pk=models.OuterRef("flight_id"))
+        assignments.update(
+            departure_time=models.Subquery(
+                flights.values("departure_time")[:1]
+            ),
+            arrival_time=models.Subquery(flights.values("arrival_time")[:1]),
+        )
+
+
+class FlightSchedule(models.Model):
+    """
+    A recurring flight, e.g. every Mon/Wed/Fri at 07:40 for a season.
+
+    ``weekdays`` holds ISO weekday numbers (1 is Monday), ``departure`` is
+    local time in TIME_ZONE and ``excluded_dates`` lists ISO dates on
+    which the flight does not run.
+    """
+
+    route = models.ForeignKey(Route, on_delete=models.CASCADE)
+    airplane = models.ForeignKey(Airplane, on_delete=models.CASCADE)
+    crew = models.ManyToManyField(Crew, blank=True)
+    weekdays = models.JSONField(default=list)
+    departure = models.TimeField()
+    duration = models.DurationField()
+    starts_on = models.DateField()
+    ends_on = models.DateField()
+    excluded_dates = models.JSONField(default=list, blank=True)
+
+    class Meta:
+        verbose_name = "Flight Schedule"
+        verbose_name_plural = "Flight Schedules"
+        ordering = ["starts_on", "departure"]
+        db_table = "flight_schedule"
+
+    def __str__(self):
+        return f"{self.route} at {self.departure:%H:%M}"
+
+    def occurrences(self):
+        """Yield ``(departure_time, arrival_time)`` for every flight."""
+        weekdays = set(self.weekdays)
+        excluded = {str(day) for day in self.excluded_dates}
+        day = self.starts_on
+        while day <= self.ends_on:
+            if day.isoweekday() in weekdays and str(day) not in excluded:
+                departure = timezone.make_aware(
+                    datetime.datetime.combine(day, self.departure)
+                )
+                yield departure, departure + self.duration
+            day += datetime.timedelta(days=1)
+
+    def crew_conflicts(self, crew, occurrences):
+        """
+        Return an error for every flight outside this schedule on which a
+        member of ``crew`` is assigned at the time of one of the future
+        ``occurrences``.
+        """
+        now = timezone.now()
+        assignments = FlightCrew.objects.all()
+        if self.pk is not None:
+            assignments = assignments.exclude(flight__schedule_id=self.pk)
+        conflicts = assignments.conflicts(
+            crew,
+            [
+                (departure, arrival)
+                for departure, arrival in occurrences
+                if departure > now
+            ],
+        )
+        return list(
+            dict.fromkeys(
+                assignment.conflict_error() for _, _, assignment in conflicts
+            )
+        )
+
+    def generate(self, occurrences=None):
+        """
+        Bring the schedule's future flights in line with ``occurrences``,
+        by default those of the rule itself.
+
+        Missing flights are created, changed ones updated and unwanted ones
+        deleted, each with one set-based query, and crew rows are fixed
+        only where they differ. Flights that already sold tickets are left
+        as they are; unwanted ones are detached from the schedule instead
+        of being deleted. Returns how many flights each step touched.
+
+        Raises ValidationError, with the schedule's crew locked, if one of
+        them is already on another flight at one of the new times.
+        """
+        if occurrences is None:
+            occurrences = self.occurrences()
+        now = timezone.now()
+        wanted = {
+            departure: arrival
+            for departure, arrival in occurrences
+            if departure > now
+        }
+        with transaction.atomic():
+            crew = lock_crew(self.crew.values_list("id", flat=True))
+            errors = self.crew_conflicts(crew, wanted.items())
+            if errors:
+                raise ValidationError({"crew": errors})
+            existing = {
+                flight.departure_time: flight
+                for flight in self.flights.select_for_update()
+                .filter(departure_time__gt=now)
+                .only(
+                    "id",
+                    "route_id",
+                    "airplane_id",
+                    "departure_time",
+                    "arrival_time",
+                )
+                .annotate(
+                    has_tickets=models.Exists(
+                        Ticket.objects.filter(flight=models.OuterRef("pk"))
+                    )
+                )
+            }
+            deleted, detached, changed, kept = [], [], [], []
+            for departure, flight in existing.items():
+                if departure not in wanted:
+                    if flight.has_tickets:
+                        detached.append(flight.pk)
+                    else:
+                        deleted.append(flight.pk)
+                    continue
+                if flight.has_tickets:
+                    continue
+                kept.append(flight)
+                arrival = wanted[departure]
+                if (
+                    flight.route_id,
+                    flight.airplane_id,
+                    flight.arrival_time,
+                ) != (self.route_id, self.airplane_id, arrival):
+                    flight.route_id = self.route_id
+                    flight.airplane_id = self.airplane_id
+                    flight.arrival_time = arrival
+                    flight.capacity = self.airplane.capacity
+                    changed.append(flight)
+
+            crew = set(crew)
+            assigned = set(
+                FlightCrew.objects.filter(flight_id__in=kept).values_list(
+                    "flight_id", "crew_id"
+                )
+            )
+            extra = {
+                flight_id
+                for flight_id, member in assigned
+                if member not in crew
+            }
+            missing = [
+                (flight, member)
+                for flight in kept
+                for member in crew
+                if (flight.pk, member) not in assigned
+            ]
+
+            if deleted:
+                Flight.objects.filter(pk__in=deleted).delete()
+            if detached:
+                Flight.objects.filter(pk__in=detached).update(schedule=None)
+            Flight.objects.bulk_update(
+                changed,
+                ["route_id", "airplane_id", "arrival_time", "capacity"],
+                batch_size=1_000,
+            )
+            if changed:
+                FlightCrew.copy_flight_times(
+                    FlightCrew.objects.filter(flight__in=changed),
+                    overwrite=True,
+                )
+            created = Flight.objects.bulk_create(
+                (
+                    Flight(
+                        route_id=self.route_id,
+                        airplane_id=self.airplane_id,
+                        departure_time=departure,
+                        arrival_time=arrival,
+                        capacity=self.airplane.capacity,
+                        schedule=self,
+                    )
+                    for departure, arrival in wanted.items()
+                    if departure not in existing
+                ),
+                batch_size=1_000,
+            )
+            if extra:
+                FlightCrew.objects.filter(flight_id__in=extra).exclude(
+                    crew_id__in=crew
+                ).delete()
+            missing += [
+                (flight, member) for flight in created for member in crew
+            ]
+            FlightCrew.objects.bulk_create(
+                (
+                    FlightCrew.for_flight(flight, member)
+                    for flight, member in missing
+                ),
+                batch_size=1_000,
+            )
+        updated = {flight.pk for flight in changed} | extra | {
+            flight.pk for flight, _ in missing
+        }
+        return {
+            "created": len(created),
+            "updated": len(updated - {flight.pk for flight in created}),
+            "deleted": len(deleted),
+            "detached": len(detached),
+        }
+
 
 class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
@@ -140,6 +566,7 @@ class Order(models.Model):
         verbose_name_plural = "Orders"
         ordering = ["-created_at"]
         db_table = "order"
+        indexes = [models.Index(fields=["user", "-created_at", "id"])]
 
     def __str__(self):
         return f"Order #{self.id} by {self.user.username}"
@@ -166,46 +593,450 @@ class Ticket(models.Model):
         db_table = "ticket"
         unique_together = ("flight", "row", "seat")
 
+    departed_error = "Cannot book a ticket: the flight has already departed."
+
     def __str__(self):
         return f"Seat {self.row} - {self.seat} on {self.flight}"
 
     @staticmethod
-    def validate_ticket(row, seat, airplane, error_to_raise):
+    def seat_range_error(row, seat, airplane):
         for ticket_attr_value, ticket_attr_name, airplane_attr_name in [
             (row, "row", "rows"),
             (seat, "seat", "seats_in_row"),
         ]:
             count_attrs = getattr(airplane, airplane_attr_name)
             if not (1 <= ticket_attr_value <= count_attrs):
-                raise error_to_raise(
-                    {
-                        ticket_attr_name: f"{ticket_attr_name} "
-                        f"number must be in available range: "
-                        f"(1, {airplane_attr_name}): "
-                        f"(1, {count_attrs})"
-                    }
-                )
+                return {
+                    ticket_attr_name: f"{ticket_attr_name} "
+                    f"number must be in available range: "
+                    f"(1, {airplane_attr_name}): "
+                    f"(1, {count_attrs})"
+                }
+        return None
+
+    @classmethod
+    def validate_ticket(cls, row, seat, airplane, error_to_raise):
+        error = cls.seat_range_error(row, seat, airplane)
+        if error:
+            raise error_to_raise(error)
+
+    @classmethod
+    def unique_error(cls):
+        return cls().unique_error_message(
+            cls, cls._meta.unique_together[0]
+        ).messages[0]
+
+    def _seat_key(self):
+        return self.pk, self.flight_id, self.row, self.seat
 
     def clean(self):
-        self.validate_ticket(
-            self.row,
-            self.seat,
-            self.flight.airplane,
-            ValidationError,
-        )
-        if self.flight.departure_time < timezone.now():
-            raise ValidationError(
-                "Cannot book a ticket: the flight has already departed."
-            )
+        if None in (self.flight_id, self.row, self.seat):
+            # clean_fields() has already reported the missing values.
+            return
+        flights = None
+        if Ticket.flight.is_cached(self) and Flight.airplane.is_cached(
+            self.flight
+        ):
+            flights = {self.flight_id: self.flight}
+        [error] = TicketValidator(
+            [(self.flight_id, self.row, self.seat)],
+            flights=flights,
+            exclude=[self.pk] if self.pk else (),
+        ).errors()
+        if error:
+            raise ValidationError(error[1])
+        self._checked_seat = self._seat_key()
+
+    def validate_unique(self, exclude=None):
+        # clean() has already checked the seat against booked tickets.
+        if getattr(self, "_checked_seat", None) != self._seat_key():
+            super().validate_unique(exclude)
+
+    def save(self, *args, validate=True, **kwargs):
+        """
+        Validate and save the ticket. Pass ``validate=False`` when the
+        values have already been through ``TicketValidator``.
+        """
+        if validate:
+            # clean() looks the flight up together with its airplane.
+            self.full_clean(exclude=["flight"] if self.flight_id else None)
+        return super().save(*args, **kwargs)
 
-    def save(
+
+class TicketValidator:
+    """
+    Range, departure and uniqueness checks for a batch of tickets.
+
+    ``tickets`` are ``(flight_id, row, seat)`` triples; row and seat are
+    None for tickets that get a seat assigned later. Flights with their
+    airplanes, booked seats and, with ``holds=True``, active holds other
+    than ``user``'s own under ``hold`` are each loaded with one query for
+    the whole batch. ``flights`` maps ids to flights the caller has already
+    loaded together with their airplane; ``exclude`` lists ids of
+    tickets being updated.
+    """
+
+    def __init__(
         self,
-        force_insert=False,
-        force_update=False,
-        using=None,
-        update_fields=None,
+        tickets,
+        flights=None,
+        exclude=(),
+        holds=False,
+        hold=None,
+        user=None,
+        now=None,
     ):
-        self.full_clean()
-        return super(Ticket, self).save(
-            force_insert, force_update, using, update_fields
+        self.tickets = list(tickets)
+        self.flights = dict(flights or {})
+        self.exclude = exclude
+        self.holds = holds
+        self.hold = hold
+        self.user = user
+        self.now = now or timezone.now()
+
+    def _load(self):
+        missing = {flight_id for flight_id, _, _ in self.tickets}
+        missing -= self.flights.keys()
+        if missing:
+            self.flights.update(
+                Flight.objects.select_related("airplane").in_bulk(missing)
+            )
+        seated = [ticket for ticket in self.tickets if ticket[1] is not None]
+        if not seated:
+            return set(), set()
+        seats = {
+            "flight_id__in": self.flights,
+            "row__in": {row for _, row, _ in seated},
+            "seat__in": {seat for _, _, seat in seated},
+        }
+        taken = set(
+            Ticket.objects.filter(**seats)
+            .exclude(pk__in=self.exclude)
+            .order_by()
+            .values_list("flight_id", "row", "seat")
+        )
+        held = set()
+        if self.holds:
+            held = set(
+                SeatHold.objects.active()
+                .filter(**seats)
+                .exclude(token=self.hold, user=self.user)
+                .order_by()
+                .values_list("flight_id", "row", "seat")
+            )
+        return taken, held
+
+    def errors(self):
+        """
+        Return a ``(reason, detail)`` pair, or None, for every ticket.
+
+        ``detail`` is a message or a ``{field: message}`` dict for the
+        caller's own ``ValidationError``. A seat repeated within the batch
+        counts as sold after its first appearance.
+        """
+        taken, held = self._load()
+        errors = []
+        for key in self.tickets:
+            errors.append(self._check(*key, key in taken, key in held))
+            if key[1] is not None:
+                taken.add(key)
+        return errors
+
+    def _check(self, flight_id, row, seat, is_taken, is_held):
+        flight = self.flights.get(flight_id)
+        if flight is None:
+            field = Ticket._meta.get_field("flight")
+            return "unknown_flight", {
+                "flight": field.error_messages["invalid"] % {
+                    "model": "flight",
+                    "field": "id",
+                    "value": flight_id,
+                }
+            }
+        if flight.departure_time < self.now:
+            return "departed", Ticket.departed_error
+        if row is None:
+            return None
+        error = Ticket.seat_range_error(row, seat, flight.airplane)
+        if error:
+            return "out_of_range", error
+        if is_taken:
+            return "sold", Ticket.unique_error()
+        if is_held:
+            return "held", SeatHold.held_error
+        return None
+
+
+class SeatHoldManager(models.Manager):
+    def active(self):
+        return self.filter(expires_at__gt=timezone.now())
+
+    def held_seats(self, flight, user, token):
+        """Seats ``user`` holds on ``flight`` under ``token``."""
+        return set(
+            self.active()
+            .filter(flight=flight, user=user, token=token)
+            .values_list("row", "seat")
+        )
+
+    def release(self, flight, user, token, seats):
+        query = models.Q()
+        for row, seat in seats:
+            query |= models.Q(row=row, seat=seat)
+        if query:
+            self.filter(query, flight=flight, user=user, token=token).delete()
+
+    def hold_seats(self, flight, seats, user, token, expires_at=None):
+        """
+        Hold all requested seats or none of them. Seats already held
+        under ``token`` are kept and their expiry is extended.
+        """
+        expires_at = expires_at or timezone.now() + settings.SEAT_HOLD_TTL
+        seats = set(seats)
+        held_before = self.held_seats(flight, user, token)
+        self.filter(
+            flight=flight,
+            expires_at__lte=timezone.now(),
+            row__in={row for row, _ in seats},
+            seat__in={seat for _, seat in seats},
+        ).delete()
+        booked = set(
+            flight.tickets.filter(
+                row__in={row for row, _ in seats},
+                seat__in={seat for _, seat in seats},
+            ).values_list("row", "seat")
+        )
+        if booked & seats:
+            return []
+        self.bulk_create(
+            [
+                SeatHold(
+                    flight=flight,
+                    row=row,
+                    seat=seat,
+                    user=user,
+                    token=token,
+                    expires_at=expires_at,
+                )
+                for row, seat in seats - held_before
+            ],
+            ignore_conflicts=True,
+        )
+        held = self.held_seats(flight, user, token)
+        if not seats <= held:
+            self.release(flight, user, token, held - held_before)
+            return []
+        rehold = models.Q()
+        for row, seat in seats & held_before:
+            rehold |= models.Q(row=row, seat=seat)
+        if rehold:
+            self.filter(
+                rehold, flight=flight, user=user, token=token
+            ).update(expires_at=expires_at)
+        return sorted(seats)
+
+    def hold_any(self, flight, count, user, token, expires_at=None):
+        """
+        Hold ``count`` free seats without waiting on concurrent buyers.
+
+        Expired holds are reclaimed with ``SKIP LOCKED`` so rows locked by
+        another buyer are passed over. Seats that were never held have no
+        row to lock, so they are claimed with conflict-ignoring inserts
+        starting from a random offset in the free seat list.
+        """
+        now = timezone.now()
+        expires_at = expires_at or now + settings.SEAT_HOLD_TTL
+        held_before = self.held_seats(flight, user, token)
+        # No savepoint needed: the lock only has to last until commit.
+        with transaction.atomic(savepoint=False):
+            reclaimed = list(
+                self.filter(flight=flight, expires_at__lte=now)
+                .exclude(
+                    models.Exists(
+                        Ticket.objects.filter(
+                            flight=flight,
+                            row=models.OuterRef("row"),
+                            seat=models.OuterRef("seat"),
+                        )
+                    )
+                )
+                .select_for_update(skip_locked=True)
+                .values_list("id", flat=True)[:count]
+            )
+            self.filter(id__in=reclaimed).update(
+                user=user, token=token, expires_at=expires_at
+            )
+        acquired = set(
+            self.filter(id__in=reclaimed).values_list("row", "seat")
+            if reclaimed
+            else ()
+        )
+        if len(acquired) < count:
+            taken = set(
+                flight.tickets.order_by()
+                .values_list("row", "seat")
+                .union(
+                    self.filter(flight=flight)
+                    .order_by()
+                    .values_list("row", "seat")
+                )
+            )
+            free = [
+                (row, seat)
+                for row in range(1, flight.airplane.rows + 1)
+                for seat in range(1, flight.airplane.seats_in_row + 1)
+                if (row, seat) not in taken
+            ]
+            offset = random.randrange(len(free)) if free else 0
+            free = free[offset:] + free[:offset]
+            while free and len(acquired) < count:
+                missing = count - len(acquired)
+                chunk, free = free[:missing], free[missing:]
+                self.bulk_create(
+                    [
+                        SeatHold(
+                            flight=flight,
+                            row=row,
+                            seat=seat,
+                            user=user,
+                            token=token,
+                            expires_at=expires_at,
+                        )
+                        for row, seat in chunk
+                    ],
+                    ignore_conflicts=True,
+                )
+                acquired = self.held_seats(flight, user, token) - held_before
+        if len(acquired) < count:
+            self.release(flight, user, token, acquired)
+            return []
+        return sorted(acquired)
+
+
+class SeatHold(models.Model):
+    row = models.IntegerField()
+    seat = models.IntegerField()
+    flight = models.ForeignKey(
+        Flight,
+        on_delete=models.CASCADE,
+        related_name="holds"
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="seat_holds"
+    )
+    token = models.UUIDField(default=uuid.uuid4, db_index=True)
+    expires_at = models.DateTimeField()
+
+    objects = SeatHoldManager()
+
+    class Meta:
+        verbose_name = "Seat Hold"
+        verbose_name_plural = "Seat Holds"
+        ordering = ["flight", "row", "seat"]
+        db_table = "seat_hold"
+        unique_together = ("flight", "row", "seat")
+
+    held_error = "Seat is temporarily held by another customer."
+    sold_out_error = "Not enough free seats on this flight."
+
+    def __str__(self):
+        return f"Hold on seat {self.row} - {self.seat} on {self.flight}"
+
+
+class JobManager(models.Manager):
+    def claim(self):
+        """
+        Mark the most urgent due job as running and return it, or None.
+
+        ``FOR UPDATE SKIP LOCKED`` lets concurrent workers pass over a row
+        another worker is claiming instead of waiting for its lock.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            job = (
+                self.select_for_update(skip_locked=True)
+                .filter(status=Job.Status.QUEUED, run_at__lte=now)
+                .order_by("-priority", "run_at", "id")
+                .first()
+            )
+            if job is None:
+                return None
+            # The status check keeps the claim safe on databases without
+            # row locks, where two workers can select the same job.
+            claimed = self.filter(
+                pk=job.pk, status=Job.Status.QUEUED
+            ).update(
+                status=Job.Status.RUNNING,
+                attempts=models.F("attempts") + 1,
+                started_at=now,
+                heartbeat_at=now,
+            )
+        if not claimed:
+            return None
+        job.status = Job.Status.RUNNING
+        job.attempts += 1
+        job.started_at = job.heartbeat_at = now
+        return job
+
+    def requeue_stale(self, stale_after):
+        """
+        Recover running jobs whose worker has sent no heartbeat for
+        ``stale_after``, i.e. died. Jobs with attempts left are requeued;
+        the rest are marked failed, so a job that kills its worker does
+        not loop forever. Returns how many jobs were requeued.
+        """
+        now = timezone.now()
+        stale = self.filter(
+            status=Job.Status.RUNNING, heartbeat_at__lt=now - stale_after
         )
+        stale.filter(attempts__gte=models.F("max_attempts")).update(
+            status=Job.Status.FAILED,
+            finished_at=now,
+            last_error="The worker running this job stopped responding.",
+        )
+        return stale.filter(attempts__lt=models.F("max_attempts")).update(
+            status=Job.Status.QUEUED, run_at=now
+        )
+
+
+class Job(models.Model):
+    class Status(models.TextChoices):
+        QUEUED = "queued"
+        RUNNING = "running"
+        DONE = "done"
+        FAILED = "failed"
+
+    task = models.CharField(max_length=255)
+    args = models.JSONField(default=list)
+    priority = models.SmallIntegerField(default=0)
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.QUEUED
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    objects = JobManager()
+
+    class Meta:
+        verbose_name = "Job"
+        verbose_name_plural = "Jobs"
+        ordering = ["-created_at"]
+        db_table = "job"
+        indexes = [
+            models.Index(
+                fields=["-priority", "run_at", "id"],
+                condition=models.Q(status="queued"),
+                name="job_queue_idx",
+            )
+        ]
+
+    def __str__(self):
+        return f"Job #{self.id} {self.task} ({self.status})"
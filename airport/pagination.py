@@ -0,0 +1,153 @@
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, Cursor
+from rest_framework.response import Response
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination that seeks on the whole ``ordering`` key.
+
+    ``ordering`` must name concrete columns (``flight_id``, not ``flight``)
+    so that related models' default ordering does not leak into the key.
+
+    DRF's ``CursorPagination`` positions on the first ordering field only
+    and falls back to an offset for ties, so pages deep inside a run of
+    equal values get slower. Comparing the full key keeps every page a
+    bounded index range scan.
+    """
+
+    page_size = 10
+    max_page_size = 100
+    page_size_query_param = "page_size"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self._page_queryset(queryset, request, view)
+        return self._set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """``paginate_queryset`` for async views, using the async ORM."""
+        queryset = self._page_queryset(queryset, request, view)
+        return self._set_page([item async for item in queryset])
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_data(self, data):
+        return {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+
+    def _page_queryset(self, queryset, request, view):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+
+        reverse = bool(self.cursor and self.cursor.reverse)
+        ordering = [
+            self._flip(field) if reverse else field for field in self.ordering
+        ]
+        queryset = queryset.order_by(*ordering)
+        if self.cursor:
+            queryset = queryset.filter(
+                self._seek(
+                    ordering, self._load(self.cursor.position, queryset.model)
+                )
+            )
+        return queryset[:self.page_size + 1]
+
+    def _set_page(self, results):
+        reverse = bool(self.cursor and self.cursor.reverse)
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, bool(self.cursor)
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        position = (
+            self._dump(self.page[-1]) if self.page else self.cursor.position
+        )
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=False, position=position)
+        )
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        position = (
+            self._dump(self.page[0]) if self.page else self.cursor.position
+        )
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=True, position=position)
+        )
+
+    @staticmethod
+    def _flip(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    def _dump(self, item):
+        values = [
+            item[name] if isinstance(item, dict) else getattr(item, name)
+            for name in (field.lstrip("-") for field in self.ordering)
+        ]
+        return json.dumps(values, default=self._encode)
+
+    @staticmethod
+    def _encode(value):
+        # DjangoJSONEncoder rounds datetimes to milliseconds, which would
+        # make the seek condition match rows already on the previous page.
+        if hasattr(value, "isoformat"):
+            return value.isoformat()
+        return str(value)
+
+    def _load(self, position, model):
+        """
+        Decode a cursor position into values of ``model``'s ordering
+        fields, so a tampered cursor is a 404 rather than a query error.
+        """
+        try:
+            values = json.loads(position)
+        except (TypeError, ValueError):
+            values = None
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            return [
+                model._meta.get_field(field.lstrip("-")).to_python(value)
+                for field, value in zip(self.ordering, values)
+            ]
+        except (ValidationError, ValueError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def _seek(ordering, values):
+        """
+        Build ``key > position`` for a mixed-direction composite key.
+
+        The leading field also gets an inclusive bound so the database can
+        turn the expanded OR into a single index range scan.
+        """
+        names = [field.lstrip("-") for field in ordering]
+        lookups = [
+            "lt" if field.startswith("-") else "gt" for field in ordering
+        ]
+        condition = Q()
+        for index, (name, lookup) in enumerate(zip(names, lookups)):
+            condition |= Q(
+                **dict(zip(names[:index], values[:index])),
+                **{f"{name}__{lookup}": values[index]},
+            )
+        return Q(**{f"{names[0]}__{lookups[0]}e": values[0]}) & condition
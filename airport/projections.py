@@ -0,0 +1,133 @@
+from abc import ABC, abstractmethod
+
+from rest_framework import serializers
+from rest_framework.settings import ISO_8601, api_settings
+
+from airport.instrumentation import serializer_timer
+from airport.serializers import (
+    FlightListSerializer,
+    OrderListSerializer,
+    RouteSerializer,
+    TicketListSerializer,
+)
+
+
+class Projection(ABC):
+    """
+    Read-only list representation built from ``QuerySet.values()`` rows.
+
+    Skips model instantiation and per-field serializer dispatch; each
+    subclass must produce exactly what its ``serializer_class`` would,
+    which ``test_projections`` checks.
+    """
+
+    serializer_class = None
+    values = ()
+
+    def __init__(self, context=None):
+        self.context = context or {}
+        self._datetime = datetime_formatter()
+
+    def project(self, queryset):
+        return queryset.values(*self.values)
+
+    @abstractmethod
+    def to_representation(self, row):
+        """Return the serializer's representation of one ``values()`` row."""
+
+    def represent(self, rows):
+        to_representation = self.to_representation
+        with serializer_timer():
+            return [to_representation(row) for row in rows]
+
+
+def datetime_formatter():
+    """
+    Return a function equivalent to ``DateTimeField().to_representation``.
+
+    The DRF field looks up the output format and current timezone for
+    every value; with the default ISO 8601 format both are resolved once.
+    """
+    field = serializers.DateTimeField()
+    output_format = api_settings.DATETIME_FORMAT
+    field_timezone = field.default_timezone()
+    if (
+        not output_format
+        or output_format.lower() != ISO_8601
+        or field_timezone is None
+    ):
+        return field.to_representation
+
+    def to_representation(value):
+        if not value:
+            return None
+        value = value.astimezone(field_timezone).isoformat()
+        if value.endswith("+00:00"):
+            value = value[:-6] + "Z"
+        return value
+
+    return to_representation
+
+
+class FlightListProjection(Projection):
+    serializer_class = FlightListSerializer
+    values = ("id", "departure_time", "arrival_time", "route_id")
+
+    def to_representation(self, row):
+        datetime = self._datetime
+        return {
+            "id": row["id"],
+            "departure_time": datetime(row["departure_time"]),
+            "arrival_time": datetime(row["arrival_time"]),
+            "route": row["route_id"],
+        }
+
+
+class TicketListProjection(Projection):
+    serializer_class = TicketListSerializer
+    values = ("id", "row", "seat", "flight_id")
+
+    def to_representation(self, row):
+        return {
+            "id": row["id"],
+            "row": row["row"],
+            "seat": row["seat"],
+            "flight": row["flight_id"],
+        }
+
+
+class OrderListProjection(Projection):
+    serializer_class = OrderListSerializer
+    values = ("id", "created_at")
+
+    def to_representation(self, row):
+        return {
+            "id": row["id"],
+            "created_at": self._datetime(row["created_at"]),
+        }
+
+
+class RouteProjection(Projection):
+    serializer_class = RouteSerializer
+    values = (
+        "id", "distance",
+        "source__id", "source__name", "source__closest_big_city",
+        "destination__id", "destination__name",
+        "destination__closest_big_city",
+    )
+
+    def to_representation(self, row):
+        return {
+            "id": row["id"],
+            "source": {
+                "id": row["source__id"],
+                "name": row["source__name"],
+                "closest_big_city": row["source__closest_big_city"],
+            },
+            "destination": {
+                "id": row["destination__id"],
+                "name": row["destination__name"],
+                "closest_big_city": row["destination__closest_big_city"],
+            },
+            "distance": row["distance"],
+        }
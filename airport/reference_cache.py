@@ -0,0 +1,131 @@
+import threading
+import uuid
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+from airport.db_router import primary_reads
+from airport.models import Airplane, AirplaneType, Airport, Crew, Route
+
+# Cached data for a model is keyed by the versions of every model whose
+# rows it embeds, so a change to an Airport also retires cached Routes.
+DEPENDENCIES = {
+    Airport: (Airport,),
+    Route: (Route, Airport),
+    AirplaneType: (AirplaneType,),
+    Airplane: (Airplane, AirplaneType),
+    Crew: (Crew,),
+}
+
+SELECT_RELATED = {
+    Route: ("source", "destination"),
+    Airplane: ("airplane_type",),
+}
+
+
+class ReferenceCache:
+    """
+    Versioned cache for rarely changing reference data.
+
+    Keys embed a version token per model; signals replace the token on
+    every write, so stale entries are never read again and simply expire.
+    Works with any Django cache backend, local or shared.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def shared():
+        """
+        Whether the default cache is shared by all processes. With a
+        process-local cache a bump is only seen by the process that made
+        it.
+        """
+        return not isinstance(
+            caches[DEFAULT_CACHE_ALIAS], (LocMemCache, DummyCache)
+        )
+
+    @staticmethod
+    def _version_key(model):
+        return f"airport:version:{model._meta.label_lower}"
+
+    def bump(self, model):
+        cache.set(self._version_key(model), uuid.uuid4().hex, None)
+
+    def version(self, model):
+        return self.versions([model])[model]
+
+    def versions(self, models):
+        keys = {self._version_key(model): model for model in models}
+        found = cache.get_many(keys)
+        for key in keys.keys() - found.keys():
+            cache.add(key, uuid.uuid4().hex, None)
+            found[key] = cache.get(key)
+        return {model: found[key] for key, model in keys.items()}
+
+    def key(self, models, *parts):
+        versions = self.versions(models)
+        return ":".join(
+            ["airport:ref"]
+            + [versions[model] for model in models]
+            + [str(part) for part in parts]
+        )
+
+    def record(self, hits=0, misses=0):
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    def get(self, key):
+        value = cache.get(key)
+        self.record(hits=value is not None, misses=value is None)
+        return value
+
+    def set(self, key, value):
+        cache.set(key, value, settings.REFERENCE_CACHE_TIMEOUT)
+
+    def representations(self, serializer_class, pks, context=None):
+        """Return ``{pk: serializer_class(obj).data}`` using the cache."""
+        model = serializer_class.Meta.model
+        prefix = self.key(
+            DEPENDENCIES[model],
+            serializer_class.__name__,
+            _base_uri(context),
+        )
+        keys = {pk: f"{prefix}:{pk}" for pk in pks}
+        found = cache.get_many(keys.values())
+        result = {pk: found[key] for pk, key in keys.items() if key in found}
+        missing = [pk for pk in keys if pk not in result]
+        self.record(hits=len(result), misses=len(missing))
+        if missing:
+            queryset = model.objects.select_related(
+                *SELECT_RELATED.get(model, ())
+            )
+            with primary_reads():
+                loaded = {
+                    pk: serializer_class(obj, context=context).data
+                    for pk, obj in queryset.in_bulk(missing).items()
+                }
+            cache.set_many(
+                {keys[pk]: data for pk, data in loaded.items()},
+                settings.REFERENCE_CACHE_TIMEOUT,
+            )
+            result.update(loaded)
+        return result
+
+
+def _base_uri(context):
+    request = (context or {}).get("request")
+    return request.build_absolute_uri("/") if request else ""
+
+
+reference_cache = ReferenceCache()
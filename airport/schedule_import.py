@@ -0,0 +1,49 @@
+import csv
+import io
+import json
+
+FORMATS = ("csv", "json")
+
+
+class ScheduleFileError(ValueError):
+    pass
+
+
+def detect_format(name):
+    extension = name.rsplit(".", 1)[-1].lower()
+    if extension not in FORMATS:
+        raise ScheduleFileError(
+            f"Unsupported file type {extension!r}; use CSV or JSON."
+        )
+    return extension
+
+
+def read_schedule(file, file_format):
+    """
+    Return the flights of a timetable file as dicts for
+    ``FlightImportSerializer``.
+
+    CSV files need a header with ``route``, ``airplane``,
+    ``departure_time`` and ``arrival_time`` columns and an optional
+    ``crew`` column of crew IDs separated by spaces or semicolons. JSON
+    files hold a list of flights or an object with a ``flights`` list.
+    """
+    content = file.read()
+    if isinstance(content, bytes):
+        try:
+            content = content.decode("utf-8-sig")
+        except UnicodeDecodeError as error:
+            raise ScheduleFileError(
+                f"The file is not valid UTF-8 text: {error}"
+            )
+    if file_format == "json":
+        try:
+            data = json.loads(content)
+        except ValueError as error:
+            raise ScheduleFileError(f"Invalid JSON: {error}")
+        return data.get("flights") if isinstance(data, dict) else data
+    rows = []
+    for row in csv.DictReader(io.StringIO(content)):
+        row["crew"] = (row.get("crew") or "").replace(";", " ").split()
+        rows.append(row)
+    return rows
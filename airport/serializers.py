@@ -1,6 +1,17 @@
-from django.db import transaction
+import datetime
+import uuid
+from collections import Counter, defaultdict
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 from user.serializers import UserSerializer
+from airport import metrics
+from airport.images import FORMATS, VARIANTS, check_image
+from airport.reference_cache import reference_cache
 from airport.models import (
     Airport,
     Route,
@@ -8,8 +19,13 @@ from airport.models import (
     Airplane,
     Crew,
     Flight,
+    FlightCrew,
+    FlightSchedule,
     Order,
-    Ticket
+    SeatHold,
+    Ticket,
+    TicketValidator,
+    lock_crew,
 )
 
 
@@ -45,17 +61,78 @@ class AirplaneTypeSerializer(serializers.ModelSerializer):
         fields = ["id", "name"]
 
 
+@extend_schema_field(
+    {
+        "type": "object",
+        "nullable": True,
+        "properties": {
+            variant: {
+                "type": "object",
+                "properties": {
+                    extension: {"type": "string", "format": "uri"}
+                    for extension in FORMATS
+                },
+            }
+            for variant in VARIANTS
+        },
+    }
+)
+class ImageVariantsField(serializers.Field):
+    """
+    ``{variant: {extension: url}}`` for a processed image, or None while
+    the variants are still being made.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs["source"] = "*"
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, instance):
+        if not instance.image_processed:
+            return None
+        request = self.context.get("request")
+        return {
+            variant: {
+                extension: self.url(name, request)
+                for extension, name in formats.items()
+            }
+            for variant, formats in instance.image_variants[
+                "variants"
+            ].items()
+        }
+
+    @staticmethod
+    def url(name, request):
+        url = default_storage.url(name)
+        if request is None:
+            return url
+        return request.build_absolute_uri(url)
+
+
 class AirplaneSerializer(serializers.ModelSerializer):
     airplane_type = AirplaneTypeSerializer(read_only=True)
+    image = serializers.FileField(
+        required=False, allow_null=True, validators=[check_image]
+    )
+    images = ImageVariantsField()
 
     class Meta:
         model = Airplane
         fields = [
-            "id", "name", "rows", "seats_in_row", "airplane_type", "image"
+            "id",
+            "name",
+            "rows",
+            "seats_in_row",
+            "airplane_type",
+            "image",
+            "images",
         ]
 
 
 class AirplaneImageSerializer(serializers.ModelSerializer):
+    image = serializers.FileField(validators=[check_image])
+
     class Meta:
         model = Airplane
         fields = ("id", "image")
@@ -77,6 +154,31 @@ class CrewSerializer(serializers.ModelSerializer):
         fields = ["id", "first_name", "last_name"]
 
 
+class CachedReferenceField(serializers.Field):
+    """Read-only nested representation served from the reference cache."""
+
+    def __init__(self, serializer_class, many=False, **kwargs):
+        self.serializer_class = serializer_class
+        self.many = many
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        value = super().get_attribute(instance)
+        if self.many:
+            return [obj.pk for obj in value.all()]
+        return value
+
+    def to_representation(self, value):
+        pks = value if self.many else [value]
+        representations = reference_cache.representations(
+            self.serializer_class, pks, self.context
+        )
+        if self.many:
+            return [representations[pk] for pk in pks if pk in representations]
+        return representations.get(value)
+
+
 class FlightListSerializer(serializers.ModelSerializer):
     class Meta:
         model = Flight
@@ -84,9 +186,9 @@ class FlightListSerializer(serializers.ModelSerializer):
 
 
 class FlightDetailSerializer(serializers.ModelSerializer):
-    route = RouteSerializer(read_only=True)
-    airplane = AirplaneSerializer(read_only=True)
-    crew = CrewSerializer(read_only=True, many=True)
+    route = CachedReferenceField(RouteSerializer, source="route_id")
+    airplane = CachedReferenceField(AirplaneSerializer, source="airplane_id")
+    crew = CachedReferenceField(CrewSerializer, many=True)
 
     class Meta:
         model = Flight
@@ -97,6 +199,15 @@ class FlightDetailSerializer(serializers.ModelSerializer):
         ]
 
 
+def check_flight_times(departure, arrival):
+    """Return an error for an impossible flight duration, if any."""
+    if arrival <= departure:
+        return "Arrival must be after departure."
+    if arrival - departure > settings.MAX_FLIGHT_DURATION:
+        return f"A flight can last at most {settings.MAX_FLIGHT_DURATION}."
+    return None
+
+
 class FlightCreateUpdateSerializer(serializers.ModelSerializer):
     route = serializers.PrimaryKeyRelatedField(queryset=Route.objects.all())
     airplane = serializers.PrimaryKeyRelatedField(
@@ -113,6 +224,393 @@ class FlightCreateUpdateSerializer(serializers.ModelSerializer):
             "route", "airplane", "departure_time", "arrival_time", "crew"
         ]
 
+    def flight_times(self, attrs):
+        return tuple(
+            attrs.get(field, getattr(self.instance, field, None))
+            for field in ("departure_time", "arrival_time")
+        )
+
+    def validate(self, attrs):
+        error = check_flight_times(*self.flight_times(attrs))
+        if error:
+            raise serializers.ValidationError({"arrival_time": [error]})
+        return attrs
+
+    def check_crew(self, validated_data):
+        """Reject crew members already flying at the flight's times."""
+        if "crew" in validated_data:
+            crew = validated_data["crew"]
+        else:
+            crew = self.instance.crew.values_list("pk", flat=True)
+        assignments = FlightCrew.objects.all()
+        if self.instance is not None:
+            assignments = assignments.exclude(flight=self.instance)
+        conflicts = assignments.conflicts(
+            lock_crew(crew), [self.flight_times(validated_data)]
+        )
+        if conflicts:
+            raise serializers.ValidationError(
+                {
+                    "crew": [
+                        assignment.conflict_error()
+                        for _, _, assignment in conflicts
+                    ]
+                }
+            )
+
+    def create(self, validated_data):
+        with transaction.atomic():
+            self.check_crew(validated_data)
+            return super().create(validated_data)
+
+    def update(self, instance, validated_data):
+        with transaction.atomic():
+            self.check_crew(validated_data)
+            return super().update(instance, validated_data)
+
+
+class FlightImportRowSerializer(serializers.Serializer):
+    route = serializers.IntegerField()
+    airplane = serializers.IntegerField()
+    departure_time = serializers.DateTimeField()
+    arrival_time = serializers.DateTimeField()
+    crew = serializers.ListField(
+        child=serializers.IntegerField(), required=False, default=list
+    )
+
+
+class FlightImportSerializer(serializers.Serializer):
+    """
+    Validate a whole timetable and create it in one transaction.
+
+    Foreign keys of all rows are resolved with one ``in_bulk`` per model;
+    errors are reported per row, aligned with the input.
+    """
+
+    flights = FlightImportRowSerializer(many=True, allow_empty=False)
+
+    def validate(self, attrs):
+        rows = attrs["flights"]
+        routes = Route.objects.only("id").in_bulk(
+            {row["route"] for row in rows}
+        )
+        airplanes = Airplane.objects.only(
+            "id", "rows", "seats_in_row"
+        ).in_bulk({row["airplane"] for row in rows})
+        crew = Crew.objects.only("id").in_bulk(
+            {member for row in rows for member in row["crew"]}
+        )
+        errors = []
+        for row in rows:
+            row_errors = {}
+            error = check_flight_times(
+                row["departure_time"], row["arrival_time"]
+            )
+            if error:
+                row_errors["arrival_time"] = [error]
+            for field, found in (("route", routes), ("airplane", airplanes)):
+                if row[field] not in found:
+                    row_errors[field] = [
+                        serializers.PrimaryKeyRelatedField
+                        .default_error_messages["does_not_exist"]
+                        .format(pk_value=row[field])
+                    ]
+            missing = [member for member in row["crew"] if member not in crew]
+            if missing:
+                row_errors["crew"] = [
+                    serializers.PrimaryKeyRelatedField
+                    .default_error_messages["does_not_exist"]
+                    .format(pk_value=member)
+                    for member in missing
+                ]
+            errors.append(row_errors)
+        for row_errors, crew_errors in zip(errors, self.crew_errors(rows)):
+            if crew_errors:
+                row_errors.setdefault("crew", []).extend(crew_errors)
+        if any(errors):
+            raise serializers.ValidationError({"flights": errors})
+        for row in rows:
+            row["airplane"] = airplanes[row["airplane"]]
+        return attrs
+
+    @staticmethod
+    def crew_errors(rows):
+        """
+        Crew conflicts per row, with existing flights and between rows.
+
+        Existing assignments are checked with one query for the whole
+        import; rows are compared per crew member in departure order.
+        """
+        errors = [[] for _ in rows]
+        intervals = defaultdict(list)
+        for index, row in enumerate(rows):
+            if row["crew"]:
+                intervals[row["departure_time"], row["arrival_time"]].append(
+                    index
+                )
+        crew = {member for row in rows for member in row["crew"]}
+        conflicts = FlightCrew.objects.conflicts(crew, intervals)
+        for departure, arrival, assignment in conflicts:
+            for index in intervals[departure, arrival]:
+                if assignment.crew_id in rows[index]["crew"]:
+                    errors[index].append(assignment.conflict_error())
+
+        timelines = defaultdict(list)
+        for index, row in enumerate(rows):
+            for member in set(row["crew"]):
+                timelines[member].append(
+                    (row["departure_time"], row["arrival_time"], index)
+                )
+        for member, timeline in timelines.items():
+            latest = None
+            for departure, arrival, index in sorted(timeline):
+                if latest is not None and departure < latest[1]:
+                    errors[index].append(
+                        f"Crew member {member} is also on flight "
+                        f"{latest[2] + 1} of this import at that time."
+                    )
+                if latest is None or arrival > latest[1]:
+                    latest = (departure, arrival, index)
+        return errors
+
+    def create(self, validated_data):
+        rows = validated_data["flights"]
+        with transaction.atomic():
+            # Check again with the crew locked, in case another request
+            # assigned them since validation.
+            lock_crew(member for row in rows for member in row["crew"])
+            errors = self.crew_errors(rows)
+            if any(errors):
+                raise serializers.ValidationError(
+                    {
+                        "flights": [
+                            {"crew": row} if row else {} for row in errors
+                        ]
+                    }
+                )
+            flights = Flight.objects.bulk_create(
+                (
+                    Flight(
+                        route_id=row["route"],
+                        airplane=row["airplane"],
+                        departure_time=row["departure_time"],
+                        arrival_time=row["arrival_time"],
+                        capacity=row["airplane"].capacity,
+                    )
+                    for row in rows
+                ),
+                batch_size=1_000,
+            )
+            FlightCrew.objects.bulk_create(
+                (
+                    FlightCrew.for_flight(flight, member)
+                    for flight, row in zip(flights, rows)
+                    for member in dict.fromkeys(row["crew"])
+                ),
+                batch_size=1_000,
+            )
+        return flights
+
+
+class FlightScheduleSerializer(serializers.ModelSerializer):
+    route = serializers.PrimaryKeyRelatedField(queryset=Route.objects.all())
+    airplane = serializers.PrimaryKeyRelatedField(
+        queryset=Airplane.objects.all()
+    )
+    crew = serializers.PrimaryKeyRelatedField(
+        queryset=Crew.objects.all(), many=True, required=False
+    )
+    weekdays = serializers.ListField(
+        child=serializers.IntegerField(min_value=1, max_value=7),
+        allow_empty=False,
+        help_text="ISO weekdays, 1 (Monday) to 7 (Sunday)",
+    )
+    excluded_dates = serializers.ListField(
+        child=serializers.DateField(), required=False
+    )
+    generated = serializers.SerializerMethodField()
+
+    class Meta:
+        model = FlightSchedule
+        fields = [
+            "id",
+            "route",
+            "airplane",
+            "crew",
+            "weekdays",
+            "departure",
+            "duration",
+            "starts_on",
+            "ends_on",
+            "excluded_dates",
+            "generated",
+        ]
+
+    def validate_weekdays(self, weekdays):
+        return sorted(set(weekdays))
+
+    def validate_excluded_dates(self, dates):
+        return sorted({day.isoformat() for day in dates})
+
+    def validate_duration(self, duration):
+        if duration <= datetime.timedelta(0):
+            raise serializers.ValidationError("Duration must be positive.")
+        if duration > settings.MAX_FLIGHT_DURATION:
+            raise serializers.ValidationError(
+                f"A flight can last at most {settings.MAX_FLIGHT_DURATION}."
+            )
+        return duration
+
+    def validate(self, attrs):
+        starts_on = attrs.get("starts_on") or self.instance.starts_on
+        ends_on = attrs.get("ends_on") or self.instance.ends_on
+        if ends_on < starts_on:
+            raise serializers.ValidationError(
+                {"ends_on": ["The season must end after it starts."]}
+            )
+        if (ends_on - starts_on).days > 366:
+            raise serializers.ValidationError(
+                {"ends_on": ["A season can last at most a year."]}
+            )
+        return attrs
+
+    def get_generated(self, schedule) -> dict | None:
+        """Flights touched by the last ``generate()`` of this request."""
+        return getattr(schedule, "generated", None)
+
+    @staticmethod
+    def generate(schedule):
+        try:
+            schedule.generated = schedule.generate()
+        except DjangoValidationError as error:
+            raise serializers.ValidationError(error.message_dict)
+
+    def create(self, validated_data):
+        with transaction.atomic():
+            schedule = super().create(validated_data)
+            self.generate(schedule)
+        return schedule
+
+    def update(self, instance, validated_data):
+        with transaction.atomic():
+            schedule = super().update(instance, validated_data)
+            self.generate(schedule)
+        return schedule
+
+
+class FlightFilterSerializer(serializers.Serializer):
+    date = serializers.DateField(
+        required=False, help_text="Departure date (YYYY-MM-DD)"
+    )
+    departure_from = serializers.DateTimeField(
+        required=False, help_text="Departures at or after this moment"
+    )
+    departure_to = serializers.DateTimeField(
+        required=False, help_text="Departures before this moment"
+    )
+    route = serializers.IntegerField(required=False)
+    airplane = serializers.IntegerField(required=False)
+    source = serializers.IntegerField(
+        required=False, help_text="Source airport ID"
+    )
+    destination = serializers.IntegerField(
+        required=False, help_text="Destination airport ID"
+    )
+    source_city = serializers.CharField(required=False)
+    destination_city = serializers.CharField(required=False)
+
+
+class CrewRosterSerializer(serializers.Serializer):
+    start = serializers.DateTimeField(
+        required=False, help_text="Window start (default: now)"
+    )
+    end = serializers.DateTimeField(
+        required=False, help_text="Window end (default: start + 14 days)"
+    )
+
+    def validate(self, attrs):
+        attrs.setdefault("start", timezone.now())
+        attrs.setdefault(
+            "end", attrs["start"] + datetime.timedelta(days=14)
+        )
+        if attrs["end"] <= attrs["start"]:
+            raise serializers.ValidationError(
+                {"end": ["The window must end after it starts."]}
+            )
+        if attrs["end"] - attrs["start"] > datetime.timedelta(days=92):
+            raise serializers.ValidationError(
+                {"end": ["A roster can span at most 92 days."]}
+            )
+        return attrs
+
+
+class ExportSerializer(serializers.Serializer):
+    export_format = serializers.ChoiceField(
+        choices=["ndjson", "csv"], default="ndjson"
+    )
+
+
+class FlightExportSerializer(ExportSerializer, FlightFilterSerializer):
+    pass
+
+
+class TicketExportSerializer(ExportSerializer):
+    flight = serializers.IntegerField(required=False)
+    order = serializers.IntegerField(required=False)
+    departure_from = serializers.DateTimeField(
+        required=False, help_text="Flights departing at or after this moment"
+    )
+    departure_to = serializers.DateTimeField(
+        required=False, help_text="Flights departing before this moment"
+    )
+
+
+class OrderExportSerializer(ExportSerializer):
+    created_from = serializers.DateTimeField(required=False)
+    created_to = serializers.DateTimeField(required=False)
+
+
+class ItinerarySearchSerializer(serializers.Serializer):
+    source = serializers.IntegerField()
+    destination = serializers.IntegerField()
+    date = serializers.DateField()
+    max_legs = serializers.IntegerField(
+        min_value=1, max_value=3, default=2
+    )
+    min_connection = serializers.IntegerField(
+        min_value=0, default=45, help_text="Minutes"
+    )
+    max_connection = serializers.IntegerField(
+        min_value=1, default=24 * 60, help_text="Minutes"
+    )
+    sort = serializers.ChoiceField(
+        choices=["time", "distance"], default="time"
+    )
+
+    def validate(self, attrs):
+        if attrs["min_connection"] > attrs["max_connection"]:
+            raise serializers.ValidationError(
+                "min_connection cannot exceed max_connection."
+            )
+        return attrs
+
+
+class ItineraryLegSerializer(serializers.Serializer):
+    flight = serializers.IntegerField(source="id")
+    route = serializers.IntegerField(source="route_id")
+    source = serializers.IntegerField(source="route__source_id")
+    destination = serializers.IntegerField(source="route__destination_id")
+    departure_time = serializers.DateTimeField()
+    arrival_time = serializers.DateTimeField()
+
+
+class ItinerarySerializer(serializers.Serializer):
+    departure_time = serializers.DateTimeField()
+    arrival_time = serializers.DateTimeField()
+    duration = serializers.DurationField()
+    distance = serializers.IntegerField()
+    legs = ItineraryLegSerializer(many=True)
+
 
 class TicketListSerializer(serializers.ModelSerializer):
     class Meta:
@@ -130,12 +628,15 @@ class TicketDetailSerializer(serializers.ModelSerializer):
 
 
 class TicketCreateUpdateSerializer(serializers.ModelSerializer):
-    flight = serializers.PrimaryKeyRelatedField(queryset=Flight.objects.all())
+    flight = serializers.PrimaryKeyRelatedField(
+        queryset=Flight.objects.select_related("airplane")
+    )
     order = serializers.PrimaryKeyRelatedField(queryset=Order.objects.all())
 
     class Meta:
         model = Ticket
         fields = ["row", "seat", "flight", "order"]
+        validators = []
 
     def validate(self, attrs):
         row = attrs.get("row")
@@ -146,15 +647,26 @@ class TicketCreateUpdateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(
                 "row, seat, flight and order are required."
             )
-        Ticket.validate_ticket(
-            row=row,
-            seat=seat,
-            order=order,
-            flight=flight,
-            error_class=serializers.ValidationError
-        )
+        [error] = TicketValidator(
+            [(flight.pk, row, seat)],
+            flights={flight.pk: flight},
+            exclude=[self.instance.pk] if self.instance else (),
+        ).errors()
+        if error:
+            raise serializers.ValidationError(error[1])
         return attrs
 
+    def create(self, validated_data):
+        ticket = Ticket(**validated_data)
+        ticket.save(validate=False)
+        return ticket
+
+    def update(self, instance, validated_data):
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(validate=False)
+        return instance
+
 
 class OrderListSerializer(serializers.ModelSerializer):
     class Meta:
@@ -171,18 +683,163 @@ class OrderDetailSerializer(serializers.ModelSerializer):
         fields = ["id", "created_at", "user", "tickets"]
 
 
+class SeatSerializer(serializers.Serializer):
+    row = serializers.IntegerField()
+    seat = serializers.IntegerField()
+
+
+class SeatHoldSerializer(serializers.Serializer):
+    hold = serializers.UUIDField(required=False)
+    seats = SeatSerializer(many=True, required=False, allow_empty=False)
+    count = serializers.IntegerField(required=False, min_value=1)
+
+    def validate(self, attrs):
+        if ("seats" in attrs) == ("count" in attrs):
+            raise serializers.ValidationError(
+                "Provide either seats or count."
+            )
+        flight = self.context["flight"]
+        for seat in attrs.get("seats", []):
+            Ticket.validate_ticket(
+                seat["row"],
+                seat["seat"],
+                flight.airplane,
+                serializers.ValidationError,
+            )
+        if flight.departure_time < timezone.now():
+            raise serializers.ValidationError(Ticket.departed_error)
+        return attrs
+
+
+class OrderTicketSerializer(serializers.ModelSerializer):
+    flight = serializers.IntegerField(source="flight_id")
+
+    class Meta:
+        model = Ticket
+        fields = ["row", "seat", "flight"]
+        extra_kwargs = {
+            "row": {"required": False},
+            "seat": {"required": False},
+        }
+        validators = []
+
+    def validate(self, attrs):
+        if ("row" in attrs) != ("seat" in attrs):
+            raise serializers.ValidationError(
+                "row and seat must be provided together."
+            )
+        return attrs
+
+
 class OrderCreateUpdateSerializer(serializers.ModelSerializer):
-    tickets = TicketCreateUpdateSerializer(many=True)
+    tickets = OrderTicketSerializer(many=True, allow_empty=False)
+    hold = serializers.UUIDField(write_only=True, required=False)
 
     class Meta:
         model = Order
-        fields = ["tickets"]
+        fields = ["tickets", "hold"]
+
+    def validate(self, attrs):
+        tickets = attrs["tickets"]
+        validator = TicketValidator(
+            [
+                (ticket["flight_id"], ticket.get("row"), ticket.get("seat"))
+                for ticket in tickets
+            ],
+            holds=True,
+            hold=attrs.get("hold"),
+            user=self.context["request"].user,
+        )
+        errors = [
+            self._ticket_error(ticket, error)
+            for ticket, error in zip(tickets, validator.errors())
+        ]
+        if any(errors):
+            raise serializers.ValidationError({"tickets": errors})
+        for ticket in tickets:
+            ticket["flight"] = validator.flights[ticket.pop("flight_id")]
+        return attrs
+
+    @staticmethod
+    def _ticket_error(ticket, error):
+        if error is None:
+            return {}
+        reason, detail = error
+        if reason in ("sold", "held"):
+            metrics.TICKET_CONFLICTS.labels(reason).inc()
+        else:
+            metrics.TICKET_VALIDATION_FAILURES.labels(reason).inc()
+        if reason == "unknown_flight":
+            detail = {
+                "flight": serializers.PrimaryKeyRelatedField
+                .default_error_messages["does_not_exist"]
+                .format(pk_value=ticket["flight_id"])
+            }
+        return serializers.as_serializer_error(
+            serializers.ValidationError(detail)
+        )
+
+    @staticmethod
+    def _assign_seats(tickets_data, user, token):
+        """
+        Hold seats for tickets without one and return the holds taken as
+        ``(flight, seats)`` pairs. Each hold commits on its own, so other
+        buyers skip these seats instead of waiting on this order.
+        """
+        unassigned = defaultdict(list)
+        for ticket_data in tickets_data:
+            if "row" not in ticket_data:
+                unassigned[ticket_data["flight"]].append(ticket_data)
+        assigned = []
+        for flight, flight_tickets in unassigned.items():
+            seats = SeatHold.objects.hold_any(
+                flight, len(flight_tickets), user, token
+            )
+            if not seats:
+                metrics.TICKET_CONFLICTS.labels("sold_out").inc()
+                for held_flight, held_seats in assigned:
+                    SeatHold.objects.release(
+                        held_flight, user, token, held_seats
+                    )
+                raise serializers.ValidationError(
+                    {"tickets": [SeatHold.sold_out_error]}
+                )
+            assigned.append((flight, seats))
+            for ticket_data, (row, seat) in zip(flight_tickets, seats):
+                ticket_data["row"] = row
+                ticket_data["seat"] = seat
+        return assigned
 
     def create(self, validated_data):
         tickets_data = validated_data.pop("tickets")
+        token = validated_data.pop("hold", None) or uuid.uuid4()
         user = self.context["request"].user
-        with transaction.atomic():
-            order = Order.objects.create(user=user, **validated_data)
-            for ticket_data in tickets_data:
-                Ticket.objects.create(order=order, **ticket_data)
+        assigned = self._assign_seats(tickets_data, user, token)
+        try:
+            with transaction.atomic():
+                order = Order.objects.create(user=user, **validated_data)
+                Ticket.objects.bulk_create(
+                    Ticket(order=order, **ticket_data)
+                    for ticket_data in tickets_data
+                )
+                SeatHold.objects.filter(user=user, token=token).delete()
+                # Last, so the flight row stays locked only until commit.
+                Flight.add_tickets_sold(
+                    Counter(
+                        ticket_data["flight"].pk
+                        for ticket_data in tickets_data
+                    )
+                )
+        except Exception as error:
+            # Holds taken above are already committed; give them back.
+            for flight, seats in assigned:
+                SeatHold.objects.release(flight, user, token, seats)
+            if not isinstance(error, IntegrityError):
+                raise
+            metrics.TICKET_CONFLICTS.labels("sold").inc()
+            raise serializers.ValidationError(
+                {"tickets": [Ticket.unique_error()]}
+            )
+        metrics.ORDERS_CREATED.inc()
+        metrics.TICKETS_BOOKED.inc(len(tickets_data))
         return order
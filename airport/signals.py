@@ -0,0 +1,99 @@
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from airport import tasks
+from airport.images import process_airplane_image
+from airport.instrumentation import record_query
+from airport.models import Airplane, Flight, FlightCrew, Ticket
+from airport.reference_cache import DEPENDENCIES, reference_cache
+
+
+@receiver(pre_save, sender=Ticket)
+def remember_ticket_flight(sender, instance, **kwargs):
+    instance._previous_flight_id = None
+    if instance.pk and not instance._state.adding:
+        instance._previous_flight_id = (
+            Ticket.objects.filter(pk=instance.pk)
+            .values_list("flight_id", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Ticket)
+def count_saved_ticket(sender, instance, created, **kwargs):
+    previous_flight_id = getattr(instance, "_previous_flight_id", None)
+    if created:
+        Flight.add_tickets_sold({instance.flight_id: 1})
+    elif previous_flight_id and previous_flight_id != instance.flight_id:
+        Flight.add_tickets_sold(
+            {previous_flight_id: -1, instance.flight_id: 1}
+        )
+
+
+@receiver(post_delete, sender=Ticket)
+def count_deleted_ticket(sender, instance, **kwargs):
+    Flight.add_tickets_sold({instance.flight_id: -1})
+
+
+@receiver(post_save, sender=Airplane)
+def queue_airplane_image(sender, instance, **kwargs):
+    if instance.image and not instance.image_processed:
+        tasks.enqueue(
+            process_airplane_image, instance.pk, instance.image.name
+        )
+
+
+@receiver(m2m_changed, sender=FlightCrew)
+def copy_crew_flight_times(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    # add() and set() create assignments without the flight's times.
+    if action != "post_add":
+        return
+    if reverse:
+        assignments = FlightCrew.objects.filter(
+            crew=instance, flight_id__in=pk_set
+        )
+    else:
+        assignments = FlightCrew.objects.filter(
+            flight=instance, crew_id__in=pk_set
+        )
+    FlightCrew.copy_flight_times(assignments)
+
+
+# Versions change only once the write is visible: a bump inside the
+# transaction would let a concurrent read cache the old rows under the
+# new version.
+def bump_reference_version(sender, **kwargs):
+    transaction.on_commit(lambda: reference_cache.bump(sender))
+
+
+def bump_reference_m2m_version(model):
+    def bump(sender, action, **kwargs):
+        if action.startswith("post_"):
+            transaction.on_commit(lambda: reference_cache.bump(model))
+    return bump
+
+
+for reference_model in DEPENDENCIES:
+    post_save.connect(bump_reference_version, sender=reference_model)
+    post_delete.connect(bump_reference_version, sender=reference_model)
+    for m2m_field in reference_model._meta.many_to_many:
+        m2m_changed.connect(
+            bump_reference_m2m_version(reference_model),
+            sender=m2m_field.remote_field.through,
+            weak=False,
+        )
+
+
+@receiver(connection_created)
+def install_query_recorder(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
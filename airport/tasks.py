@@ -0,0 +1,153 @@
+import contextlib
+import datetime
+import functools
+import logging
+import random
+import threading
+import time
+import traceback
+
+from django.conf import settings
+from django.db import (
+    DatabaseError,
+    close_old_connections,
+    connections,
+    transaction,
+)
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from airport import metrics
+from airport.models import Job
+
+logger = logging.getLogger("airport.tasks")
+
+
+def enqueue(func, *args, priority=0, max_attempts=5):
+    """
+    Queue ``func(*args)`` for the ``run_workers`` command.
+
+    ``func`` must be a module-level function and ``args`` JSON values.
+    The job is written in the current transaction, so it is only picked
+    up if that commits. Higher priorities run first. With TASKS_EAGER the
+    call runs inline after commit instead, which is what tests use.
+    """
+    if settings.TASKS_EAGER:
+        transaction.on_commit(functools.partial(func, *args))
+        return None
+    return Job.objects.create(
+        task=f"{func.__module__}.{func.__qualname__}",
+        args=list(args),
+        priority=priority,
+        max_attempts=max_attempts,
+    )
+
+
+def retry_delay(attempts):
+    """Exponential backoff with jitter after ``attempts`` failed runs."""
+    delay = min(
+        settings.JOB_RETRY_DELAY * 2 ** (attempts - 1),
+        settings.JOB_MAX_RETRY_DELAY,
+    )
+    return datetime.timedelta(seconds=random.uniform(delay / 2, delay))
+
+
+@contextlib.contextmanager
+def heartbeat(job):
+    """
+    Refresh ``job.heartbeat_at`` from a background thread while the
+    block runs, so ``requeue_stale`` can tell a long job from a dead
+    worker.
+    """
+    stop = threading.Event()
+
+    def beat():
+        try:
+            while not stop.wait(settings.JOB_HEARTBEAT_INTERVAL):
+                try:
+                    Job.objects.filter(
+                        pk=job.pk,
+                        status=Job.Status.RUNNING,
+                        attempts=job.attempts,
+                    ).update(heartbeat_at=timezone.now())
+                except DatabaseError:
+                    logger.exception("Heartbeat for job %s failed", job.pk)
+        finally:
+            connections.close_all()
+
+    thread = threading.Thread(target=beat, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def run_job(job):
+    """Run a claimed job and record its outcome on the row."""
+    metrics.JOB_QUEUE_DELAY.labels(job.task).observe(
+        max(0.0, (job.started_at - job.run_at).total_seconds())
+    )
+    start = time.perf_counter()
+    try:
+        with heartbeat(job):
+            import_string(job.task)(*job.args)
+    except Exception:
+        logger.exception("Job %s (%s) failed", job.pk, job.task)
+        job.last_error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            job.status = Job.Status.QUEUED
+            job.run_at = timezone.now() + retry_delay(job.attempts)
+        else:
+            job.status = Job.Status.FAILED
+    else:
+        job.status = Job.Status.DONE
+    duration = time.perf_counter() - start
+    job.finished_at = timezone.now()
+    # Only record the outcome if this run still owns the row; a job
+    # recovered by requeue_stale belongs to its next run.
+    owned = Job.objects.filter(
+        pk=job.pk, status=Job.Status.RUNNING, attempts=job.attempts
+    ).update(
+        status=job.status,
+        run_at=job.run_at,
+        finished_at=job.finished_at,
+        last_error=job.last_error,
+    )
+    if not owned:
+        logger.warning(
+            "Job %s (%s) was recovered from this worker; outcome %s "
+            "discarded",
+            job.pk,
+            job.task,
+            job.status,
+        )
+    metrics.JOB_DURATION.labels(job.task, job.status).observe(duration)
+    return job
+
+
+def run_pending():
+    """Run due jobs until none are left; return how many ran."""
+    count = 0
+    while (job := Job.objects.claim()) is not None:
+        run_job(job)
+        count += 1
+    return count
+
+
+def work(stop, poll_interval):
+    """Worker loop: run jobs until the ``stop`` event is set."""
+    while not stop.is_set():
+        close_old_connections()
+        try:
+            job = Job.objects.claim()
+            if job is None:
+                Job.objects.requeue_stale(settings.JOB_STALE_AFTER)
+        except DatabaseError:
+            logger.exception("Could not claim a job")
+            job = None
+        if job is not None:
+            run_job(job)
+        else:
+            stop.wait(poll_interval)
@@ -0,0 +1,99 @@
+import io
+import os
+import shutil
+import tempfile
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework.test import APIClient
+from airport.images import FORMATS, VARIANTS
+from airport.models import Airplane, AirplaneType
+
+
+def image_file(color="navy", image_format="PNG", name="plane.png"):
+    buffer = io.BytesIO()
+    Image.new("RGB", (2000, 1000), color).save(buffer, image_format)
+    return SimpleUploadedFile(name, buffer.getvalue())
+
+
+@override_settings(TASKS_EAGER=True)
+class AirplaneImageTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_superuser(
+                email="admin@example.com",
+                password="adminpass"
+            )
+        )
+        self.airplane = Airplane.objects.create(
+            name="Boeing",
+            rows=20,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Passenger")
+        )
+        self.upload_url = reverse(
+            "airport:airplane-upload-image", args=[self.airplane.id]
+        )
+
+    def upload(self, upload):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                self.upload_url, {"image": upload}, format="multipart"
+            )
+
+    def test_upload_creates_variants(self):
+        response = self.upload(image_file())
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(
+            reverse("airport:airplane-detail", args=[self.airplane.id])
+        )
+        images = response.data["images"]
+        self.assertEqual(set(images), set(VARIANTS))
+        self.airplane.refresh_from_db()
+        variants = self.airplane.image_variants["variants"]
+        for variant, size in VARIANTS.items():
+            self.assertEqual(set(images[variant]), {"webp", "jpg"})
+            for extension, name in variants[variant].items():
+                self.assertTrue(images[variant][extension].endswith(name))
+                with default_storage.open(name) as stored:
+                    with Image.open(stored) as image:
+                        self.assertEqual(image.size, (size, size // 2))
+
+    def test_replacing_image_removes_old_variants(self):
+        self.upload(image_file())
+        self.airplane.refresh_from_db()
+        old = self.airplane.image_variants["variants"]["thumb"]["jpg"]
+        self.upload(image_file("white", "JPEG", "plane.jpg"))
+        self.airplane.refresh_from_db()
+        new = self.airplane.image_variants["variants"]["thumb"]["jpg"]
+        self.assertNotEqual(new, old)
+        self.assertTrue(default_storage.exists(new))
+        self.assertFalse(default_storage.exists(old))
+
+    def test_rejects_files_that_are_not_images(self):
+        response = self.upload(
+            SimpleUploadedFile("plane.png", b"not an image")
+        )
+        self.assertEqual(response.status_code, 400)
+        self.airplane.refresh_from_db()
+        self.assertFalse(self.airplane.image)
+        self.assertFalse(os.listdir(default_storage.location))
+
+    def test_schema_lists_variants(self):
+        response = self.client.get(reverse("schema"), {"format": "json"})
+        images = response.json()["components"]["schemas"]["Airplane"][
+            "properties"
+        ]["images"]
+        self.assertEqual(set(images["properties"]), set(VARIANTS))
+        for variant in images["properties"].values():
+            self.assertEqual(set(variant["properties"]), set(FORMATS))
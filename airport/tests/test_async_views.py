@@ -0,0 +1,139 @@
+import datetime
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import include, path, reverse
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from airport.async_views import async_urlpatterns
+from airport.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    Crew,
+    Flight,
+    Order,
+    Route,
+    Ticket,
+)
+from airport.urls import router
+
+urlpatterns = [
+    path(
+        "api/airport/",
+        include(
+            (async_urlpatterns(router) + router.urls, "airport"),
+            namespace="airport",
+        ),
+    ),
+]
+
+
+@override_settings(ROOT_URLCONF=__name__, INSTRUMENTATION_HEADERS=True)
+class AsyncReadViewTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = get_user_model().objects.create_superuser(
+            email="admin@example.com",
+            password="adminpass"
+        )
+        self.user = get_user_model().objects.create_user(
+            email="passenger@example.com",
+            password="testpass123"
+        )
+        airport1 = Airport.objects.create(name="Airport 1", closest_big_city="CityA")
+        airport2 = Airport.objects.create(name="Airport 2", closest_big_city="CityB")
+        self.route = Route.objects.create(
+            source=airport1, destination=airport2, distance=500
+        )
+        airplane = Airplane.objects.create(
+            name="Boeing",
+            rows=20,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Passenger")
+        )
+        departure = timezone.now() + datetime.timedelta(days=7)
+        self.flights = [
+            Flight.objects.create(
+                route=self.route,
+                airplane=airplane,
+                departure_time=departure + datetime.timedelta(hours=index),
+                arrival_time=departure + datetime.timedelta(hours=index + 3)
+            )
+            for index in range(12)
+        ]
+        self.flights[0].crew.add(
+            Crew.objects.create(first_name="Ann", last_name="Lee")
+        )
+        for index in range(3):
+            order = Order.objects.create(user=self.user)
+            Ticket.objects.create(
+                row=1, seat=index + 1, flight=self.flights[0], order=order
+            )
+
+    def headers(self, user):
+        return {"Authorization": f"Bearer {AccessToken.for_user(user)}"}
+
+    async def compare(self, user, url, params=None):
+        sync_client = APIClient()
+        sync_client.force_authenticate(user)
+        expected = await sync_to_async(sync_client.get)(url, params)
+        response = await self.async_client.get(
+            url, params or {}, headers=self.headers(user)
+        )
+        self.assertEqual(response.status_code, expected.status_code)
+        self.assertEqual(response.json(), expected.json())
+        return response
+
+    async def test_flight_list(self):
+        url = reverse("airport:flight-list")
+        response = await self.compare(self.admin, url)
+        self.assertEqual(len(response.json()["results"]), 10)
+        await self.compare(self.admin, url, {"route": self.route.id, "page_size": 5})
+        await self.compare(
+            self.admin, response.json()["next"].replace("http://testserver", "")
+        )
+
+    async def test_flight_detail(self):
+        response = await self.compare(
+            self.admin, reverse("airport:flight-detail", args=[self.flights[0].id])
+        )
+        self.assertEqual(len(response.json()["crew"]), 1)
+        await self.compare(self.admin, reverse("airport:flight-detail", args=[999]))
+
+    async def test_available_seats(self):
+        response = await self.compare(
+            self.user,
+            reverse("airport:flight-available-seats", args=[self.flights[0].id])
+        )
+        self.assertEqual(response.json(), {"available_seats": 117})
+
+    async def test_order_list(self):
+        response = await self.compare(self.user, reverse("airport:order-list"))
+        self.assertEqual(len(response.json()["results"]), 3)
+
+    async def test_permissions(self):
+        url = reverse("airport:flight-list")
+        response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, 403)
+        response = await self.async_client.get(url, headers=self.headers(self.user))
+        self.assertEqual(response.status_code, 403)
+
+    async def test_instrumented_as_sync_endpoint(self):
+        response = await self.async_client.get(
+            reverse("airport:order-list"), headers=self.headers(self.user)
+        )
+        self.assertIn("X-Query-Count", response.headers)
+        self.assertGreater(int(response.headers["X-Query-Count"]), 0)
+
+    async def test_writes_use_sync_view(self):
+        response = await self.async_client.post(
+            reverse("airport:order-list"),
+            {"tickets": [{"flight": self.flights[1].id, "row": 2, "seat": 2}]},
+            content_type="application/json",
+            headers=self.headers(self.user),
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(await Order.objects.filter(user=self.user).acount(), 4)
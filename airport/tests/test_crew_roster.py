@@ -0,0 +1,192 @@
+import datetime
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from airport.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    Crew,
+    Flight,
+    FlightCrew,
+    Route,
+)
+
+FLIGHTS_URL = reverse("airport:flight-list")
+
+
+def roster_url(crew_id):
+    return reverse("airport:crew-roster", args=[crew_id])
+
+
+class CrewOverlapTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_superuser(
+                email="admin@example.com",
+                password="adminpass"
+            )
+        )
+        self.route = Route.objects.create(
+            source=Airport.objects.create(name="Airport 1", closest_big_city="CityA"),
+            destination=Airport.objects.create(name="Airport 2", closest_big_city="CityB"),
+            distance=500,
+        )
+        self.airplane = Airplane.objects.create(
+            name="Boeing",
+            rows=20,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Passenger")
+        )
+        self.pilot = Crew.objects.create(first_name="Amelia", last_name="Earhart")
+        self.copilot = Crew.objects.create(first_name="Charles", last_name="Lindbergh")
+        self.start = timezone.now().replace(microsecond=0) + datetime.timedelta(days=7)
+
+    def at(self, hours):
+        return self.start + datetime.timedelta(hours=hours)
+
+    def payload(self, departure, arrival, crew):
+        return {
+            "route": self.route.id,
+            "airplane": self.airplane.id,
+            "departure_time": self.at(departure).isoformat(),
+            "arrival_time": self.at(arrival).isoformat(),
+            "crew": [member.id for member in crew],
+        }
+
+    def create_flight(self, departure, arrival, crew):
+        response = self.client.post(
+            FLIGHTS_URL, self.payload(departure, arrival, crew), format="json"
+        )
+        self.assertEqual(response.status_code, 201, response.data)
+        return Flight.objects.get(departure_time=self.at(departure))
+
+    def test_overlapping_assignment_rejected(self):
+        flight = self.create_flight(0, 3, [self.pilot])
+        response = self.client.post(
+            FLIGHTS_URL, self.payload(2, 5, [self.copilot, self.pilot]), format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(response.data["crew"]), 1)
+        self.assertIn(f"Amelia Earhart is already on flight {flight.id}", response.data["crew"][0])
+        self.assertEqual(Flight.objects.count(), 1)
+
+    def test_back_to_back_flights_allowed(self):
+        self.create_flight(0, 3, [self.pilot, self.copilot])
+        self.create_flight(3, 6, [self.pilot, self.copilot])
+        self.create_flight(-3, 0, [self.pilot])
+        self.assertEqual(FlightCrew.objects.filter(crew=self.pilot).count(), 3)
+
+    def test_long_flight_found_across_window(self):
+        self.create_flight(0, 20, [self.pilot])
+        response = self.client.post(
+            FLIGHTS_URL, self.payload(18, 19, [self.pilot]), format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_flight_longer_than_maximum_rejected(self):
+        response = self.client.post(
+            FLIGHTS_URL, self.payload(0, 25, [self.pilot]), format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("arrival_time", response.data)
+
+    def test_update_checks_other_flights_only(self):
+        first = self.create_flight(0, 3, [self.pilot])
+        second = self.create_flight(4, 6, [self.pilot])
+        url = reverse("airport:flight-detail", args=[second.id])
+
+        response = self.client.patch(
+            url, {"departure_time": self.at(5).isoformat()}, format="json"
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(
+            FlightCrew.objects.get(flight=second).departure_time, self.at(5)
+        )
+
+        response = self.client.patch(
+            url, {"departure_time": self.at(2).isoformat()}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(f"flight {first.id}", response.data["crew"][0])
+
+    def test_assignments_added_directly_get_flight_times(self):
+        flight = self.create_flight(0, 3, [])
+        flight.crew.add(self.pilot)
+        self.copilot.flight_set.add(flight)
+        self.assertEqual(
+            set(
+                FlightCrew.objects.values_list(
+                    "departure_time", "arrival_time"
+                )
+            ),
+            {(self.at(0), self.at(3))},
+        )
+
+    def test_import_rejects_overlaps(self):
+        self.create_flight(0, 3, [self.pilot])
+        rows = [
+            self.payload(1, 2, [self.pilot]),
+            self.payload(10, 14, [self.copilot]),
+            self.payload(12, 13, [self.copilot]),
+        ]
+        response = self.client.post(
+            reverse("airport:flight-import-schedule"),
+            {"flights": rows},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        errors = response.data["flights"]
+        self.assertIn("Amelia Earhart is already on flight", errors[0]["crew"][0])
+        self.assertEqual(errors[1], {})
+        self.assertIn("also on flight 2 of this import", errors[2]["crew"][0])
+        self.assertEqual(Flight.objects.count(), 1)
+
+    def test_roster(self):
+        before = self.create_flight(-5, -4, [self.pilot])
+        spanning = self.create_flight(-1, 2, [self.pilot])
+        inside = self.create_flight(5, 8, [self.pilot, self.copilot])
+        self.create_flight(10, 12, [self.pilot])
+        self.create_flight(3, 4, [self.copilot])
+
+        response = self.client.get(
+            roster_url(self.pilot.id),
+            {"start": self.at(0).isoformat(), "end": self.at(10).isoformat()},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [flight["id"] for flight in response.data], [spanning.id, inside.id]
+        )
+        self.assertNotIn(before.id, [flight["id"] for flight in response.data])
+
+    def test_roster_query_count_does_not_grow(self):
+        params = {"start": self.at(-1).isoformat(), "end": self.at(100).isoformat()}
+        self.create_flight(0, 1, [self.pilot])
+        with CaptureQueriesContext(connection) as one:
+            self.client.get(roster_url(self.pilot.id), params)
+        for hour in range(2, 40, 2):
+            Flight.objects.create(
+                route=self.route,
+                airplane=self.airplane,
+                departure_time=self.at(hour),
+                arrival_time=self.at(hour + 1),
+            ).crew.add(self.pilot)
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(roster_url(self.pilot.id), params)
+        self.assertEqual(len(response.data), 20)
+        self.assertEqual(len(one), len(many))
+
+    def test_roster_window_validated(self):
+        response = self.client.get(
+            roster_url(self.pilot.id),
+            {"start": self.at(5).isoformat(), "end": self.at(0).isoformat()},
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("end", response.data)
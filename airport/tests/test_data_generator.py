@@ -0,0 +1,156 @@
+import datetime
+import io
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db.models import Count
+from django.test import TestCase
+from airport.data_generator import DataGenerator, RowStream
+from airport.models import (
+    Airplane, AirplaneType, Airport, Crew, Flight, FlightCrew, Order, Route,
+    Ticket,
+)
+
+
+class DataGeneratorTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.start_date = datetime.date(2030, 1, 1)
+
+    def generate(self, seed=7):
+        return DataGenerator(
+            seed=seed,
+            airports=10,
+            routes_per_airport=3,
+            airplanes=5,
+            crew=30,
+            users=20,
+            tickets=2_000,
+            start_date=self.start_date,
+            days=10,
+        ).generate()
+
+    def snapshot(self):
+        return (
+            list(Route.objects.order_by("pk").values_list()),
+            list(Flight.objects.order_by("pk").values_list()),
+            list(Flight.crew.through.objects.order_by("pk").values_list()),
+            list(Order.objects.order_by("pk").values_list()),
+            list(Ticket.objects.order_by("pk").values_list()),
+        )
+
+    def test_generates_requested_tickets(self):
+        counts = self.generate()
+        self.assertEqual(Ticket.objects.count(), 2_000)
+        self.assertEqual(counts["ticket"], 2_000)
+        self.assertEqual(Airport.objects.count(), 10)
+        self.assertEqual(Route.objects.count(), 30)
+        self.assertEqual(Crew.objects.count(), 30)
+        self.assertEqual(get_user_model().objects.count(), 20)
+        self.assertEqual(
+            [airplane.image_variants for airplane in Airplane.objects.all()],
+            [{}] * 5,
+        )
+
+    def test_small_load_factor_still_books_every_ticket(self):
+        counts = DataGenerator(
+            seed=7,
+            airports=10,
+            routes_per_airport=3,
+            airplanes=5,
+            crew=30,
+            users=20,
+            tickets=50,
+            start_date=self.start_date,
+            days=10,
+            load_factor=0.001,
+        ).generate()
+        self.assertEqual(counts["ticket"], 50)
+        self.assertEqual(Ticket.objects.count(), 50)
+
+    def test_copy_rows_serialize_json_values(self):
+        self.assertEqual(
+            RowStream([(1, None, {"thumb": "a\tb"})]).read(),
+            '1\t\\N\t{"thumb": "a\\\\tb"}\n',
+        )
+
+    def test_flight_counters_and_seats_are_consistent(self):
+        self.generate()
+        sold = dict(
+            Ticket.objects.order_by()
+            .values_list("flight_id")
+            .annotate(count=Count("pk"))
+        )
+        for flight in Flight.objects.select_related("airplane"):
+            self.assertEqual(flight.capacity, flight.airplane.capacity)
+            self.assertEqual(flight.tickets_sold, sold.get(flight.pk, 0))
+            self.assertTrue(flight.crew.exists())
+        for ticket in Ticket.objects.select_related(
+            "flight__airplane", "order"
+        )[:200]:
+            airplane = ticket.flight.airplane
+            self.assertTrue(1 <= ticket.row <= airplane.rows)
+            self.assertTrue(1 <= ticket.seat <= airplane.seats_in_row)
+            self.assertLess(
+                ticket.order.created_at, ticket.flight.departure_time
+            )
+
+    def test_crew_assignments_do_not_overlap(self):
+        self.generate()
+        previous = {}
+        for crew_id, departure, arrival in FlightCrew.objects.order_by(
+            "crew_id", "departure_time"
+        ).values_list("crew_id", "departure_time", "arrival_time"):
+            if crew_id in previous:
+                self.assertLessEqual(previous[crew_id], departure)
+            previous[crew_id] = arrival
+        self.assertTrue(previous)
+
+    def test_same_seed_produces_same_rows(self):
+        self.generate()
+        first = self.snapshot()
+        for model in (
+            Ticket, Order, Flight, Route, Airport, Crew, Airplane, AirplaneType
+        ):
+            model.objects.all().delete()
+        get_user_model().objects.all().delete()
+        self.generate()
+        self.assertEqual(self.snapshot(), first)
+
+    def test_appends_after_existing_rows(self):
+        self.generate()
+        self.generate(seed=8)
+        self.assertEqual(Ticket.objects.count(), 4_000)
+        flight = Flight.objects.create(
+            route=Route.objects.first(),
+            airplane=Flight.objects.first().airplane,
+            departure_time=datetime.datetime(
+                2030, 2, 1, tzinfo=datetime.timezone.utc
+            ),
+            arrival_time=datetime.datetime(
+                2030, 2, 1, 2, tzinfo=datetime.timezone.utc
+            ),
+        )
+        self.assertGreater(flight.pk, Flight.objects.count() - 1)
+
+    def test_command(self):
+        call_command(
+            "generate_data",
+            tickets=500,
+            airports=5,
+            routes_per_airport=2,
+            airplanes=3,
+            crew=10,
+            start_date=self.start_date,
+            stdout=io.StringIO(),
+        )
+        self.assertEqual(Ticket.objects.count(), 500)
+
+    def test_command_rejects_counts_below_minimum(self):
+        for option, value in (("airplanes", 0), ("crew", 0), ("days", 0)):
+            with self.subTest(option):
+                with self.assertRaisesMessage(CommandError, f"--{option} must"):
+                    call_command(
+                        "generate_data", **{option: value}, stdout=io.StringIO()
+                    )
+        self.assertFalse(Airport.objects.exists())
@@ -0,0 +1,199 @@
+import datetime
+from unittest import skipUnless
+from django.conf import settings
+from unittest import mock
+from django.core.cache import cache
+from django.core.checks import run_checks
+from django.db import connections
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.test import override_settings
+from airport.checks import check_replica_pins_are_shared
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIClient
+from airport.db_router import (
+    ReplicaRouter,
+    pinned_to_primary,
+    primary_reads,
+    replica_reads,
+)
+from airport.models import Airplane, AirplaneType, Airport, Flight, Route
+
+
+class ReplicaRouterTestCase(SimpleTestCase):
+    @override_settings(DATABASE_REPLICAS=["replica_0", "replica_1"])
+    def test_reads_use_replica_only_when_enabled(self):
+        router = ReplicaRouter()
+        self.assertIsNone(router.db_for_read(Flight))
+        with replica_reads() as reads:
+            self.assertIsNone(router.db_for_read(Flight))
+            reads.enable()
+            database = router.db_for_read(Flight)
+            self.assertIn(database, ["replica_0", "replica_1"])
+            self.assertEqual(router.db_for_read(Route), database)
+            self.assertEqual(router.db_for_write(Flight), "default")
+        self.assertIsNone(router.db_for_read(Flight))
+
+    @override_settings(DATABASE_REPLICAS=["replica_0"])
+    def test_primary_reads_override_replica(self):
+        router = ReplicaRouter()
+        with replica_reads() as reads:
+            reads.enable()
+            with primary_reads():
+                self.assertIsNone(router.db_for_read(Route))
+            self.assertEqual(router.db_for_read(Route), "replica_0")
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas_reads_stay_on_primary(self):
+        with replica_reads() as reads:
+            reads.enable()
+            self.assertIsNone(ReplicaRouter().db_for_read(Flight))
+
+    @override_settings(DATABASE_REPLICAS=["replica_0"])
+    def test_migrations_skip_replicas(self):
+        router = ReplicaRouter()
+        self.assertTrue(router.allow_migrate("default", "airport"))
+        self.assertFalse(router.allow_migrate("replica_0", "airport"))
+
+
+def create_flight():
+    route = Route.objects.create(
+        source=Airport.objects.create(name="Airport 1", closest_big_city="CityA"),
+        destination=Airport.objects.create(name="Airport 2", closest_big_city="CityB"),
+        distance=500,
+    )
+    departure = timezone.now() + datetime.timedelta(days=7)
+    return Flight.objects.create(
+        route=route,
+        airplane=Airplane.objects.create(
+            name="Boeing",
+            rows=20,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Passenger")
+        ),
+        departure_time=departure,
+        arrival_time=departure + datetime.timedelta(hours=3),
+    )
+
+
+# "default" stands in for the replica so the requests can run against the
+# single test database.
+@override_settings(DATABASE_REPLICAS=["default"])
+class StickinessTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="passenger@example.com",
+            password="testpass123"
+        )
+        self.client.force_authenticate(self.user)
+        self.flight = create_flight()
+
+    def test_booking_pins_user_to_primary(self):
+        self.assertFalse(pinned_to_primary(self.user))
+        response = self.client.post(
+            reverse("airport:order-list"),
+            {"tickets": [{"flight": self.flight.id, "row": 1, "seat": 1}]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(pinned_to_primary(self.user))
+
+    def test_reads_and_failed_writes_do_not_pin(self):
+        self.client.get(reverse("airport:order-my-tickets"))
+        response = self.client.post(
+            reverse("airport:order-list"),
+            {"tickets": [{"flight": self.flight.id, "row": 99, "seat": 1}]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(pinned_to_primary(self.user))
+
+
+class ReplicaCheckTestCase(SimpleTestCase):
+    locmem = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache"
+        }
+    }
+
+    @override_settings(DATABASE_REPLICAS=["replica_0"], CACHES=locmem)
+    def test_replicas_need_a_shared_cache(self):
+        errors = check_replica_pins_are_shared(None)
+        self.assertEqual([error.id for error in errors], ["airport.E001"])
+
+    @override_settings(DATABASE_REPLICAS=[], CACHES=locmem)
+    def test_local_cache_is_fine_without_replicas(self):
+        self.assertEqual(check_replica_pins_are_shared(None), [])
+
+    def test_check_is_registered(self):
+        with override_settings(
+            DATABASE_REPLICAS=["replica_0"], CACHES=self.locmem
+        ):
+            errors = run_checks()
+        self.assertIn("airport.E001", [error.id for error in errors])
+
+
+@override_settings(DATABASE_REPLICAS=[])
+class WithoutReplicasTestCase(TestCase):
+    def test_safe_requests_skip_the_pin_lookup(self):
+        user = get_user_model().objects.create_user(
+            email="passenger@example.com",
+            password="testpass123"
+        )
+        client = APIClient()
+        client.force_authenticate(user)
+        with mock.patch("airport.db_router.cache") as pin_cache:
+            response = client.get(reverse("airport:order-my-tickets"))
+        self.assertEqual(response.status_code, 200)
+        pin_cache.get.assert_not_called()
+
+
+@skipUnless(
+    settings.DATABASE_REPLICAS,
+    "Set POSTGRES_REPLICA_HOSTS to test against a replica.",
+)
+class ReplicaRoutingTestCase(TransactionTestCase):
+    databases = "__all__"
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="passenger@example.com",
+            password="testpass123"
+        )
+        self.client.force_authenticate(self.user)
+        self.flight = create_flight()
+        self.replica = connections[settings.DATABASE_REPLICAS[0]]
+
+    def test_reads_go_to_replica_until_user_books(self):
+        with CaptureQueriesContext(self.replica) as replica_queries:
+            response = self.client.get(reverse("airport:order-my-tickets"))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(replica_queries)
+
+        with CaptureQueriesContext(self.replica) as replica_queries:
+            response = self.client.post(
+                reverse("airport:order-list"),
+                {"tickets": [{"flight": self.flight.id, "row": 1, "seat": 1}]},
+                format="json",
+            )
+            self.assertEqual(response.status_code, 201)
+            response = self.client.get(reverse("airport:order-my-tickets"))
+        self.assertFalse(replica_queries)
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_reference_cache_is_filled_from_primary(self):
+        admin = get_user_model().objects.create_superuser(
+            email="admin@example.com",
+            password="adminpass"
+        )
+        self.client.force_authenticate(admin)
+        with CaptureQueriesContext(self.replica) as replica_queries:
+            response = self.client.get(reverse("airport:route-list"))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(replica_queries)
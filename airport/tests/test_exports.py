@@ -0,0 +1,137 @@
+import csv
+import datetime
+import io
+import json
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from airport.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    Flight,
+    Order,
+    Route,
+    Ticket,
+)
+
+
+class ExportTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_superuser(
+            email="admin@example.com",
+            password="adminpass"
+        )
+        self.user = get_user_model().objects.create_user(
+            email="passenger@example.com",
+            password="testpass123"
+        )
+        self.client.force_authenticate(self.admin)
+        airport1 = Airport.objects.create(name="Airport 1", closest_big_city="CityA")
+        airport2 = Airport.objects.create(name="Airport 2", closest_big_city="CityB")
+        route = Route.objects.create(
+            source=airport1, destination=airport2, distance=500
+        )
+        airplane = Airplane.objects.create(
+            name="Boeing",
+            rows=20,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Passenger")
+        )
+        self.departure = timezone.now() + datetime.timedelta(days=7)
+        self.flights = [
+            Flight.objects.create(
+                route=route,
+                airplane=airplane,
+                departure_time=self.departure + datetime.timedelta(days=index),
+                arrival_time=self.departure + datetime.timedelta(days=index, hours=4)
+            )
+            for index in range(2)
+        ]
+        self.order = Order.objects.create(user=self.user)
+        for flight in self.flights:
+            for seat in range(1, 4):
+                Ticket.objects.create(row=2, seat=seat, flight=flight, order=self.order)
+
+    def export(self, name, **params):
+        response = self.client.get(reverse(f"airport:{name}-export"), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode()
+
+    def test_ticket_manifest_ndjson(self):
+        lines = self.export("ticket", flight=self.flights[0].id).splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual([row["seat"] for row in rows], [1, 2, 3])
+        self.assertEqual(rows[0]["passenger"], "passenger@example.com")
+        self.assertEqual(rows[0]["flight"], self.flights[0].id)
+
+    def test_ticket_manifest_csv_by_date_range(self):
+        content = self.export(
+            "ticket",
+            export_format="csv",
+            departure_from=(self.departure + datetime.timedelta(hours=12)).isoformat(),
+        )
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual({row["flight"] for row in rows}, {str(self.flights[1].id)})
+
+    def test_rows_are_fetched_while_streaming(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("airport:ticket-export"))
+        self.assertFalse(
+            any('FROM "ticket"' in query["sql"] for query in queries)
+        )
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertIn('filename="tickets.ndjson"', response["Content-Disposition"])
+        self.assertEqual(len(b"".join(response.streaming_content).splitlines()), 6)
+
+    async def test_streams_asynchronously_under_asgi(self):
+        response = await self.async_client.get(
+            reverse("airport:ticket-export"),
+            headers={"Authorization": f"Bearer {AccessToken.for_user(self.admin)}"},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        content = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(len(content.splitlines()), 6)
+
+    def test_flight_export(self):
+        rows = [
+            json.loads(line)
+            for line in self.export("flight", route=self.flights[0].route_id).splitlines()
+        ]
+        self.assertEqual([row["id"] for row in rows], [flight.id for flight in self.flights])
+        self.assertEqual(rows[0]["tickets_sold"], 3)
+        self.assertEqual(rows[0]["source"], "Airport 1")
+
+    def test_order_export(self):
+        rows = list(csv.DictReader(io.StringIO(self.export("order", export_format="csv"))))
+        self.assertEqual(rows, [
+            {
+                "id": str(self.order.id),
+                "created_at": self.order.created_at.isoformat(),
+                "user": "passenger@example.com",
+                "tickets": "6",
+            }
+        ])
+
+    def test_export_requires_admin(self):
+        self.client.force_authenticate(self.user)
+        for name in ("ticket", "order", "flight"):
+            response = self.client.get(reverse(f"airport:{name}-export"))
+            self.assertEqual(response.status_code, 403)
+
+    def test_invalid_format(self):
+        response = self.client.get(
+            reverse("airport:ticket-export"), {"export_format": "xml"}
+        )
+        self.assertEqual(response.status_code, 400)
@@ -1,9 +1,19 @@
+from io import StringIO
+from django.core.management import call_command
 from django.test import TestCase, Client
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 import datetime
-from airport.models import Flight, Route, Airplane, Airport, AirplaneType
+from airport.models import (
+    Flight,
+    Route,
+    Airplane,
+    Airport,
+    AirplaneType,
+    Order,
+    Ticket,
+)
 
 
 class FlightTestCase(TestCase):
@@ -56,3 +66,57 @@ class FlightTestCase(TestCase):
         self.client.login(email="admin@example.com", password="adminpass")
         response = self.client.get(reverse("airport:flight-list"))
         self.assertEqual(response.status_code, 200)
+
+
+class FlightCounterTestCase(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="testuser@example.com",
+            password="testpass123"
+        )
+        airport1 = Airport.objects.create(name="Airport 1", closest_big_city="CityA")
+        airport2 = Airport.objects.create(name="Airport 2", closest_big_city="CityB")
+        route = Route.objects.create(
+            source=airport1, destination=airport2, distance=500
+        )
+        self.airplane = Airplane.objects.create(
+            name="Boeing",
+            rows=20,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Passenger")
+        )
+        departure = timezone.now() + datetime.timedelta(days=7)
+        self.flight = Flight.objects.create(
+            route=route,
+            airplane=self.airplane,
+            departure_time=departure,
+            arrival_time=departure + datetime.timedelta(hours=4)
+        )
+        self.order = Order.objects.create(user=self.user)
+
+    def test_counters_follow_tickets_and_orders(self):
+        self.assertEqual(self.flight.capacity, 120)
+        Ticket.objects.create(row=1, seat=1, flight=self.flight, order=self.order)
+        Ticket.objects.create(row=1, seat=2, flight=self.flight, order=self.order)
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.tickets_sold, 2)
+        self.assertEqual(self.flight.tickets_available, 118)
+        self.order.delete()
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.tickets_sold, 0)
+
+    def test_capacity_follows_airplane(self):
+        self.airplane.rows = 10
+        self.airplane.save()
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.capacity, 60)
+
+    def test_reconcile_command_fixes_drift(self):
+        Ticket.objects.create(row=1, seat=1, flight=self.flight, order=self.order)
+        Flight.objects.filter(pk=self.flight.pk).update(
+            tickets_sold=7, capacity=1
+        )
+        call_command("reconcile_flight_counters", stdout=StringIO())
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.tickets_sold, 1)
+        self.assertEqual(self.flight.capacity, 120)
@@ -0,0 +1,239 @@
+import datetime
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from airport.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    Crew,
+    Flight,
+    FlightSchedule,
+    Order,
+    Route,
+    Ticket,
+)
+
+SCHEDULES_URL = reverse("airport:flight_schedule-list")
+
+
+def schedule_url(schedule_id):
+    return reverse("airport:flight_schedule-detail", args=[schedule_id])
+
+
+class FlightScheduleTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_superuser(
+            email="admin@example.com",
+            password="adminpass"
+        )
+        self.client.force_authenticate(self.user)
+        self.route = Route.objects.create(
+            source=Airport.objects.create(name="Airport 1", closest_big_city="CityA"),
+            destination=Airport.objects.create(name="Airport 2", closest_big_city="CityB"),
+            distance=500,
+        )
+        self.airplane = Airplane.objects.create(
+            name="Boeing",
+            rows=20,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Passenger")
+        )
+        self.pilot = Crew.objects.create(first_name="Amelia", last_name="Earhart")
+        self.copilot = Crew.objects.create(first_name="Charles", last_name="Lindbergh")
+        today = timezone.localdate()
+        # The Monday after next, so the whole season lies in the future.
+        self.monday = today + datetime.timedelta(days=14 - today.weekday())
+
+    def payload(self, weeks=4, **kwargs):
+        return {
+            "route": self.route.id,
+            "airplane": self.airplane.id,
+            "crew": [self.pilot.id, self.copilot.id],
+            "weekdays": [1, 3, 5],
+            "departure": "07:40",
+            "duration": "02:30:00",
+            "starts_on": self.monday.isoformat(),
+            "ends_on": (
+                self.monday + datetime.timedelta(weeks=weeks, days=-1)
+            ).isoformat(),
+            **kwargs,
+        }
+
+    def create_schedule(self, **kwargs):
+        response = self.client.post(
+            SCHEDULES_URL, self.payload(**kwargs), format="json"
+        )
+        self.assertEqual(response.status_code, 201, response.data)
+        return response
+
+    def test_create_generates_flights_and_crew(self):
+        response = self.create_schedule()
+        self.assertEqual(response.data["generated"]["created"], 12)
+        flights = Flight.objects.filter(schedule_id=response.data["id"])
+        self.assertEqual(flights.count(), 12)
+        first = flights.order_by("departure_time").first()
+        departure = timezone.localtime(first.departure_time)
+        self.assertEqual(departure.date(), self.monday)
+        self.assertEqual(departure.time(), datetime.time(7, 40))
+        self.assertEqual(
+            first.arrival_time - first.departure_time,
+            datetime.timedelta(hours=2, minutes=30),
+        )
+        self.assertEqual(first.capacity, self.airplane.capacity)
+        self.assertEqual(
+            Flight.crew.through.objects.filter(flight__in=flights).count(), 24
+        )
+
+    def test_query_count_does_not_grow_with_season(self):
+        with CaptureQueriesContext(connection) as short:
+            self.create_schedule(weeks=1)
+        with CaptureQueriesContext(connection) as long:
+            self.create_schedule(weeks=20, departure="12:00")
+        self.assertEqual(len(short), len(long))
+
+    def test_regeneration_only_touches_differences(self):
+        schedule_id = self.create_schedule().data["id"]
+        flights = dict(
+            Flight.objects.filter(schedule_id=schedule_id).values_list(
+                "departure_time", "id"
+            )
+        )
+        wednesday = self.monday + datetime.timedelta(days=2)
+        response = self.client.patch(
+            schedule_url(schedule_id),
+            {"excluded_dates": [wednesday.isoformat()]},
+            format="json",
+        )
+        self.assertEqual(
+            response.data["generated"],
+            {"created": 0, "updated": 0, "deleted": 1, "detached": 0},
+        )
+
+        response = self.client.patch(
+            schedule_url(schedule_id),
+            {"duration": "03:00:00", "crew": [self.pilot.id]},
+            format="json",
+        )
+        self.assertEqual(
+            response.data["generated"],
+            {"created": 0, "updated": 11, "deleted": 0, "detached": 0},
+        )
+        remaining = dict(
+            Flight.objects.filter(schedule_id=schedule_id).values_list(
+                "departure_time", "id"
+            )
+        )
+        self.assertEqual(len(remaining), 11)
+        self.assertTrue(set(remaining.items()) <= set(flights.items()))
+        self.assertEqual(
+            set(
+                Flight.crew.through.objects.filter(
+                    flight_id__in=remaining.values()
+                ).values_list("crew_id", flat=True)
+            ),
+            {self.pilot.id},
+        )
+
+        response = self.client.post(
+            reverse("airport:flight_schedule-generate", args=[schedule_id])
+        )
+        self.assertEqual(
+            response.data,
+            {"created": 0, "updated": 0, "deleted": 0, "detached": 0},
+        )
+
+    def test_flights_with_tickets_are_kept(self):
+        schedule_id = self.create_schedule().data["id"]
+        sold = Flight.objects.filter(schedule_id=schedule_id).earliest(
+            "departure_time"
+        )
+        Ticket.objects.create(
+            row=1,
+            seat=1,
+            flight=sold,
+            order=Order.objects.create(user=self.user),
+        )
+        # The ticket itself decides, even if the counter has drifted.
+        Flight.objects.filter(pk=sold.pk).update(tickets_sold=0)
+
+        response = self.client.delete(schedule_url(schedule_id))
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(list(Flight.objects.values_list("id", flat=True)), [sold.id])
+        self.assertFalse(FlightSchedule.objects.exists())
+
+    def test_crew_already_flying_rejected(self):
+        departure = timezone.make_aware(
+            datetime.datetime.combine(
+                self.monday + datetime.timedelta(days=7), datetime.time(9)
+            )
+        )
+        flight = Flight.objects.create(
+            route=self.route,
+            airplane=self.airplane,
+            departure_time=departure,
+            arrival_time=departure + datetime.timedelta(hours=1),
+        )
+        flight.crew.add(self.copilot)
+        response = self.client.post(SCHEDULES_URL, self.payload(), format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(response.data["crew"]), 1)
+        self.assertIn(f"flight {flight.id}", response.data["crew"][0])
+        self.assertEqual(Flight.objects.count(), 1)
+        self.assertFalse(FlightSchedule.objects.exists())
+
+    def test_generate_action_checks_crew(self):
+        schedule_id = self.create_schedule().data["id"]
+        wednesday = self.monday + datetime.timedelta(days=2)
+        self.client.patch(
+            schedule_url(schedule_id),
+            {"excluded_dates": [wednesday.isoformat()]},
+            format="json",
+        )
+        departure = timezone.make_aware(
+            datetime.datetime.combine(wednesday, datetime.time(8))
+        )
+        flight = Flight.objects.create(
+            route=self.route,
+            airplane=self.airplane,
+            departure_time=departure,
+            arrival_time=departure + datetime.timedelta(hours=1),
+        )
+        flight.crew.add(self.pilot)
+        FlightSchedule.objects.filter(pk=schedule_id).update(
+            excluded_dates=[]
+        )
+        response = self.client.post(
+            reverse("airport:flight_schedule-generate", args=[schedule_id])
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(f"flight {flight.id}", response.data["crew"][0])
+        self.assertEqual(
+            Flight.objects.filter(schedule_id=schedule_id).count(), 11
+        )
+
+    def test_invalid_season_rejected(self):
+        response = self.client.post(
+            SCHEDULES_URL,
+            self.payload(ends_on=self.monday - datetime.timedelta(days=1)),
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("ends_on", response.data)
+
+    def test_schedules_require_admin(self):
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="user@example.com",
+                password="testpass123"
+            )
+        )
+        response = self.client.post(SCHEDULES_URL, self.payload(), format="json")
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,165 @@
+import datetime
+import unittest
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from airport.models import Airplane, AirplaneType, Airport, Flight, Route
+from airport.views import FlightViewSet
+
+
+class FlightSearchTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_superuser(
+                email="admin@example.com",
+                password="adminpass"
+            )
+        )
+        kyiv = Airport.objects.create(name="KBP", closest_big_city="Kyiv")
+        lviv = Airport.objects.create(name="LWO", closest_big_city="Lviv")
+        self.route = Route.objects.create(
+            source=kyiv, destination=lviv, distance=500
+        )
+        self.back = Route.objects.create(
+            source=lviv, destination=kyiv, distance=500
+        )
+        self.airplane = Airplane.objects.create(
+            name="Boeing",
+            rows=20,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Passenger")
+        )
+        self.date = timezone.localdate() + datetime.timedelta(days=10)
+        midnight = timezone.make_aware(
+            datetime.datetime.combine(self.date, datetime.time.min)
+        )
+        self.late = self.flight(self.route, midnight - datetime.timedelta(minutes=30))
+        self.early = self.flight(self.route, midnight + datetime.timedelta(minutes=30))
+        self.return_flight = self.flight(self.back, midnight + datetime.timedelta(hours=8))
+
+    def flight(self, route, departure):
+        return Flight.objects.create(
+            route=route,
+            airplane=self.airplane,
+            departure_time=departure,
+            arrival_time=departure + datetime.timedelta(hours=2)
+        )
+
+    def ids(self, **params):
+        response = self.client.get(reverse("airport:flight-list"), params)
+        self.assertEqual(response.status_code, 200)
+        return [item["id"] for item in response.data["results"]]
+
+    def test_date_uses_local_day(self):
+        self.assertEqual(
+            self.ids(date=self.date.isoformat()),
+            [self.early.id, self.return_flight.id],
+        )
+
+    def test_departure_range(self):
+        self.assertEqual(
+            self.ids(
+                departure_from=self.late.departure_time.isoformat(),
+                departure_to=self.return_flight.departure_time.isoformat(),
+            ),
+            [self.late.id, self.early.id],
+        )
+
+    def test_airport_and_city_filters(self):
+        self.assertEqual(
+            self.ids(source=self.back.source_id), [self.return_flight.id]
+        )
+        self.assertEqual(
+            self.ids(destination_city="Lviv"), [self.late.id, self.early.id]
+        )
+
+    def test_invalid_date_rejected(self):
+        response = self.client.get(
+            reverse("airport:flight-list"), {"date": "10/06/2025"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+@unittest.skipUnless(
+    connection.vendor == "postgresql", "Query plans are PostgreSQL specific"
+)
+class FlightSearchQueryPlanTestCase(TestCase):
+    FLIGHTS = 1_000_000
+
+    def setUp(self):
+        airports = [
+            Airport.objects.create(name=f"A{index}", closest_big_city=f"C{index}")
+            for index in range(20)
+        ]
+        routes = [
+            Route.objects.create(source=source, destination=destination, distance=500)
+            for source in airports
+            for destination in airports
+            if source != destination
+        ]
+        airplane = Airplane.objects.create(
+            name="Boeing",
+            rows=20,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Passenger")
+        )
+        self.route = routes[0]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO flight (
+                    route_id, airplane_id, departure_time, arrival_time,
+                    capacity, tickets_sold
+                )
+                SELECT
+                    (%s::bigint[])[1 + series %% %s],
+                    %s,
+                    now() + series * interval '1 minute',
+                    now() + series * interval '1 minute' + interval '2 hours',
+                    120,
+                    0
+                FROM generate_series(1, %s) AS series
+                """,
+                [
+                    [route.id for route in routes],
+                    len(routes),
+                    airplane.id,
+                    self.FLIGHTS,
+                ],
+            )
+            cursor.execute("ANALYZE flight")
+            cursor.execute("ANALYZE route")
+            cursor.execute("ANALYZE airport")
+
+    def plan(self, **params):
+        view = FlightViewSet()
+        view.action = "list"
+        view.request = Request(
+            APIRequestFactory().get("/", params)
+        )
+        queryset = view.get_queryset().order_by("departure_time", "id")
+        return queryset[:11].explain()
+
+    def test_date_range_uses_index(self):
+        start = timezone.localdate() + datetime.timedelta(days=100)
+        plan = self.plan(date=start.isoformat())
+        self.assertIn("Index", plan)
+        self.assertNotIn("Seq Scan on flight", plan)
+
+    def test_route_and_range_use_index(self):
+        plan = self.plan(
+            route=self.route.id,
+            departure_from=timezone.now().isoformat(),
+            departure_to=(
+                timezone.now() + datetime.timedelta(days=30)
+            ).isoformat(),
+        )
+        self.assertIn("Index", plan)
+        self.assertNotIn("Seq Scan on flight", plan)
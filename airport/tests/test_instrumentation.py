@@ -0,0 +1,167 @@
+import datetime
+import time
+from unittest import mock
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.test import APIClient
+from airport.instrumentation import QueryBudgetExceeded
+from airport.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    Crew,
+    Flight,
+    Order,
+    Route,
+    Ticket,
+)
+from airport.serializers import OrderDetailSerializer
+
+
+@override_settings(INSTRUMENTATION_HEADERS=True, QUERY_BUDGET_STRICT=True)
+class QueryBudgetTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_superuser(
+            email="admin@example.com",
+            password="adminpass"
+        )
+        self.client.force_login(self.user)
+        airport1 = Airport.objects.create(name="Airport 1", closest_big_city="CityA")
+        airport2 = Airport.objects.create(name="Airport 2", closest_big_city="CityB")
+        route = Route.objects.create(
+            source=airport1, destination=airport2, distance=500
+        )
+        airplane = Airplane.objects.create(
+            name="Boeing",
+            rows=20,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Passenger")
+        )
+        departure = timezone.now() + datetime.timedelta(days=7)
+        self.flights = []
+        for index in range(5):
+            flight = Flight.objects.create(
+                route=route,
+                airplane=airplane,
+                departure_time=departure + datetime.timedelta(hours=index),
+                arrival_time=departure + datetime.timedelta(hours=index + 4)
+            )
+            flight.crew.set(
+                Crew.objects.create(first_name=f"Crew {index}", last_name=name)
+                for name in ("A", "B", "C")
+            )
+            self.flights.append(flight)
+        self.order = Order.objects.create(user=self.user)
+        self.tickets = [
+            Ticket.objects.create(
+                row=1, seat=seat, flight=flight, order=self.order
+            )
+            for flight in self.flights
+            for seat in range(1, 4)
+        ]
+
+    def get(self, name, *args):
+        response = self.client.get(reverse(f"airport:{name}", args=args))
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_headers_report_query_count_and_timings(self):
+        response = self.get("flight-list")
+        self.assertIn("X-Query-Count", response)
+        timings = dict(
+            part.split(";dur=")
+            for part in response["Server-Timing"].split(", ")
+        )
+        self.assertEqual(set(timings), {"db", "serializer", "total"})
+        self.assertGreater(float(timings["total"]), 0)
+
+    def test_serializer_time_covers_rendering(self):
+        response = self.get("order-detail", self.order.id)
+        timings = dict(
+            part.split(";dur=")
+            for part in response["Server-Timing"].split(", ")
+        )
+        self.assertGreater(float(timings["serializer"]), 0)
+
+    def test_serializer_time_covers_to_representation(self):
+        to_representation = OrderDetailSerializer.to_representation
+
+        def slow_to_representation(serializer, instance):
+            time.sleep(0.05)
+            return to_representation(serializer, instance)
+
+        with mock.patch.object(
+            OrderDetailSerializer,
+            "to_representation",
+            slow_to_representation,
+        ):
+            response = self.get("order-detail", self.order.id)
+        timings = dict(
+            part.split(";dur=")
+            for part in response["Server-Timing"].split(", ")
+        )
+        self.assertGreaterEqual(float(timings["serializer"]), 50)
+        self.assertEqual(
+            serializers.BaseSerializer.data.fget.__module__,
+            "rest_framework.serializers",
+        )
+
+    def test_budget_exceeded_fails(self):
+        with override_settings(QUERY_BUDGETS={"flight-list": 1}):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.client.get(reverse("airport:flight-list"))
+
+    def test_budget_exceeded_only_logs_when_not_strict(self):
+        with override_settings(
+            QUERY_BUDGETS={"flight-list": 1}, QUERY_BUDGET_STRICT=False
+        ):
+            with self.assertLogs("airport.instrumentation", "WARNING") as logs:
+                self.client.get(reverse("airport:flight-list"))
+        self.assertIn("flight-list ran", logs.output[0])
+
+    def test_custom_action_names(self):
+        with self.assertLogs("airport.instrumentation", "INFO") as logs:
+            self.get("order-my-tickets")
+        self.assertIn("order-my-tickets:", logs.output[0])
+
+    def test_endpoints_stay_within_budget(self):
+        flight = self.flights[0]
+        for name, args in [
+            ("flight-list", ()),
+            ("flight-detail", (flight.id,)),
+            ("flight-available-seats", (flight.id,)),
+            ("flight-seat-map", (flight.id,)),
+            ("ticket-list", ()),
+            ("ticket-detail", (self.tickets[0].id,)),
+            ("order-list", ()),
+            ("order-detail", (self.order.id,)),
+            ("order-my-tickets", ()),
+        ]:
+            with self.subTest(name):
+                self.get(name, *args)
+
+    def test_order_create_within_budget(self):
+        for tickets in (
+            [
+                {"row": 2, "seat": seat, "flight": self.flights[0].id}
+                for seat in range(1, 7)
+            ],
+            [{"flight": self.flights[0].id}] * 2,
+        ):
+            response = self.client.post(
+                reverse("airport:order-list"),
+                {"tickets": tickets},
+                format="json",
+            )
+            self.assertEqual(response.status_code, 201)
+            self.assertLessEqual(
+                int(response["X-Query-Count"]),
+                settings.QUERY_BUDGETS["order-create"],
+            )
@@ -0,0 +1,108 @@
+import datetime
+from unittest import mock
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIClient
+from airport.itinerary import route_index
+from airport.models import Airplane, AirplaneType, Airport, Flight, Route
+from airport.reference_cache import ReferenceCache
+
+DATE = datetime.date.today() + datetime.timedelta(days=30)
+
+
+def at(hour, minute=0):
+    return timezone.make_aware(
+        datetime.datetime.combine(DATE, datetime.time(hour, minute))
+    )
+
+
+class ItinerarySearchTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="testuser@example.com",
+                password="testpass123"
+            )
+        )
+        self.kbp = Airport.objects.create(name="KBP", closest_big_city="Kyiv")
+        self.waw = Airport.objects.create(name="WAW", closest_big_city="Warsaw")
+        self.lax = Airport.objects.create(name="LAX", closest_big_city="Los Angeles")
+        self.airplane = Airplane.objects.create(
+            name="Boeing",
+            rows=20,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Passenger")
+        )
+        direct = self.route(self.kbp, self.lax, 9000)
+        first = self.route(self.kbp, self.waw, 700)
+        second = self.route(self.waw, self.lax, 9600)
+        self.direct = self.flight(direct, at(10), at(23))
+        self.first = self.flight(first, at(6), at(7))
+        self.too_tight = self.flight(second, at(7, 20), at(17))
+        self.second = self.flight(second, at(8, 30), at(18))
+
+    def route(self, source, destination, distance):
+        return Route.objects.create(
+            source=source, destination=destination, distance=distance
+        )
+
+    def flight(self, route, departure, arrival):
+        return Flight.objects.create(
+            route=route,
+            airplane=self.airplane,
+            departure_time=departure,
+            arrival_time=arrival
+        )
+
+    def search(self, **params):
+        return self.client.get(
+            reverse("airport:itinerary-list"),
+            {
+                "source": self.kbp.id,
+                "destination": self.lax.id,
+                "date": DATE.isoformat(),
+                **params,
+            },
+        )
+
+    def test_fastest_connection_ranked_first(self):
+        response = self.search()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [[leg["flight"] for leg in item["legs"]] for item in response.data],
+            [[self.first.id, self.second.id], [self.direct.id]],
+        )
+
+    def test_sort_by_distance(self):
+        response = self.search(sort="distance")
+        self.assertEqual(response.data[0]["legs"][0]["flight"], self.direct.id)
+
+    def test_max_legs_limits_connections(self):
+        response = self.search(max_legs=1)
+        self.assertEqual(len(response.data), 1)
+
+    def test_route_changes_refresh_index(self):
+        self.search()
+        Route.objects.filter(destination=self.lax).delete()
+        self.assertEqual(self.search().data, [])
+
+    def test_local_cache_index_sees_changes_from_other_processes(self):
+        self.search()
+        # update() sends no signals, like a write made by another worker
+        # whose version bump never reaches this process' local cache.
+        Route.objects.filter(destination=self.lax).update(destination=self.waw)
+        self.assertEqual(self.search().data, [])
+
+    def test_shared_cache_index_skips_route_queries(self):
+        with mock.patch.object(ReferenceCache, "shared", return_value=True):
+            route_index.adjacency()
+            with CaptureQueriesContext(connection) as queries:
+                route_index.adjacency()
+        self.assertEqual(len(queries), 0)
@@ -0,0 +1,162 @@
+import datetime
+import threading
+import time
+from io import StringIO
+from unittest import skipUnless
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from airport import tasks
+from airport.models import Job
+
+calls = []
+
+
+def record(value):
+    calls.append(value)
+
+
+def fail(value):
+    raise RuntimeError(value)
+
+
+@override_settings(TASKS_EAGER=False)
+class JobQueueTestCase(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_jobs_run_by_priority(self):
+        tasks.enqueue(record, "low")
+        tasks.enqueue(record, "high", priority=10)
+        tasks.enqueue(record, "later")
+        self.assertEqual(calls, [])
+
+        out = StringIO()
+        call_command("run_workers", "--burst", stdout=out)
+        self.assertIn("Ran 3 job(s).", out.getvalue())
+        self.assertEqual(calls, ["high", "low", "later"])
+        job = Job.objects.get(args=["high"])
+        self.assertEqual(job.status, Job.Status.DONE)
+        self.assertEqual(job.attempts, 1)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_failed_job_is_retried_with_backoff(self):
+        job = tasks.enqueue(fail, "boom", max_attempts=2)
+        with self.assertLogs("airport.tasks", "ERROR"):
+            self.assertEqual(tasks.run_pending(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.QUEUED)
+        self.assertIn("RuntimeError: boom", job.last_error)
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertEqual(tasks.run_pending(), 0)
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        with self.assertLogs("airport.tasks", "ERROR"):
+            self.assertEqual(tasks.run_pending(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertEqual(job.attempts, 2)
+
+    @override_settings(JOB_RETRY_DELAY=10, JOB_MAX_RETRY_DELAY=60)
+    def test_retry_delay(self):
+        for attempts, limit in [(1, 10), (2, 20), (3, 40), (8, 60)]:
+            delay = tasks.retry_delay(attempts).total_seconds()
+            self.assertTrue(limit / 2 <= delay <= limit)
+
+    def test_stale_jobs_are_requeued(self):
+        job = tasks.enqueue(record, "stale")
+        Job.objects.claim()
+        Job.objects.filter(pk=job.pk).update(
+            heartbeat_at=timezone.now() - datetime.timedelta(hours=1)
+        )
+        self.assertEqual(
+            Job.objects.requeue_stale(datetime.timedelta(minutes=15)), 1
+        )
+        self.assertEqual(tasks.run_pending(), 1)
+        self.assertEqual(calls, ["stale"])
+
+    def test_long_running_jobs_with_heartbeat_are_kept(self):
+        job = tasks.enqueue(record, "long")
+        Job.objects.claim()
+        Job.objects.filter(pk=job.pk).update(
+            started_at=timezone.now() - datetime.timedelta(hours=1)
+        )
+        self.assertEqual(
+            Job.objects.requeue_stale(datetime.timedelta(minutes=15)), 0
+        )
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.RUNNING)
+
+    def test_stale_jobs_out_of_attempts_fail(self):
+        job = tasks.enqueue(record, "crash", max_attempts=1)
+        Job.objects.claim()
+        Job.objects.filter(pk=job.pk).update(
+            heartbeat_at=timezone.now() - datetime.timedelta(hours=1)
+        )
+        self.assertEqual(
+            Job.objects.requeue_stale(datetime.timedelta(minutes=15)), 0
+        )
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertIn("stopped responding", job.last_error)
+        self.assertEqual(tasks.run_pending(), 0)
+
+    def test_recovered_run_does_not_overwrite_outcome(self):
+        tasks.enqueue(record, "slow")
+        first = Job.objects.claim()
+        Job.objects.filter(pk=first.pk).update(
+            heartbeat_at=timezone.now() - datetime.timedelta(hours=1)
+        )
+        Job.objects.requeue_stale(datetime.timedelta(minutes=15))
+        self.assertEqual(tasks.run_pending(), 1)
+        with self.assertLogs("airport.tasks", "WARNING"):
+            tasks.run_job(first)
+        job = Job.objects.get(pk=first.pk)
+        self.assertEqual(job.status, Job.Status.DONE)
+        self.assertEqual(job.attempts, 2)
+
+    def test_job_is_not_queued_when_transaction_rolls_back(self):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                tasks.enqueue(record, "lost")
+                raise RuntimeError
+        self.assertFalse(Job.objects.exists())
+
+
+@override_settings(TASKS_EAGER=False, JOB_HEARTBEAT_INTERVAL=0.05)
+class HeartbeatTestCase(TransactionTestCase):
+    def test_running_job_sends_heartbeats(self):
+        tasks.enqueue(record, "long")
+        job = Job.objects.claim()
+        Job.objects.filter(pk=job.pk).update(
+            heartbeat_at=timezone.now() - datetime.timedelta(hours=1)
+        )
+        beats = []
+        with tasks.heartbeat(job):
+            time.sleep(0.3)
+            beats.append(Job.objects.get(pk=job.pk).heartbeat_at)
+        self.assertGreater(
+            beats[0], timezone.now() - datetime.timedelta(minutes=1)
+        )
+
+
+@skipUnless(
+    connection.features.has_select_for_update_skip_locked,
+    "SKIP LOCKED needs PostgreSQL.",
+)
+@override_settings(TASKS_EAGER=False)
+class SkipLockedTestCase(TransactionTestCase):
+    def test_workers_skip_claimed_jobs(self):
+        first = tasks.enqueue(record, "first", priority=1)
+        second = tasks.enqueue(record, "second")
+        claimed = []
+
+        with transaction.atomic():
+            Job.objects.select_for_update().get(pk=first.pk)
+            thread = threading.Thread(
+                target=lambda: claimed.append(Job.objects.claim())
+            )
+            thread.start()
+            thread.join()
+        self.assertEqual(claimed[0].pk, second.pk)
@@ -0,0 +1,95 @@
+import datetime
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from prometheus_client import REGISTRY
+from rest_framework.test import APIClient
+from airport.models import Airplane, AirplaneType, Airport, Flight, Route
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class MetricsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="testuser@example.com",
+            password="testpass123"
+        )
+        self.client.force_authenticate(self.user)
+        airport1 = Airport.objects.create(name="Airport 1", closest_big_city="CityA")
+        airport2 = Airport.objects.create(name="Airport 2", closest_big_city="CityB")
+        route = Route.objects.create(
+            source=airport1, destination=airport2, distance=500
+        )
+        airplane = Airplane.objects.create(
+            name="Boeing",
+            rows=20,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Passenger")
+        )
+        departure = timezone.now() + datetime.timedelta(days=7)
+        self.flight = Flight.objects.create(
+            route=route,
+            airplane=airplane,
+            departure_time=departure,
+            arrival_time=departure + datetime.timedelta(hours=4)
+        )
+
+    def order(self, row, seat):
+        return self.client.post(
+            reverse("airport:order-list"),
+            {"tickets": [{"row": row, "seat": seat, "flight": self.flight.id}]},
+            format="json",
+        )
+
+    def test_metrics_endpoint_exposes_prometheus_text(self):
+        self.client.get(reverse("airport:flight-list"))
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        body = response.content.decode()
+        self.assertIn(
+            'airport_request_duration_seconds_count{endpoint="flight-list",'
+            'method="GET"}',
+            body,
+        )
+        self.assertIn("airport_request_db_queries_bucket", body)
+
+    def test_request_latency_recorded_per_endpoint(self):
+        labels = {"endpoint": "flight-retrieve", "method": "GET"}
+        before = sample("airport_request_duration_seconds_count", **labels)
+        self.client.get(reverse("airport:flight-detail", args=[self.flight.id]))
+        self.assertEqual(
+            sample("airport_request_duration_seconds_count", **labels),
+            before + 1,
+        )
+
+    def test_booking_outcomes_counted(self):
+        created = sample("airport_orders_created_total")
+        booked = sample("airport_tickets_booked_total")
+        conflicts = sample("airport_ticket_conflicts_total", reason="sold")
+        invalid = sample(
+            "airport_ticket_validation_failures_total", reason="out_of_range"
+        )
+        self.assertEqual(self.order(1, 1).status_code, 201)
+        self.assertEqual(self.order(1, 1).status_code, 400)
+        self.assertEqual(self.order(50, 1).status_code, 400)
+        self.assertEqual(sample("airport_orders_created_total"), created + 1)
+        self.assertEqual(sample("airport_tickets_booked_total"), booked + 1)
+        self.assertEqual(
+            sample("airport_ticket_conflicts_total", reason="sold"),
+            conflicts + 1,
+        )
+        self.assertEqual(
+            sample(
+                "airport_ticket_validation_failures_total",
+                reason="out_of_range",
+            ),
+            invalid + 1,
+        )
@@ -1,7 +1,21 @@
+import datetime
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.contrib.auth import get_user_model
-from airport.models import Order
+from django.utils import timezone
+from rest_framework.test import APIClient
+from airport.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    Flight,
+    Order,
+    Route,
+    Ticket,
+)
 
 
 class OrderTestCase(TestCase):
@@ -21,3 +35,74 @@ class OrderTestCase(TestCase):
         self.client.force_login(self.user)
         response = self.client.get(reverse("airport:order-list"))
         self.assertEqual(response.status_code, 200)
+
+
+class OrderCreateTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="testuser@example.com",
+            password="testpass123"
+        )
+        self.client.force_authenticate(self.user)
+        airport1 = Airport.objects.create(name="Airport 1", closest_big_city="CityA")
+        airport2 = Airport.objects.create(name="Airport 2", closest_big_city="CityB")
+        route = Route.objects.create(
+            source=airport1, destination=airport2, distance=500
+        )
+        airplane = Airplane.objects.create(
+            name="Boeing",
+            rows=20,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Passenger")
+        )
+        departure = timezone.now() + datetime.timedelta(days=7)
+        self.flight = Flight.objects.create(
+            route=route,
+            airplane=airplane,
+            departure_time=departure,
+            arrival_time=departure + datetime.timedelta(hours=4)
+        )
+
+    def create_order(self, *seats):
+        return self.client.post(
+            reverse("airport:order-list"),
+            {
+                "tickets": [
+                    {"row": row, "seat": seat, "flight": self.flight.id}
+                    for row, seat in seats
+                ]
+            },
+            format="json",
+        )
+
+    def test_create_order_with_tickets(self):
+        response = self.create_order((1, 1), (1, 2), (2, 1))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Ticket.objects.filter(order__user=self.user).count(), 3)
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.tickets_sold, 3)
+
+    def test_query_count_does_not_grow_with_tickets(self):
+        with CaptureQueriesContext(connection) as single:
+            self.create_order((1, 1))
+        with CaptureQueriesContext(connection) as group:
+            self.create_order(*[(3, seat) for seat in range(1, 7)])
+        self.assertEqual(len(single), len(group))
+
+    def test_duplicate_and_taken_seats_rejected(self):
+        self.create_order((1, 1))
+        response = self.create_order((1, 1), (2, 2), (2, 2))
+        self.assertEqual(response.status_code, 400)
+        message = Ticket.unique_error()
+        errors = response.data["tickets"]
+        self.assertEqual(errors[0]["non_field_errors"], [message])
+        self.assertEqual(errors[1], {})
+        self.assertEqual(errors[2]["non_field_errors"], [message])
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_seat_out_of_range_rejected(self):
+        response = self.create_order((21, 1))
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("row", response.data["tickets"][0])
@@ -0,0 +1,110 @@
+import base64
+import datetime
+import json
+from urllib.parse import urlencode
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIClient
+from airport.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    Flight,
+    Order,
+    Route,
+    Ticket,
+)
+
+
+class KeysetPaginationTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_superuser(
+            email="admin@example.com",
+            password="adminpass"
+        )
+        self.client.force_authenticate(self.admin)
+        airport1 = Airport.objects.create(name="Airport 1", closest_big_city="CityA")
+        airport2 = Airport.objects.create(name="Airport 2", closest_big_city="CityB")
+        route = Route.objects.create(
+            source=airport1, destination=airport2, distance=500
+        )
+        airplane = Airplane.objects.create(
+            name="Boeing",
+            rows=20,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Passenger")
+        )
+        departure = timezone.now() + datetime.timedelta(days=7)
+        self.flights = [
+            Flight.objects.create(
+                route=route,
+                airplane=airplane,
+                departure_time=departure + datetime.timedelta(
+                    hours=index // 3
+                ),
+                arrival_time=departure + datetime.timedelta(hours=4)
+            )
+            for index in range(12)
+        ]
+        order = Order.objects.create(user=self.admin)
+        for flight in self.flights[:2]:
+            for seat in range(1, 7):
+                Ticket.objects.create(
+                    row=1, seat=seat, flight=flight, order=order
+                )
+
+    def walk(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            ids.extend(item["id"] for item in response.data["results"])
+            url = response.data["next"]
+        return ids
+
+    def test_flight_pages_cover_ties_without_gaps(self):
+        ids = self.walk(reverse("airport:flight-list") + "?page_size=5")
+        self.assertEqual(ids, [flight.id for flight in self.flights])
+
+    def test_previous_link_returns_preceding_page(self):
+        url = reverse("airport:flight-list") + "?page_size=5"
+        first = self.client.get(url).data
+        second = self.client.get(first["next"]).data
+        back = self.client.get(second["previous"]).data
+        self.assertEqual(back["results"], first["results"])
+
+    def test_my_tickets_is_paginated(self):
+        ids = self.walk(reverse("airport:order-my-tickets") + "?page_size=5")
+        self.assertEqual(
+            ids,
+            list(
+                Ticket.objects.order_by("flight_id", "row", "seat")
+                .values_list("id", flat=True)
+            ),
+        )
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get(
+            reverse("airport:flight-list") + "?cursor=bogus"
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_cursor_with_invalid_values_returns_404(self):
+        for name, position in (
+            ("flight-list", ["not a date", 1]),
+            ("flight-list", [self.flights[0].departure_time.isoformat(), "x"]),
+            ("order-list", [{"a": 1}, 1]),
+        ):
+            cursor = base64.b64encode(
+                urlencode({"p": json.dumps(position)}).encode()
+            ).decode()
+            with self.subTest(name, position=position):
+                response = self.client.get(
+                    reverse(f"airport:{name}"), {"cursor": cursor}
+                )
+                self.assertEqual(response.status_code, 404)
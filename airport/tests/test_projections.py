@@ -0,0 +1,114 @@
+import datetime
+import json
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from airport.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    Flight,
+    Order,
+    Route,
+    Ticket,
+)
+from airport.projections import (
+    FlightListProjection,
+    OrderListProjection,
+    Projection,
+    RouteProjection,
+    TicketListProjection,
+)
+
+
+class ProjectionParityTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_superuser(
+            email="admin@example.com",
+            password="adminpass"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        airports = [
+            Airport.objects.create(name=f"Airport {index}", closest_big_city=city)
+            for index, city in enumerate(["Kyiv", "Lviv", "Odesa"])
+        ]
+        routes = [
+            Route.objects.create(source=source, destination=destination, distance=500 + index)
+            for index, (source, destination) in enumerate(
+                [(airports[0], airports[1]), (airports[1], airports[2])]
+            )
+        ]
+        airplane = Airplane.objects.create(
+            name="Boeing",
+            rows=20,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Passenger")
+        )
+        departure = timezone.now().replace(microsecond=123456) + datetime.timedelta(days=7)
+        for index in range(4):
+            flight = Flight.objects.create(
+                route=routes[index % 2],
+                airplane=airplane,
+                departure_time=departure + datetime.timedelta(hours=index),
+                arrival_time=departure + datetime.timedelta(hours=index + 3)
+            )
+            order = Order.objects.create(user=self.user)
+            for seat in range(1, index + 2):
+                Ticket.objects.create(row=1, seat=seat, flight=flight, order=order)
+
+    def assert_parity(self, projection_class, queryset):
+        projection = projection_class()
+        serializer = projection_class.serializer_class(queryset, many=True)
+        renderer = JSONRenderer()
+        self.assertEqual(
+            renderer.render(projection.represent(projection.project(queryset))),
+            renderer.render(serializer.data),
+        )
+
+    def test_flight_list(self):
+        self.assert_parity(FlightListProjection, Flight.objects.order_by("id"))
+
+    def test_ticket_list(self):
+        self.assert_parity(TicketListProjection, Ticket.objects.order_by("id"))
+
+    def test_order_list(self):
+        self.assert_parity(OrderListProjection, Order.objects.order_by("id"))
+
+    def test_route_list(self):
+        self.assert_parity(
+            RouteProjection,
+            Route.objects.select_related("source", "destination").order_by("id"),
+        )
+
+    def test_projection_requires_to_representation(self):
+        class Incomplete(Projection):
+            values = ("id",)
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+    def test_list_endpoints_match_serializers(self):
+        for name, serializer_class, queryset in [
+            ("flight-list", FlightListProjection.serializer_class,
+             Flight.objects.order_by("departure_time", "id")),
+            ("ticket-list", TicketListProjection.serializer_class,
+             Ticket.objects.order_by("flight_id", "row", "seat")),
+            ("order-list", OrderListProjection.serializer_class,
+             Order.objects.order_by("-created_at", "id")),
+        ]:
+            with self.subTest(name):
+                response = self.client.get(reverse(f"airport:{name}"))
+                self.assertEqual(
+                    json.loads(response.content)["results"],
+                    json.loads(
+                        JSONRenderer().render(
+                            serializer_class(queryset, many=True).data
+                        )
+                    ),
+                )
@@ -0,0 +1,85 @@
+import datetime
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIClient
+from airport.models import Airplane, AirplaneType, Airport, Crew, Flight, Route
+from airport.reference_cache import reference_cache
+
+
+class ReferenceCacheTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_superuser(
+                email="admin@example.com",
+                password="adminpass"
+            )
+        )
+        self.airport1 = Airport.objects.create(name="Airport 1", closest_big_city="CityA")
+        self.airport2 = Airport.objects.create(name="Airport 2", closest_big_city="CityB")
+        self.route = Route.objects.create(
+            source=self.airport1, destination=self.airport2, distance=500
+        )
+
+    def test_route_list_served_from_cache(self):
+        url = reverse("airport:route-list")
+        first = self.client.get(url)
+        hits = reference_cache.stats()["hits"]
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(url)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(reference_cache.stats()["hits"], hits + 1)
+
+    def test_airport_change_invalidates_routes(self):
+        url = reverse("airport:route-list")
+        self.client.get(url)
+        self.airport1.name = "Renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.airport1.save()
+        response = self.client.get(url)
+        self.assertEqual(response.data[0]["source"]["name"], "Renamed")
+
+    def test_version_changes_only_on_commit(self):
+        version = reference_cache.version(Airport)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.airport1.name = "Renamed"
+            self.airport1.save()
+            self.assertEqual(reference_cache.version(Airport), version)
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(reference_cache.version(Airport), version)
+
+    def test_flight_detail_nests_cached_references(self):
+        airplane = Airplane.objects.create(
+            name="Boeing",
+            rows=20,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Passenger")
+        )
+        departure = timezone.now() + datetime.timedelta(days=7)
+        flight = Flight.objects.create(
+            route=self.route,
+            airplane=airplane,
+            departure_time=departure,
+            arrival_time=departure + datetime.timedelta(hours=4)
+        )
+        crew = Crew.objects.create(first_name="Ann", last_name="Lee")
+        flight.crew.add(crew)
+        url = reverse("airport:flight-detail", args=[flight.id])
+        first = self.client.get(url)
+        self.assertEqual(first.data["route"]["source"]["name"], "Airport 1")
+        self.assertEqual(first.data["airplane"]["airplane_type"]["name"], "Passenger")
+        self.assertEqual(first.data["crew"][0]["first_name"], "Ann")
+        crew.first_name = "Anna"
+        with self.captureOnCommitCallbacks(execute=True):
+            crew.save()
+        second = self.client.get(url)
+        self.assertEqual(second.data["route"], first.data["route"])
+        self.assertEqual(second.data["crew"][0]["first_name"], "Anna")
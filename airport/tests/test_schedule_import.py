@@ -0,0 +1,141 @@
+import datetime
+import io
+import json
+import os
+import tempfile
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIClient
+from airport.models import Airplane, AirplaneType, Airport, Crew, Flight, Route
+
+
+class ScheduleImportTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_superuser(
+                email="admin@example.com",
+                password="adminpass"
+            )
+        )
+        airport1 = Airport.objects.create(name="Airport 1", closest_big_city="CityA")
+        airport2 = Airport.objects.create(name="Airport 2", closest_big_city="CityB")
+        self.route = Route.objects.create(
+            source=airport1, destination=airport2, distance=500
+        )
+        self.airplane = Airplane.objects.create(
+            name="Boeing",
+            rows=20,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Passenger")
+        )
+        self.crew = [
+            Crew.objects.create(first_name="Ann", last_name="Lee"),
+            Crew.objects.create(first_name="Bob", last_name="Ray"),
+        ]
+        self.departure = timezone.now() + datetime.timedelta(days=30)
+        self.url = reverse("airport:flight-import-schedule")
+
+    def rows(self, count, start=0):
+        return [
+            {
+                "route": self.route.id,
+                "airplane": self.airplane.id,
+                "departure_time": (self.departure + datetime.timedelta(hours=3 * index)).isoformat(),
+                "arrival_time": (self.departure + datetime.timedelta(hours=3 * index + 2)).isoformat(),
+                "crew": [member.id for member in self.crew],
+            }
+            for index in range(start, start + count)
+        ]
+
+    def test_import_json(self):
+        response = self.client.post(self.url, {"flights": self.rows(3)}, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data, {"created": 3})
+        flight = Flight.objects.first()
+        self.assertEqual(Flight.objects.count(), 3)
+        self.assertEqual(flight.capacity, 120)
+        self.assertEqual(flight.crew.count(), 2)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        with CaptureQueriesContext(connection) as small:
+            self.client.post(self.url, {"flights": self.rows(2)}, format="json")
+        with CaptureQueriesContext(connection) as large:
+            self.client.post(self.url, {"flights": self.rows(100, start=2)}, format="json")
+        self.assertEqual(len(large), len(small))
+        self.assertEqual(Flight.objects.count(), 102)
+
+    def test_per_row_errors_and_nothing_created(self):
+        rows = self.rows(3)
+        rows[0]["route"] = 999
+        rows[2]["arrival_time"] = rows[2]["departure_time"]
+        rows[2]["crew"] = [self.crew[0].id, 998]
+        response = self.client.post(self.url, {"flights": rows}, format="json")
+        self.assertEqual(response.status_code, 400)
+        errors = response.data["flights"]
+        self.assertIn("route", errors[0])
+        self.assertEqual(errors[1], {})
+        self.assertIn("arrival_time", errors[2])
+        self.assertFalse(Flight.objects.exists())
+
+    def test_import_csv_upload(self):
+        lines = ["route,airplane,departure_time,arrival_time,crew"] + [
+            f'{row["route"]},{row["airplane"]},{row["departure_time"]},'
+            f'{row["arrival_time"]},{self.crew[0].id};{self.crew[1].id}'
+            for row in self.rows(4)
+        ]
+        upload = SimpleUploadedFile(
+            "summer.csv", "\n".join(lines).encode(), content_type="text/csv"
+        )
+        response = self.client.post(self.url, {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Flight.objects.count(), 4)
+        self.assertEqual(Flight.crew.through.objects.count(), 8)
+
+    def test_unsupported_upload(self):
+        upload = SimpleUploadedFile("summer.xlsx", b"data")
+        response = self.client.post(self.url, {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("file", response.data)
+
+    def test_non_utf8_upload(self):
+        upload = SimpleUploadedFile("summer.csv", "route;Ärzte".encode("latin-1"))
+        response = self.client.post(self.url, {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("UTF-8", str(response.data["file"]))
+
+    def test_command(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as file:
+            json.dump(self.rows(5), file)
+        self.addCleanup(os.remove, file.name)
+        call_command("import_schedule", file.name, "--dry-run", stdout=io.StringIO())
+        self.assertFalse(Flight.objects.exists())
+        call_command("import_schedule", file.name, stdout=io.StringIO())
+        self.assertEqual(Flight.objects.count(), 5)
+
+    def test_command_reports_row_errors(self):
+        rows = self.rows(2)
+        rows[1]["airplane"] = 999
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as file:
+            json.dump(rows, file)
+        self.addCleanup(os.remove, file.name)
+        stderr = io.StringIO()
+        with self.assertRaises(CommandError):
+            call_command("import_schedule", file.name, stderr=stderr)
+        self.assertIn("Row 2:", stderr.getvalue())
+        self.assertFalse(Flight.objects.exists())
+
+    def test_command_rejects_non_utf8_file(self):
+        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as file:
+            file.write(b"route,airplane\n\xff\xfe,1\n")
+        self.addCleanup(os.remove, file.name)
+        with self.assertRaisesMessage(CommandError, "not valid UTF-8"):
+            call_command("import_schedule", file.name, stdout=io.StringIO())
@@ -0,0 +1,269 @@
+import datetime
+import threading
+import uuid
+from unittest import mock, skipUnless
+from django.core.cache import cache
+from django.db import IntegrityError, connection
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIClient
+from airport.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    Flight,
+    Order,
+    Route,
+    SeatHold,
+    Ticket,
+)
+
+
+class SeatHoldTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="testuser@example.com",
+            password="testpass123"
+        )
+        self.other_user = get_user_model().objects.create_user(
+            email="other@example.com",
+            password="testpass123"
+        )
+        airport1 = Airport.objects.create(name="Airport 1", closest_big_city="CityA")
+        airport2 = Airport.objects.create(name="Airport 2", closest_big_city="CityB")
+        route = Route.objects.create(
+            source=airport1, destination=airport2, distance=500
+        )
+        airplane = Airplane.objects.create(
+            name="Small",
+            rows=2,
+            seats_in_row=2,
+            airplane_type=AirplaneType.objects.create(name="Passenger")
+        )
+        departure = timezone.now() + datetime.timedelta(days=7)
+        self.flight = Flight.objects.create(
+            route=route,
+            airplane=airplane,
+            departure_time=departure,
+            arrival_time=departure + datetime.timedelta(hours=4)
+        )
+        self.hold_url = reverse(
+            "airport:flight-hold-seats", args=[self.flight.id]
+        )
+
+    def order(self, user, tickets, **extra):
+        self.client.force_authenticate(user)
+        return self.client.post(
+            reverse("airport:order-list"),
+            {"tickets": tickets, **extra},
+            format="json",
+        )
+
+    def test_held_seat_is_reserved_for_holder(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.post(
+            self.hold_url,
+            {"seats": [{"row": 1, "seat": 1}]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        hold = str(response.data["hold"])
+        ticket = {"row": 1, "seat": 1, "flight": self.flight.id}
+
+        response = self.order(self.other_user, [ticket])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data["tickets"][0]["non_field_errors"],
+            [SeatHold.held_error],
+        )
+
+        response = self.order(self.user, [ticket], hold=hold)
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(SeatHold.objects.exists())
+
+    def test_hold_conflict_returns_409(self):
+        self.client.force_authenticate(self.user)
+        self.client.post(
+            self.hold_url, {"seats": [{"row": 1, "seat": 1}]}, format="json"
+        )
+        self.client.force_authenticate(self.other_user)
+        response = self.client.post(
+            self.hold_url,
+            {"seats": [{"row": 1, "seat": 1}, {"row": 1, "seat": 2}]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(SeatHold.objects.count(), 1)
+
+    def test_any_seat_order_assigns_free_seats(self):
+        order = Order.objects.create(user=self.other_user)
+        Ticket.objects.create(row=1, seat=1, flight=self.flight, order=order)
+        response = self.order(
+            self.user, [{"flight": self.flight.id}, {"flight": self.flight.id}]
+        )
+        self.assertEqual(response.status_code, 201)
+        seats = set(
+            Ticket.objects.filter(order__user=self.user).values_list(
+                "row", "seat"
+            )
+        )
+        self.assertEqual(len(seats), 2)
+        self.assertNotIn((1, 1), seats)
+
+    def test_any_seat_order_rejected_when_sold_out(self):
+        response = self.order(self.user, [{"flight": self.flight.id}] * 5)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["tickets"], [SeatHold.sold_out_error])
+        self.assertFalse(SeatHold.objects.exists())
+
+    def test_expired_hold_is_reclaimed(self):
+        SeatHold.objects.create(
+            flight=self.flight,
+            row=2,
+            seat=2,
+            user=self.other_user,
+            expires_at=timezone.now() - datetime.timedelta(minutes=1),
+        )
+        seats = SeatHold.objects.hold_any(
+            self.flight, 4, self.user, uuid.uuid4()
+        )
+        self.assertEqual(len(seats), 4)
+        self.assertEqual(
+            SeatHold.objects.filter(user=self.user).count(), 4
+        )
+
+    def test_hold_token_is_bound_to_its_user(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.post(
+            self.hold_url, {"seats": [{"row": 1, "seat": 1}]}, format="json"
+        )
+        hold = str(response.data["hold"])
+        ticket = {"row": 1, "seat": 1, "flight": self.flight.id}
+
+        response = self.order(self.other_user, [ticket], hold=hold)
+        self.assertEqual(response.status_code, 400)
+        self.client.delete(f"{self.hold_url}?hold={hold}")
+        response = self.order(
+            self.other_user, [{"flight": self.flight.id}], hold=hold
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(
+            SeatHold.objects.filter(user=self.user, token=hold).exists()
+        )
+
+    def test_rehold_replaces_expired_hold_and_extends_expiry(self):
+        token = uuid.uuid4()
+        SeatHold.objects.create(
+            flight=self.flight,
+            row=1,
+            seat=1,
+            user=self.user,
+            token=token,
+            expires_at=timezone.now() - datetime.timedelta(minutes=1),
+        )
+        SeatHold.objects.create(
+            flight=self.flight,
+            row=1,
+            seat=2,
+            user=self.user,
+            token=token,
+            expires_at=timezone.now() + datetime.timedelta(minutes=1),
+        )
+        expires_at = timezone.now() + datetime.timedelta(minutes=10)
+        seats = SeatHold.objects.hold_seats(
+            self.flight, [(1, 1), (1, 2)], self.user, token, expires_at
+        )
+        self.assertEqual(seats, [(1, 1), (1, 2)])
+        self.assertEqual(
+            set(SeatHold.objects.values_list("expires_at", flat=True)),
+            {expires_at},
+        )
+
+    def test_failed_order_releases_assigned_seats(self):
+        with mock.patch.object(
+            Ticket.objects, "bulk_create", side_effect=IntegrityError
+        ):
+            response = self.order(self.user, [{"flight": self.flight.id}])
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(SeatHold.objects.exists())
+
+
+@skipUnless(connection.vendor == "postgresql", "Needs concurrent PostgreSQL sessions.")
+class ConcurrentBookingTestCase(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.users = [
+            get_user_model().objects.create_user(
+                email=f"buyer{index}@example.com", password="testpass123"
+            )
+            for index in range(2)
+        ]
+        departure = timezone.now() + datetime.timedelta(days=7)
+        self.flight = Flight.objects.create(
+            route=Route.objects.create(
+                source=Airport.objects.create(name="Airport 1", closest_big_city="CityA"),
+                destination=Airport.objects.create(name="Airport 2", closest_big_city="CityB"),
+                distance=500,
+            ),
+            airplane=Airplane.objects.create(
+                name="Small",
+                rows=2,
+                seats_in_row=2,
+                airplane_type=AirplaneType.objects.create(name="Passenger"),
+            ),
+            departure_time=departure,
+            arrival_time=departure + datetime.timedelta(hours=4),
+        )
+
+    def book(self, user, responses):
+        client = APIClient()
+        client.force_authenticate(user)
+        try:
+            responses.append(
+                client.post(
+                    reverse("airport:order-list"),
+                    {"tickets": [{"flight": self.flight.id}] * 2},
+                    format="json",
+                )
+            )
+        finally:
+            connection.close()
+
+    def test_any_seat_orders_do_not_wait_on_each_other(self):
+        paused, resume = threading.Event(), threading.Event()
+        add_tickets_sold = Flight.add_tickets_sold
+
+        def pause_first_order(counts):
+            # The first order stops inside its transaction, after its
+            # tickets are inserted and before it commits.
+            if not paused.is_set():
+                paused.set()
+                resume.wait(10)
+            add_tickets_sold(counts)
+
+        first, second = [], []
+        with mock.patch.object(Flight, "add_tickets_sold", pause_first_order):
+            slow = threading.Thread(target=self.book, args=(self.users[0], first))
+            slow.start()
+            self.assertTrue(paused.wait(10))
+            fast = threading.Thread(target=self.book, args=(self.users[1], second))
+            fast.start()
+            fast.join(10)
+            finished_while_paused = not fast.is_alive()
+            resume.set()
+            slow.join(10)
+            fast.join(10)
+
+        self.assertTrue(finished_while_paused)
+        self.assertEqual([first[0].status_code, second[0].status_code], [201, 201])
+        self.assertEqual(
+            Ticket.objects.filter(flight=self.flight).values("row", "seat").distinct().count(),
+            4,
+        )
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.tickets_sold, 4)
+        self.assertFalse(SeatHold.objects.exists())
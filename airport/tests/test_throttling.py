@@ -0,0 +1,125 @@
+import os
+import threading
+import time
+from unittest import skipUnless
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache, caches
+from django.test import TestCase, override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from airport.throttling import (
+    AnonTokenBucketThrottle,
+    CacheBuckets,
+    RedisBuckets,
+    UserTokenBucketThrottle,
+    default_buckets,
+)
+
+REDIS_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+    }
+}
+
+
+class UserThrottle(UserTokenBucketThrottle):
+    rate = "10/min"
+
+
+class AnonThrottle(AnonTokenBucketThrottle):
+    rate = "3/min"
+
+
+class View:
+    def __init__(self, action, throttle_costs=None):
+        self.action = action
+        if throttle_costs is not None:
+            self.throttle_costs = throttle_costs
+
+
+class TokenBucketThrottleTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email="passenger@example.com",
+            password="testpass123"
+        )
+
+    def request(self, user):
+        request = Request(APIRequestFactory().get("/"))
+        request.user = user
+        return request
+
+    def test_burst_then_reject(self):
+        throttle = AnonThrottle()
+        request = self.request(AnonymousUser())
+        results = [throttle.allow_request(request, View("list")) for _ in range(4)]
+        self.assertEqual(results, [True, True, True, False])
+        self.assertAlmostEqual(throttle.wait(), 20, delta=1)
+
+    def test_authenticated_users_skip_anon_throttle(self):
+        throttle = AnonThrottle()
+        request = self.request(self.user)
+        self.assertTrue(
+            all(throttle.allow_request(request, View("list")) for _ in range(10))
+        )
+
+    def test_weighted_cost(self):
+        request = self.request(self.user)
+        order = View("create", {"create": 5})
+        self.assertTrue(UserThrottle().allow_request(request, order))
+        self.assertTrue(UserThrottle().allow_request(request, View("list")))
+        self.assertFalse(UserThrottle().allow_request(request, order))
+        self.assertTrue(UserThrottle().allow_request(request, View("list")))
+
+    def test_users_have_separate_buckets(self):
+        other = get_user_model().objects.create_user(
+            email="other@example.com",
+            password="testpass123"
+        )
+        order = View("create", {"create": 10})
+        self.assertTrue(UserThrottle().allow_request(self.request(self.user), order))
+        self.assertTrue(UserThrottle().allow_request(self.request(other), order))
+
+    def test_refill(self):
+        buckets = CacheBuckets(cache)
+        self.assertEqual(buckets.take("bucket", 2, 100, 2), (True, 0))
+        self.assertFalse(buckets.take("bucket", 2, 100, 1)[0])
+        time.sleep(0.02)
+        self.assertTrue(buckets.take("bucket", 2, 100, 1)[0])
+
+    def assert_atomic(self, buckets):
+        allowed = []
+
+        def take():
+            for _ in range(10):
+                allowed.append(buckets.take("concurrent", 25, 0.001, 1)[0])
+
+        threads = [threading.Thread(target=take) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(allowed.count(True), 25)
+
+    def test_local_buckets_are_atomic(self):
+        self.assert_atomic(CacheBuckets(cache))
+
+    def redis_buckets(self):
+        self.enterContext(override_settings(CACHES=REDIS_CACHES))
+        default_buckets.cache_clear()
+        self.addCleanup(default_buckets.cache_clear)
+        return default_buckets()
+
+    def test_redis_cache_uses_redis_buckets(self):
+        buckets = self.redis_buckets()
+        self.assertIsInstance(buckets, RedisBuckets)
+        self.assertIs(buckets.cache, caches["default"])
+
+    @skipUnless(os.getenv("REDIS_URL"), "Set REDIS_URL to test Redis buckets.")
+    def test_redis_buckets_are_atomic(self):
+        buckets = self.redis_buckets()
+        caches["default"].delete("concurrent")
+        self.assert_atomic(buckets)
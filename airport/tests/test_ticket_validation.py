@@ -0,0 +1,121 @@
+import datetime
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from airport.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    Flight,
+    Order,
+    Route,
+    Ticket,
+    TicketValidator,
+)
+
+
+class TicketValidatorTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_superuser(
+            email="admin@example.com",
+            password="adminpass"
+        )
+        self.order = Order.objects.create(user=self.user)
+        route = Route.objects.create(
+            source=Airport.objects.create(name="Airport 1", closest_big_city="CityA"),
+            destination=Airport.objects.create(name="Airport 2", closest_big_city="CityB"),
+            distance=500,
+        )
+        airplane = Airplane.objects.create(
+            name="Boeing",
+            rows=20,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Passenger")
+        )
+        departure = timezone.now() + datetime.timedelta(days=7)
+        self.flight = Flight.objects.create(
+            route=route,
+            airplane=airplane,
+            departure_time=departure,
+            arrival_time=departure + datetime.timedelta(hours=3),
+        )
+        self.departed = Flight.objects.create(
+            route=route,
+            airplane=airplane,
+            departure_time=timezone.now() - datetime.timedelta(days=1),
+            arrival_time=timezone.now() - datetime.timedelta(hours=20),
+        )
+        self.ticket = Ticket.objects.create(
+            row=1, seat=1, flight=self.flight, order=self.order
+        )
+
+    def test_batch_uses_one_set_of_lookups(self):
+        tickets = [
+            (self.flight.id, 1, 1),
+            (self.flight.id, 2, 2),
+            (self.flight.id, 2, 2),
+            (self.flight.id, 21, 1),
+            (self.departed.id, 3, 3),
+            (0, 1, 1),
+        ]
+        with self.assertNumQueries(2):
+            errors = TicketValidator(tickets).errors()
+        self.assertEqual(
+            [error and error[0] for error in errors],
+            ["sold", None, "sold", "out_of_range", "departed", "unknown_flight"],
+        )
+
+    def test_prefetched_flights_are_reused(self):
+        flight = Flight.objects.select_related("airplane").get(pk=self.flight.pk)
+        with self.assertNumQueries(1):
+            errors = TicketValidator(
+                [(flight.id, 3, 3)], flights={flight.id: flight}
+            ).errors()
+        self.assertEqual(errors, [None])
+
+    def test_save_validates_with_one_lookup(self):
+        flight = Flight.objects.select_related("airplane").get(pk=self.flight.pk)
+        ticket = Ticket(row=2, seat=2, flight=flight, order=self.order)
+        with CaptureQueriesContext(connection) as queries:
+            ticket.save()
+        selects = [
+            query["sql"] for query in queries
+            if query["sql"].startswith("SELECT")
+        ]
+        self.assertEqual(len([sql for sql in selects if "flight" in sql]), 1)
+
+        with self.assertRaises(ValidationError) as context:
+            Ticket.objects.create(
+                row=2, seat=2, flight=flight, order=self.order
+            )
+        self.assertEqual(context.exception.messages, [Ticket.unique_error()])
+
+    def test_update_does_not_conflict_with_itself(self):
+        self.ticket.seat = 1
+        self.ticket.save()
+        self.ticket.refresh_from_db()
+        self.assertEqual((self.ticket.row, self.ticket.seat), (1, 1))
+
+    def test_admin_ticket_endpoint(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        url = reverse("airport:ticket-list")
+        data = {"flight": self.flight.id, "order": self.order.id}
+
+        response = client.post(url, {**data, "row": 3, "seat": 3})
+        self.assertEqual(response.status_code, 201)
+        response = client.post(url, {**data, "row": 1, "seat": 1})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data["non_field_errors"], [Ticket.unique_error()]
+        )
+        response = client.post(url, {**data, "row": 30, "seat": 1})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("row", response.data)
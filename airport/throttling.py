@@ -0,0 +1,139 @@
+import functools
+import threading
+import time
+
+import redis
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.redis import RedisCache
+from rest_framework.throttling import (
+    AnonRateThrottle,
+    SimpleRateThrottle,
+    UserRateThrottle,
+)
+
+# Refill the bucket for the time since its last check, then take ``cost``
+# tokens if there are enough. Runs atomically inside Redis and uses the
+# Redis clock, so every worker and host shares one bucket per key.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call("TIME")
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call("HMGET", KEYS[1], "tokens", "updated")
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "updated",
+    string.format("%.6f", now))
+redis.call("EXPIRE", KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisBuckets:
+    """
+    Token buckets kept as Redis hashes and updated by a Lua script.
+
+    The script runs on the cache's primary server, through a redis-py
+    client built from the cache's LOCATION.
+    """
+
+    def __init__(self, cache, location):
+        self.cache = cache
+        if isinstance(location, str):
+            location = location.split(",")
+        self.client = redis.Redis.from_url(location[0])
+        self._script = None
+
+    def take(self, key, capacity, rate, cost):
+        if self._script is None:
+            self._script = self.client.register_script(TOKEN_BUCKET_SCRIPT)
+        allowed, tokens = self._script(
+            keys=[self.cache.make_and_validate_key(key)],
+            args=[capacity, rate, cost],
+        )
+        return bool(allowed), float(tokens)
+
+
+class CacheBuckets:
+    """
+    Token buckets stored in any Django cache under a process-wide lock.
+
+    Only atomic within one process, which makes it the stand-in for the
+    local-memory cache used in development and tests.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, rate, cost):
+        with self._lock:
+            now = time.time()
+            tokens, updated = self.cache.get(key, (capacity, now))
+            tokens = min(capacity, tokens + max(0.0, now - updated) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self.cache.set(key, (tokens, now), int(capacity / rate) + 1)
+        return allowed, tokens
+
+
+@functools.cache
+def default_buckets():
+    # ``django.core.cache.cache`` is a proxy, so check the backend itself.
+    backend = caches[DEFAULT_CACHE_ALIAS]
+    if isinstance(backend, RedisCache):
+        return RedisBuckets(
+            backend, settings.CACHES[DEFAULT_CACHE_ALIAS]["LOCATION"]
+        )
+    return CacheBuckets(backend)
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    Token bucket variant of ``SimpleRateThrottle``.
+
+    A rate of ``N/period`` allows bursts of N requests and refills at N
+    per period. Each check stores two numbers per client instead of a
+    list of timestamps. Views can charge more for expensive actions with
+    ``throttle_costs = {"<action>": tokens}``.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        capacity = self.num_requests
+        self.refill_rate = capacity / self.duration
+        self.cost = min(self.get_cost(view), capacity)
+        allowed, self.tokens = default_buckets().take(
+            self.key, capacity, self.refill_rate, self.cost
+        )
+        return allowed
+
+    @staticmethod
+    def get_cost(view):
+        costs = getattr(view, "throttle_costs", {})
+        return costs.get(getattr(view, "action", None), 1)
+
+    def wait(self):
+        return max(0.0, (self.cost - self.tokens) / self.refill_rate)
+
+
+class AnonTokenBucketThrottle(TokenBucketThrottle, AnonRateThrottle):
+    pass
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle, UserRateThrottle):
+    pass
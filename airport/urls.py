@@ -1,12 +1,17 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework import routers
+from airport.async_views import async_urlpatterns
 from airport.views import (
+    CacheStatsViewSet,
     AirportViewSet,
     RouteViewSet,
     AirplaneTypeViewSet,
     AirplaneViewSet,
     CrewViewSet,
     FlightViewSet,
+    FlightScheduleViewSet,
+    ItineraryViewSet,
     TicketViewSet,
     OrderViewSet,
 )
@@ -23,7 +28,15 @@ router.register(
 router.register("airplanes", AirplaneViewSet, basename="airplane")
 router.register("crews", CrewViewSet, basename="crew")
 router.register("flights", FlightViewSet, basename="flight")
+router.register(
+    "schedules", FlightScheduleViewSet, basename="flight_schedule"
+)
+router.register("itineraries", ItineraryViewSet, basename="itinerary")
 router.register("tickets", TicketViewSet, basename="ticket")
 router.register("orders", OrderViewSet, basename="order")
+router.register("cache-stats", CacheStatsViewSet, basename="cache_stats")
 
 urlpatterns = [path("", include(router.urls))]
+
+if settings.ASYNC_READ_VIEWS:
+    urlpatterns = async_urlpatterns(router) + urlpatterns
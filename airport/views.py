@@ -1,12 +1,32 @@
-from datetime import datetime
-from django.db.models import Count, F
+import base64
+import hashlib
+import uuid
+from datetime import datetime, time, timedelta
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiTypes
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
-from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from rest_framework.permissions import (
+    SAFE_METHODS,
+    IsAuthenticated,
+    IsAdminUser,
+)
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
 
+from airport import metrics
+from airport.db_router import (
+    pin_to_primary,
+    pinned_to_primary,
+    primary_reads,
+    replica_reads,
+)
+from airport.exports import export_response
+from airport.instrumentation import SerializerTimingMixin, serializer_timer
+from airport.itinerary import search_itineraries
 from airport.models import (
     Airport,
     Route,
@@ -14,8 +34,24 @@ from airport.models import (
     Airplane,
     Crew,
     Flight,
+    FlightCrew,
+    FlightSchedule,
     Ticket,
     Order,
+    SeatHold,
+)
+from airport.pagination import KeysetPagination
+from airport.projections import (
+    FlightListProjection,
+    OrderListProjection,
+    RouteProjection,
+    TicketListProjection,
+)
+from airport.reference_cache import DEPENDENCIES, reference_cache
+from airport.schedule_import import (
+    ScheduleFileError,
+    detect_format,
+    read_schedule,
 )
 from airport.serializers import (
     AirportSerializer,
@@ -24,15 +60,25 @@ from airport.serializers import (
     AirplaneSerializer,
     AirplaneImageSerializer,
     CrewSerializer,
+    CrewRosterSerializer,
     FlightListSerializer,
     FlightDetailSerializer,
     FlightCreateUpdateSerializer,
+    FlightFilterSerializer,
+    FlightExportSerializer,
+    FlightImportSerializer,
+    FlightScheduleSerializer,
+    TicketExportSerializer,
+    OrderExportSerializer,
     TicketListSerializer,
     TicketDetailSerializer,
     TicketCreateUpdateSerializer,
     OrderListSerializer,
     OrderDetailSerializer,
     OrderCreateUpdateSerializer,
+    SeatHoldSerializer,
+    ItinerarySearchSerializer,
+    ItinerarySerializer,
 )
 
 
@@ -52,25 +98,121 @@ class UploadImageMixin:
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class AirportViewSet(viewsets.ModelViewSet):
+class CachedReferenceMixin:
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        key = reference_cache.key(
+            DEPENDENCIES[self.queryset.model],
+            self.basename,
+            self.action,
+            hashlib.md5(request.build_absolute_uri().encode()).hexdigest(),
+        )
+        data = reference_cache.get(key)
+        if data is not None:
+            return Response(data)
+        # The entry is stored under the current version and shared with
+        # every user, so it must not be built from a lagging replica.
+        with primary_reads():
+            response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            reference_cache.set(key, response.data)
+        return response
+
+
+class ReplicaReadMixin:
+    """
+    Serve safe-method requests from a read replica.
+
+    A successful write pins the user to the primary for
+    REPLICA_STICKY_SECONDS, so they read their own bookings back.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        with replica_reads() as reads:
+            self.replica_reads = reads
+            response = super().dispatch(request, *args, **kwargs)
+        if (
+            self.request.method not in SAFE_METHODS
+            and response.status_code < 400
+        ):
+            pin_to_primary(self.request.user)
+        return response
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if (
+            settings.DATABASE_REPLICAS
+            and request.method in SAFE_METHODS
+            and not pinned_to_primary(request.user)
+        ):
+            self.replica_reads.enable()
+
+
+class ProjectionListMixin:
+    """Serve ``list`` through a values() projection instead of models."""
+
+    list_projection = None
+
+    def list(self, request, *args, **kwargs):
+        projection = self.list_projection(self.get_serializer_context())
+        queryset = projection.project(
+            self.filter_queryset(self.get_queryset())
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(projection.represent(page))
+        return Response(projection.represent(queryset))
+
+
+class AirportViewSet(
+    ReplicaReadMixin,
+    CachedReferenceMixin,
+    SerializerTimingMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Airport.objects.all()
     serializer_class = AirportSerializer
     permission_classes = [IsAdminUser]
 
 
-class RouteViewSet(viewsets.ModelViewSet):
+class RouteViewSet(
+    ReplicaReadMixin,
+    CachedReferenceMixin,
+    ProjectionListMixin,
+    SerializerTimingMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Route.objects.select_related("source", "destination")
     serializer_class = RouteSerializer
+    list_projection = RouteProjection
     permission_classes = [IsAdminUser]
 
 
-class AirplaneTypeViewSet(viewsets.ModelViewSet):
+class AirplaneTypeViewSet(
+    ReplicaReadMixin,
+    CachedReferenceMixin,
+    SerializerTimingMixin,
+    viewsets.ModelViewSet,
+):
     queryset = AirplaneType.objects.all()
     serializer_class = AirplaneTypeSerializer
     permission_classes = [IsAdminUser]
 
 
-class AirplaneViewSet(viewsets.ModelViewSet):
+class AirplaneViewSet(
+    ReplicaReadMixin,
+    CachedReferenceMixin,
+    UploadImageMixin,
+    SerializerTimingMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Airplane.objects.select_related("airplane_type")
     serializer_class = AirplaneSerializer
     permission_classes = [IsAdminUser]
@@ -81,25 +223,70 @@ class AirplaneViewSet(viewsets.ModelViewSet):
         return AirplaneSerializer
 
 
-class CrewViewSet(viewsets.ModelViewSet):
+class CrewViewSet(
+    ReplicaReadMixin,
+    CachedReferenceMixin,
+    SerializerTimingMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Crew.objects.all()
     serializer_class = CrewSerializer
     permission_classes = [IsAdminUser]
 
+    @extend_schema(
+        parameters=[CrewRosterSerializer],
+        responses=FlightListSerializer(many=True),
+    )
+    @action(detail=True, methods=["get"])
+    def roster(self, request, pk=None):
+        """
+        Flights the crew member is on that overlap ``[start, end)``, in
+        departure order, read from the (crew, departure_time) index with
+        a single query.
+        """
+        params = CrewRosterSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        member = self.get_object()
+        assignments = FlightCrew.objects.filter(crew=member).overlapping(
+            params.validated_data["start"], params.validated_data["end"]
+        )
+        projection = FlightListProjection(self.get_serializer_context())
+        flights = projection.project(
+            Flight.objects.filter(
+                pk__in=assignments.values("flight_id")
+            ).order_by("departure_time", "id")
+        )
+        return Response(projection.represent(flights))
+
+
+class CacheStatsViewSet(viewsets.ViewSet):
+    permission_classes = [IsAdminUser]
+
+    def list(self, request):
+        return Response(reference_cache.stats())
+
+
+class FlightPagination(KeysetPagination):
+    ordering = ("departure_time", "id")
+
+
+class TicketPagination(KeysetPagination):
+    ordering = ("flight_id", "row", "seat")
+
+
+class OrderPagination(KeysetPagination):
+    ordering = ("-created_at", "id")
 
-class FlightViewSet(viewsets.ModelViewSet):
-    queryset = Flight.objects.select_related(
-        "route",
-        "airplane"
-    ).prefetch_related(
-        "crew"
-    ).annotate(tickets_available=F(
-        "airplane__rows"
-    ) * F(
-        "airplane__seats_in_row"
-    ) - Count(
-        "tickets"
-    ))
+
+class FlightViewSet(
+    ReplicaReadMixin,
+    ProjectionListMixin,
+    SerializerTimingMixin,
+    viewsets.ModelViewSet,
+):
+    queryset = Flight.objects.all()
+    pagination_class = FlightPagination
+    list_projection = FlightListProjection
     permission_classes = [IsAdminUser]
 
     def get_serializer_class(self):
@@ -110,52 +297,262 @@ class FlightViewSet(viewsets.ModelViewSet):
         return FlightCreateUpdateSerializer
 
     def get_queryset(self):
+        if self.action in ("available_seats", "seat_map", "hold_seats"):
+            return Flight.objects.select_related("airplane")
         queryset = self.queryset
-        date = self.request.query_params.get("date")
-        route_id = self.request.query_params.get("route")
-        airplane_id = self.request.query_params.get("airplane")
-        if date:
-            date_obj = datetime.strptime(date, "%Y-%m-%d").date()
-            queryset = queryset.filter(departure_time__date=date_obj)
-        if route_id:
-            queryset = queryset.filter(route_id=route_id)
-        if airplane_id:
-            queryset = queryset.filter(airplane_id=airplane_id)
-        return queryset.distinct()
+        if self.action == "list":
+            queryset = self.filter_flights(
+                queryset, self.request.query_params
+            )
+        if self.action == "retrieve":
+            queryset = queryset.prefetch_related("crew")
+        return queryset
+
+    @staticmethod
+    def filter_flights(queryset, query_params):
+        """
+        Apply list filters as plain column comparisons.
+
+        ``date`` becomes a half-open range over local midnight instead of
+        ``departure_time__date``, whose timezone cast cannot use an index.
+        """
+        params = FlightFilterSerializer(data=query_params)
+        params.is_valid(raise_exception=True)
+        filters = params.validated_data
+        if "date" in filters:
+            start = timezone.make_aware(
+                datetime.combine(filters["date"], time.min)
+            )
+            queryset = queryset.filter(
+                departure_time__gte=start,
+                departure_time__lt=start + timedelta(days=1),
+            )
+        if "departure_from" in filters:
+            queryset = queryset.filter(
+                departure_time__gte=filters["departure_from"]
+            )
+        if "departure_to" in filters:
+            queryset = queryset.filter(
+                departure_time__lt=filters["departure_to"]
+            )
+        for param, lookup in (
+            ("route", "route_id"),
+            ("airplane", "airplane_id"),
+            ("source", "route__source_id"),
+            ("destination", "route__destination_id"),
+            ("source_city", "route__source__closest_big_city"),
+            ("destination_city", "route__destination__closest_big_city"),
+        ):
+            if param in filters:
+                queryset = queryset.filter(**{lookup: filters[param]})
+        return queryset
+
+    @extend_schema(parameters=[FlightFilterSerializer])
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
 
     @extend_schema(
-        parameters=[
-            OpenApiParameter(
-                "date",
-                OpenApiTypes.DATE,
-                description="Filter by date (YYYY-MM-DD)"
-            ),
-            OpenApiParameter(
-                "route",
-                OpenApiTypes.INT,
-                description="Filter by route ID"
-            ),
-            OpenApiParameter(
-                "airplane",
-                OpenApiTypes.INT,
-                description="Filter by airplane ID"
-            ),
-        ]
+        parameters=[FlightExportSerializer], responses=OpenApiTypes.BINARY
     )
-    def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        params = FlightExportSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        flights = self.filter_flights(
+            Flight.objects.order_by("departure_time", "id"),
+            request.query_params,
+        )
+        return export_response(
+            request,
+            flights,
+            {
+                "id": "id",
+                "departure_time": "departure_time",
+                "arrival_time": "arrival_time",
+                "source": "route__source__name",
+                "destination": "route__destination__name",
+                "airplane": "airplane__name",
+                "capacity": "capacity",
+                "tickets_sold": "tickets_sold",
+            },
+            "flights",
+            params.validated_data["export_format"],
+        )
+
+    @extend_schema(request=FlightImportSerializer)
+    @action(detail=False, methods=["post"], url_path="import")
+    def import_schedule(self, request):
+        """
+        Create many flights at once from a JSON body, or from a CSV or
+        JSON timetable uploaded as ``file``. Nothing is created unless
+        every row is valid.
+        """
+        upload = request.FILES.get("file")
+        if upload is None:
+            data = request.data
+        else:
+            try:
+                data = {
+                    "flights": read_schedule(
+                        upload, detect_format(upload.name)
+                    )
+                }
+            except ScheduleFileError as error:
+                return Response(
+                    {"file": [str(error)]},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+        serializer = FlightImportSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        flights = serializer.save()
+        return Response(
+            {"created": len(flights)}, status=status.HTTP_201_CREATED
+        )
 
     @action(detail=True, methods=["get"], permission_classes=[IsAuthenticated])
     def available_seats(self, request, pk=None):
         flight = self.get_object()
-        total_seats = flight.airplane.rows * flight.airplane.seats_in_row
-        booked_seats = flight.tickets.count()
-        available = total_seats - booked_seats
-        return Response({"available_seats": available})
+        return Response({"available_seats": flight.tickets_available})
+
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="seat-map",
+        permission_classes=[IsAuthenticated]
+    )
+    def seat_map(self, request, pk=None):
+        flight = self.get_object()
+        bitmap = flight.seat_map()
+        etag = f'"{hashlib.md5(bitmap).hexdigest()}"'
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if request.headers.get("If-None-Match") == etag:
+            return Response(
+                status=status.HTTP_304_NOT_MODIFIED, headers=headers
+            )
+        return Response(
+            {
+                "rows": flight.airplane.rows,
+                "seats_in_row": flight.airplane.seats_in_row,
+                "occupied": base64.b64encode(bitmap).decode(),
+            },
+            headers=headers,
+        )
+
+    @action(
+        detail=True,
+        methods=["post", "delete"],
+        url_path="hold-seats",
+        permission_classes=[IsAuthenticated]
+    )
+    def hold_seats(self, request, pk=None):
+        flight = self.get_object()
+        if request.method == "DELETE":
+            token = SeatHoldSerializer().fields["hold"].run_validation(
+                request.query_params.get("hold")
+            )
+            SeatHold.objects.filter(
+                flight=flight, user=request.user, token=token
+            ).delete()
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        serializer = SeatHoldSerializer(
+            data=request.data, context={"flight": flight}
+        )
+        serializer.is_valid(raise_exception=True)
+        token = serializer.validated_data.get("hold") or uuid.uuid4()
+        expires_at = timezone.now() + settings.SEAT_HOLD_TTL
+        if "count" in serializer.validated_data:
+            seats = SeatHold.objects.hold_any(
+                flight,
+                serializer.validated_data["count"],
+                request.user,
+                token,
+                expires_at,
+            )
+        else:
+            seats = SeatHold.objects.hold_seats(
+                flight,
+                [
+                    (seat["row"], seat["seat"])
+                    for seat in serializer.validated_data["seats"]
+                ],
+                request.user,
+                token,
+                expires_at,
+            )
+        if not seats:
+            metrics.TICKET_CONFLICTS.labels("hold").inc()
+            return Response(
+                {"detail": "Requested seats are not available."},
+                status=status.HTTP_409_CONFLICT,
+            )
+        return Response(
+            {
+                "hold": token,
+                "expires_at": expires_at,
+                "seats": [{"row": row, "seat": seat} for row, seat in seats],
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class FlightScheduleViewSet(SerializerTimingMixin, viewsets.ModelViewSet):
+    """
+    Recurring flights. Creating or changing a schedule generates its
+    flights; the response reports how many were created, updated,
+    deleted or detached.
+    """
+
+    queryset = FlightSchedule.objects.prefetch_related("crew")
+    serializer_class = FlightScheduleSerializer
+    permission_classes = [IsAdminUser]
+
+    @action(detail=True, methods=["post"])
+    def generate(self, request, pk=None):
+        """Regenerate the schedule's future flights."""
+        try:
+            return Response(self.get_object().generate())
+        except ValidationError as error:
+            return Response(
+                error.message_dict, status=status.HTTP_400_BAD_REQUEST
+            )
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.generate(occurrences=[])
+            instance.delete()
 
 
-class TicketViewSet(viewsets.ModelViewSet):
+class ItineraryViewSet(ReplicaReadMixin, viewsets.ViewSet):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        parameters=[ItinerarySearchSerializer],
+        responses=ItinerarySerializer(many=True),
+    )
+    def list(self, request):
+        params = ItinerarySearchSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+        itineraries = search_itineraries(
+            data["source"],
+            data["destination"],
+            data["date"],
+            max_legs=data["max_legs"],
+            min_connection=timedelta(minutes=data["min_connection"]),
+            max_connection=timedelta(minutes=data["max_connection"]),
+            sort=data["sort"],
+        )
+        with serializer_timer():
+            data = ItinerarySerializer(itineraries, many=True).data
+        return Response(data)
+
+
+class TicketViewSet(
+    ProjectionListMixin, SerializerTimingMixin, viewsets.ModelViewSet
+):
     queryset = Ticket.objects.select_related("flight", "order")
+    pagination_class = TicketPagination
+    list_projection = TicketListProjection
     permission_classes = [IsAdminUser]
 
     def get_serializer_class(self):
@@ -192,16 +589,54 @@ class TicketViewSet(viewsets.ModelViewSet):
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
-
-class OrderPagination(PageNumberPagination):
-    page_size = 10
-    max_page_size = 100
-
-
-class OrderViewSet(viewsets.ModelViewSet):
+    @extend_schema(
+        parameters=[TicketExportSerializer], responses=OpenApiTypes.BINARY
+    )
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        """Passenger manifest for a flight, an order or a date range."""
+        params = TicketExportSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        filters = params.validated_data
+        tickets = Ticket.objects.order_by("flight_id", "row", "seat")
+        for param, lookup in (
+            ("flight", "flight_id"),
+            ("order", "order_id"),
+            ("departure_from", "flight__departure_time__gte"),
+            ("departure_to", "flight__departure_time__lt"),
+        ):
+            if param in filters:
+                tickets = tickets.filter(**{lookup: filters[param]})
+        return export_response(
+            request,
+            tickets,
+            {
+                "id": "id",
+                "flight": "flight_id",
+                "departure_time": "flight__departure_time",
+                "row": "row",
+                "seat": "seat",
+                "order": "order_id",
+                "passenger": "order__user__email",
+            },
+            "tickets",
+            filters["export_format"],
+        )
+
+
+class OrderViewSet(
+    ReplicaReadMixin,
+    ProjectionListMixin,
+    SerializerTimingMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Order.objects.prefetch_related("tickets__flight")
     pagination_class = OrderPagination
+    list_projection = OrderListProjection
     permission_classes = [IsAuthenticated]
+    # A booking locks seats and writes several rows; charge it as five
+    # requests against the user's rate.
+    throttle_costs = {"create": 5}
 
     def get_queryset(self):
         return Order.objects.filter(user=self.request.user)
@@ -219,6 +654,40 @@ class OrderViewSet(viewsets.ModelViewSet):
         permission_classes=[IsAuthenticated]
     )
     def my_tickets(self, request):
-        tickets = Ticket.objects.filter(order__user=request.user)
-        serializer = TicketListSerializer(tickets, many=True)
-        return Response(serializer.data)
+        projection = TicketListProjection()
+        tickets = projection.project(
+            Ticket.objects.filter(order__user=request.user)
+        )
+        paginator = TicketPagination()
+        page = paginator.paginate_queryset(tickets, request, view=self)
+        return paginator.get_paginated_response(projection.represent(page))
+
+    @extend_schema(
+        parameters=[OrderExportSerializer], responses=OpenApiTypes.BINARY
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        permission_classes=[IsAdminUser]
+    )
+    def export(self, request):
+        params = OrderExportSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        filters = params.validated_data
+        orders = Order.objects.order_by("created_at", "id")
+        if "created_from" in filters:
+            orders = orders.filter(created_at__gte=filters["created_from"])
+        if "created_to" in filters:
+            orders = orders.filter(created_at__lt=filters["created_to"])
+        return export_response(
+            request,
+            orders.annotate(ticket_count=Count("tickets")),
+            {
+                "id": "id",
+                "created_at": "created_at",
+                "user": "user__email",
+                "tickets": "ticket_count",
+            },
+            "orders",
+            filters["export_format"],
+        )
@@ -27,9 +27,11 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = os.getenv("DJANGO_SECRET_KEY")
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = os.getenv("DJANGO_DEBUG", "true") == "true"
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = [
+    host for host in os.getenv("DJANGO_ALLOWED_HOSTS", "").split(",") if host
+]
 
 INTERNAL_IPS = [
     "127.0.0.1",
@@ -54,6 +56,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "airport.instrumentation.InstrumentationMiddleware",
     "debug_toolbar.middleware.DebugToolbarMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -93,9 +96,49 @@ DATABASES = {
         "PASSWORD": os.getenv("POSTGRES_PASSWORD"),
         "HOST": os.getenv("POSTGRES_HOST"),
         "PORT": os.getenv("POSTGRES_PORT"),
+        # Keep connections open between requests, checking them before
+        # reuse. Set DB_CONN_MAX_AGE=0 under ASGI, where every request
+        # runs its queries on a new thread and would leak a connection.
+        "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
+# Read replicas of the primary, as comma-separated hosts. Safe-method
+# requests to the viewsets using ReplicaReadMixin read from one of them.
+DATABASE_REPLICAS = []
+for index, host in enumerate(
+    filter(None, os.getenv("POSTGRES_REPLICA_HOSTS", "").split(","))
+):
+    DATABASES[f"replica_{index}"] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica_{index}")
+
+DATABASE_ROUTERS = ["airport.db_router.ReplicaRouter"]
+
+# After a successful write, keep the user's reads on the primary for this
+# many seconds so replication lag never hides their own changes.
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "10"))
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    "default": (
+        {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+        }
+        if os.getenv("REDIS_URL")
+        else {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    )
+}
+
+REFERENCE_CACHE_TIMEOUT = 60 * 60
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -143,19 +186,23 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework.authentication.SessionAuthentication",
-        "rest_framework.authentication.BasicAuthentication",
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "user.authentication.CachedJWTAuthentication",
+        "user.authentication.BrowsableAPIBasicAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "airport.permissions.IsAdminOrIfAuthenticatedReadOnly",
     ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "airport.instrumentation.TimedJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "airport.throttling.AnonTokenBucketThrottle",
+        "airport.throttling.UserTokenBucketThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {
-        "anon": "5/min",
-        "user": "20/min"
+        "anon": os.getenv("THROTTLE_ANON_RATE", "5/min"),
+        "user": os.getenv("THROTTLE_USER_RATE", "20/min"),
     },
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
@@ -166,6 +213,64 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": False,
 }
 
+# How long CachedJWTAuthentication keeps a user's authentication fields;
+# saving, updating or deleting the user drops the entry immediately.
+USER_CACHE_TIMEOUT = 60 * 5
+
+SEAT_HOLD_TTL = timedelta(minutes=10)
+
+# Longest flight accepted. Crew overlap checks only look this far back
+# from a window, so raising it widens every check's index range scan.
+MAX_FLIGHT_DURATION = timedelta(hours=24)
+
+# Uploads go straight to a temporary file instead of being buffered in
+# memory; airplane images are decoded later by a background task.
+FILE_UPLOAD_HANDLERS = [
+    "django.core.files.uploadhandler.TemporaryFileUploadHandler",
+]
+
+# Background jobs (airport.tasks), run by `manage.py run_workers`.
+# TASKS_EAGER runs them inline after commit instead of queueing them.
+TASKS_EAGER = False
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+# Seconds before the first retry, doubling on every further failure.
+JOB_RETRY_DELAY = 5
+JOB_MAX_RETRY_DELAY = 60 * 60
+# Workers refresh a running job's heartbeat this often (seconds). Jobs
+# without a heartbeat for JOB_STALE_AFTER are assumed lost with their
+# worker and requeued, or failed once they are out of attempts.
+JOB_HEARTBEAT_INTERVAL = 30
+JOB_STALE_AFTER = timedelta(minutes=2)
+
+# Per-request instrumentation (airport.instrumentation)
+
+INSTRUMENTATION_HEADERS = DEBUG
+
+# Maximum number of queries per endpoint, named "<basename>-<action>".
+# Exceeding a budget logs a warning, or fails when QUERY_BUDGET_STRICT.
+QUERY_BUDGETS = {
+    "flight-list": 4,
+    "flight-retrieve": 7,
+    "flight-available-seats": 4,
+    "flight-seat-map": 4,
+    "crew-roster": 4,
+    "ticket-list": 4,
+    "ticket-retrieve": 4,
+    "order-list": 4,
+    "order-retrieve": 5,
+    # Explicit seats take 12 queries; any-seat bookings add the hold
+    # lookup, expired-hold reclaim and free-seat scan of SeatHold.hold_any.
+    "order-create": 15,
+    "order-my-tickets": 4,
+}
+
+QUERY_BUDGET_STRICT = False
+
+# Serve flight and order reads through the async views in
+# airport.async_views. Experimental and only meaningful under ASGI
+# (uvicorn); see benchmarks/asgi.sh before enabling it.
+ASYNC_READ_VIEWS = os.getenv("ASYNC_READ_VIEWS") == "true"
+
 LOGIN_REDIRECT_URL = "/api/airport/"
 
 SPECTACULAR_SETTINGS = {
@@ -2,12 +2,16 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include
+from django.views.decorators.cache import cache_control
+from django.views.static import serve
 from drf_spectacular.views import (
     SpectacularAPIView,
     SpectacularSwaggerView,
     SpectacularRedocView,
 )
 
+from airport.metrics import metrics_view
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/airport/", include("airport.urls", namespace="airport")),
@@ -24,5 +28,14 @@ urlpatterns = [
         SpectacularRedocView.as_view(url_name="schema"),
         name="redoc",
     ),
+    path("metrics", metrics_view, name="metrics"),
     path("__debug__/", include("debug_toolbar.urls")),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+]
+
+# Image variants have content-hashed names, so they never change.
+urlpatterns += static(
+    f"{settings.MEDIA_URL}variants/",
+    view=cache_control(max_age=60 * 60 * 24 * 365, immutable=True)(serve),
+    document_root=settings.MEDIA_ROOT / "variants",
+)
+urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
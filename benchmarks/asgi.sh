@@ -0,0 +1,46 @@
+#!/bin/sh
+# Compare gunicorn (threaded WSGI) with uvicorn (ASGI, async read views)
+# at the same number of worker processes, recording peak server memory
+# next to throughput and latency at rising connection counts.
+#
+#   benchmarks/asgi.sh <access token> [seconds per run] [workers]
+#
+# Run it from the project root against a database loaded with
+# `manage.py generate_data`. Throttling is relaxed for the runs and the
+# results are saved to benchmarks/results/asgi-<server>.json.
+set -eu
+
+TOKEN=$1
+DURATION=${2:-30}
+WORKERS=${3:-2}
+export DJANGO_DEBUG=false DJANGO_ALLOWED_HOSTS=127.0.0.1
+export THROTTLE_ANON_RATE=1000000/min THROTTLE_USER_RATE=1000000/min
+
+run() {
+    name=$1
+    port=$2
+    shift 2
+    "$@" > /dev/null 2>&1 &
+    pid=$!
+    trap 'kill "$pid" 2> /dev/null' EXIT
+    sleep 5
+    python manage.py loadtest \
+        "http://127.0.0.1:$port/api/airport/flights/" \
+        "http://127.0.0.1:$port/api/airport/flights/1/available_seats/" \
+        "http://127.0.0.1:$port/api/airport/orders/" \
+        --token "$TOKEN" \
+        --concurrency 10 100 500 \
+        --duration "$DURATION" \
+        --server-pid "$pid" \
+        --output "benchmarks/results/asgi-$name.json"
+    kill "$pid"
+    wait "$pid" 2> /dev/null || true
+}
+
+echo "gunicorn, $WORKERS gthread workers"
+GUNICORN_BIND=127.0.0.1:8102 GUNICORN_WORKERS=$WORKERS run gunicorn 8102 \
+    gunicorn airport_service.wsgi:application
+echo "uvicorn, $WORKERS workers, ASYNC_READ_VIEWS=true"
+ASYNC_READ_VIEWS=true DB_CONN_MAX_AGE=0 run uvicorn 8103 \
+    uvicorn airport_service.asgi:application \
+    --host 127.0.0.1 --port 8103 --workers "$WORKERS"
@@ -0,0 +1,41 @@
+#!/bin/sh
+# Compare the development server (fresh connection per request) with the
+# production gunicorn profile (persistent connections) on the same data.
+#
+#   benchmarks/serving.sh <access token> [seconds per run]
+#
+# Run it from the project root against a database loaded with
+# `manage.py generate_data`. Throttling is relaxed for the runs and the
+# results are saved to benchmarks/results/serving-<server>.json.
+set -eu
+
+TOKEN=$1
+DURATION=${2:-30}
+export DJANGO_DEBUG=false DJANGO_ALLOWED_HOSTS=127.0.0.1
+export THROTTLE_ANON_RATE=1000000/min THROTTLE_USER_RATE=1000000/min
+
+run() {
+    name=$1
+    port=$2
+    shift 2
+    "$@" > /dev/null 2>&1 &
+    pid=$!
+    sleep 5
+    python manage.py loadtest \
+        "http://127.0.0.1:$port/api/airport/flights/" \
+        "http://127.0.0.1:$port/api/airport/flights/1/available_seats/" \
+        "http://127.0.0.1:$port/api/airport/orders/" \
+        --token "$TOKEN" \
+        --concurrency 1 10 50 \
+        --duration "$DURATION" \
+        --output "benchmarks/results/serving-$name.json"
+    kill "$pid"
+    wait "$pid" 2> /dev/null || true
+}
+
+echo "runserver, CONN_MAX_AGE=0"
+DB_CONN_MAX_AGE=0 run runserver 8100 \
+    python manage.py runserver 127.0.0.1:8100 --noreload
+echo "gunicorn, gunicorn.conf.py"
+GUNICORN_BIND=127.0.0.1:8101 run gunicorn 8101 \
+    gunicorn airport_service.wsgi:application
@@ -0,0 +1,34 @@
+"""
+Gunicorn settings for the production profile, picked up automatically by
+``gunicorn airport_service.wsgi:application`` from the project root.
+
+Every worker thread holds one persistent database connection, so keep
+``GUNICORN_WORKERS * GUNICORN_THREADS`` below Postgres' max_connections.
+"""
+
+import multiprocessing
+import os
+
+from airport.metrics import child_exit  # noqa: F401
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+
+workers = int(
+    os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1)
+)
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+worker_class = "gthread"
+
+# Import the project once in the master so workers share its memory
+# pages copy-on-write. No database connection is opened at import time,
+# so none is inherited by the forked workers.
+preload_app = True
+
+# Recycle workers now and then to cap slow memory growth.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "5000"))
+max_requests_jitter = max_requests // 10
+
+timeout = 30
+keepalive = 5
+
+accesslog = "-"
@@ -0,0 +1,122 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import BasicAuthentication
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+# The only user fields kept in the cache: enough to authenticate and to
+# check permissions, never the password hash.
+CACHED_FIELDS = ("id", "email", "is_active", "is_staff", "is_superuser")
+
+
+def _user_key(user_id):
+    return f"user:auth:{user_id}"
+
+
+def cached_user(user_id):
+    """
+    Return the user whose USER_ID_FIELD is ``user_id``, or None.
+
+    Only CACHED_FIELDS (plus the password digest when CHECK_REVOKE_TOKEN
+    is on) are cached, for USER_CACHE_TIMEOUT seconds. The other fields
+    of the returned user are deferred, so they load on first access and
+    ``save()`` writes only what is loaded or assigned.
+    """
+    User = get_user_model()
+    key = _user_key(user_id)
+    values = cache.get(key)
+    if values is None:
+        row = (
+            User.objects.filter(**{api_settings.USER_ID_FIELD: user_id})
+            .values(*CACHED_FIELDS, "password")
+            .first()
+        )
+        if row is None:
+            return None
+        password = row.pop("password")
+        values = row
+        if api_settings.CHECK_REVOKE_TOKEN:
+            values["password_digest"] = get_md5_hash_password(password)
+        cache.set(key, values, settings.USER_CACHE_TIMEOUT)
+    fields = [
+        field.attname
+        for field in User._meta.concrete_fields
+        if field.attname in values
+    ]
+    # Deferred fields load from, and saves go to, the primary.
+    user = User.from_db(
+        router.db_for_write(User), fields, [values[name] for name in fields]
+    )
+    user.password_digest = values.get("password_digest")
+    return user
+
+
+def forget_user_ids(user_ids):
+    """
+    Drop users from the cache now and again once the transaction
+    commits, so a request racing the write cannot cache stale values.
+    """
+    keys = [_user_key(user_id) for user_id in user_ids]
+    if keys:
+        cache.delete_many(keys)
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def forget_user(user):
+    forget_user_ids([getattr(user, api_settings.USER_ID_FIELD)])
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    ``JWTAuthentication`` that reads the token's user from ``cached_user``
+    instead of querying the database on every request.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            )
+
+        user = cached_user(user_id)
+        if user is None:
+            raise AuthenticationFailed(
+                _("User not found"), code="user_not_found"
+            )
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(
+                _("User is inactive"), code="user_inactive"
+            )
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != user.password_digest:
+            raise AuthenticationFailed(
+                _("The user's password has been changed."),
+                code="password_changed",
+            )
+        return user
+
+
+class BrowsableAPIBasicAuthentication(BasicAuthentication):
+    """
+    Basic authentication for the browsable API only.
+
+    Checking a password costs a full PBKDF2 run, so API clients must use
+    JWT; credentials on JSON requests are ignored.
+    """
+
+    def authenticate(self, request):
+        renderer = getattr(request, "accepted_renderer", None)
+        if not isinstance(renderer, BrowsableAPIRenderer):
+            return None
+        return super().authenticate(request)
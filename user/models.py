@@ -4,7 +4,22 @@ from django.db import models
 from django.utils.translation import gettext as _
 
 
-class UserManager(DjangoUserManager):
+class UserQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        """Update the rows and drop them from the authentication cache."""
+        from rest_framework_simplejwt.settings import api_settings
+
+        from user.authentication import forget_user_ids
+
+        user_ids = list(
+            self.values_list(api_settings.USER_ID_FIELD, flat=True)
+        )
+        rows = super().update(**kwargs)
+        forget_user_ids(user_ids)
+        return rows
+
+
+class UserManager(DjangoUserManager.from_queryset(UserQuerySet)):
     """Define a model manager for User model with no username field."""
 
     use_in_migrations = True
@@ -0,0 +1,104 @@
+import base64
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from user.authentication import CACHED_FIELDS, _user_key
+
+ME_URL = reverse("user:manage")
+FLIGHTS_URL = reverse("airport:flight-list")
+
+
+def user_queries(queries):
+    table = get_user_model()._meta.db_table
+    return [query for query in queries if f'FROM "{table}"' in query["sql"]]
+
+
+class CachedJWTAuthenticationTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="testpass",
+        )
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+
+    def test_user_is_read_from_cache(self):
+        self.assertEqual(self.client.get(ME_URL).status_code, status.HTTP_200_OK)
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["email"], self.user.email)
+        self.assertEqual(user_queries(queries), [])
+
+    def test_saving_user_refreshes_cache(self):
+        self.client.get(FLIGHTS_URL)
+        self.assertEqual(
+            self.client.get(FLIGHTS_URL).status_code, status.HTTP_403_FORBIDDEN
+        )
+        self.user.is_staff = True
+        self.user.save()
+        self.assertEqual(self.client.get(FLIGHTS_URL).status_code, status.HTTP_200_OK)
+
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(
+            self.client.get(ME_URL).status_code, status.HTTP_401_UNAUTHORIZED
+        )
+
+    def test_password_hash_is_not_cached(self):
+        self.client.get(ME_URL)
+        self.assertEqual(set(cache.get(_user_key(self.user.id))), set(CACHED_FIELDS))
+
+    def test_queryset_update_refreshes_cache(self):
+        self.client.get(ME_URL)
+        get_user_model().objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(
+            self.client.get(ME_URL).status_code, status.HTTP_401_UNAUTHORIZED
+        )
+
+    def test_update_through_cached_user_keeps_other_fields(self):
+        get_user_model().objects.filter(pk=self.user.pk).update(first_name="Ada")
+        self.client.get(ME_URL)
+        res = self.client.patch(ME_URL, {"password": "newpass"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, "Ada")
+        self.assertTrue(self.user.check_password("newpass"))
+
+    def test_deleted_user_is_rejected(self):
+        self.client.get(ME_URL)
+        self.user.delete()
+        self.assertEqual(
+            self.client.get(ME_URL).status_code, status.HTTP_401_UNAUTHORIZED
+        )
+
+
+class BasicAuthenticationTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        get_user_model().objects.create_user(
+            email="test@test.com",
+            password="testpass",
+        )
+        credentials = base64.b64encode(b"test@test.com:testpass").decode()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Basic {credentials}")
+
+    def test_basic_auth_ignored_for_api_clients(self):
+        res = self.client.get(reverse("airport:order-list"))
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_basic_auth_for_browsable_api(self):
+        res = self.client.get(
+            reverse("airport:order-list"), HTTP_ACCEPT="text/html"
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
@@ -1,17 +1,24 @@
 from rest_framework import generics
-from rest_framework.authentication import TokenAuthentication
+from rest_framework.authentication import SessionAuthentication
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from airport.instrumentation import SerializerTimingMixin
+from user.authentication import CachedJWTAuthentication
 from user.serializers import UserSerializer
 
 
-class CreateUserView(generics.CreateAPIView):
+class CreateUserView(SerializerTimingMixin, generics.CreateAPIView):
     serializer_class = UserSerializer
     permission_classes = (AllowAny,)
 
 
-class ManageUserView(generics.RetrieveUpdateAPIView):
+class ManageUserView(SerializerTimingMixin, generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
-    authentication_classes = (TokenAuthentication,)
+    # JWT comes first so anonymous requests get a 401 with a
+    # WWW-Authenticate header rather than a 403.
+    authentication_classes = (
+        CachedJWTAuthentication,
+        SessionAuthentication,
+    )
     permission_classes = (IsAuthenticated,)
 
     def get_object(self):